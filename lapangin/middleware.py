@@ -0,0 +1,138 @@
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('lapangin.performance')
+
+# Jumlah query paling lambat per request yang ikut ditulis ke log request lambat
+SLOW_QUERIES_LOGGED = 3
+PERCENTILES = (50, 95, 99)
+
+
+class QueryCounter:
+    """execute_wrapper yang menghitung jumlah dan total durasi query, plus beberapa query terlambat."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if len(self.slowest) < SLOW_QUERIES_LOGGED or elapsed > self.slowest[-1][0]:
+                self.slowest.append((elapsed, sql))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[SLOW_QUERIES_LOGGED:]
+
+
+class EndpointMetrics:
+    """
+    Sampel durasi dan jumlah query per endpoint, disimpan di memori proses (per worker).
+    Setiap endpoint menyimpan REQUEST_METRICS_SAMPLE_SIZE request terakhir; persentil dihitung saat dibaca.
+    """
+
+    def __init__(self, sample_size):
+        self.sample_size = sample_size
+        self.samples = {}
+        self.counts = {}
+        self.lock = threading.Lock()
+
+    def record(self, endpoint, duration_ms, db_ms, queries):
+        with self.lock:
+            samples = self.samples.get(endpoint)
+            if samples is None:
+                samples = self.samples[endpoint] = deque(maxlen=self.sample_size)
+                self.counts[endpoint] = 0
+            samples.append((duration_ms, db_ms, queries))
+            self.counts[endpoint] += 1
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+    def snapshot(self):
+        with self.lock:
+            samples = {endpoint: list(values) for endpoint, values in self.samples.items()}
+            counts = dict(self.counts)
+
+        report = {}
+        for endpoint, values in samples.items():
+            durations = sorted(value[0] for value in values)
+            db_times = sorted(value[1] for value in values)
+            queries = sorted(value[2] for value in values)
+            report[endpoint] = {
+                'requests': counts[endpoint],
+                'sampled': len(values),
+                **{f'p{p}_ms': round(percentile(durations, p), 2) for p in PERCENTILES},
+                **{f'db_p{p}_ms': round(percentile(db_times, p), 2) for p in PERCENTILES},
+                'queries_avg': round(sum(queries) / len(queries), 2),
+                'queries_p95': percentile(queries, 95),
+                'queries_max': queries[-1],
+            }
+        return report
+
+
+def percentile(ordered, p):
+    """Persentil nearest-rank dari list yang sudah terurut."""
+    if not ordered:
+        return 0
+    index = max(0, -(-len(ordered) * p // 100) - 1)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+metrics = EndpointMetrics(settings.REQUEST_METRICS_SAMPLE_SIZE)
+
+
+def endpoint_name(request):
+    match = request.resolver_match
+    view = match.view_name if match is not None else '(unresolved)'
+    return f'{request.method} {view}'
+
+
+class QueryMetricsMiddleware:
+    """
+    Hitung jumlah query dan waktu database per request, tambahkan header Server-Timing, catat
+    persentil per endpoint, dan log request yang lebih lambat dari REQUEST_METRICS_SLOW_MS.
+    Dimatikan lewat REQUEST_METRICS_ENABLED = False. Query yang dijalankan saat body
+    StreamingHttpResponse dikirim tidak ikut terhitung.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        counter = QueryCounter()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = counter.duration * 1000
+
+        endpoint = endpoint_name(request)
+        metrics.record(endpoint, total_ms, db_ms, counter.count)
+        response['Server-Timing'] = f'db;dur={db_ms:.1f};desc="{counter.count} queries", app;dur={total_ms:.1f}'
+
+        if total_ms >= settings.REQUEST_METRICS_SLOW_MS:
+            logger.warning(
+                'Request lambat %s %s (%s): %.1f ms, %d query, %.1f ms di database. Query terlama: %s',
+                request.method, request.path, endpoint, total_ms, counter.count, db_ms,
+                ' | '.join(f'{elapsed * 1000:.1f} ms {sql}' for elapsed, sql in counter.slowest),
+            )
+        return response
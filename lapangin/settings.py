@@ -55,6 +55,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'lapangin.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -120,10 +121,36 @@ else:
         }
     }
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+if PRODUCTION:
+    # Production: file-based supaya semua worker gunicorn berbagi cache yang sama
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', '/tmp/lapangin-cache'),
+        }
+    }
+else:
+    # Development: cache di memori proses
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 
 LOGIN_URL = 'accounts:login'
 
 
+# Profil user ikut dimuat (select_related) saat AuthenticationMiddleware mengambil user dari session.
+# ModelBackend tetap terdaftar supaya session yang dibuat sebelumnya masih valid.
+AUTHENTICATION_BACKENDS = [
+    'modules.user.backends.ProfileModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -173,3 +200,59 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Thumbnail venue disimpan sebagai file (nama = hash isi gambar), bukan base64 di database
+THUMBNAIL_ROOT = os.path.join(MEDIA_ROOT, 'thumbnails')
+THUMBNAIL_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+# Jumlah venue yang diambil dari database per batch saat katalog JSON di-stream
+VENUE_STREAM_CHUNK_SIZE = 500
+
+# Umur maksimum response katalog venue di cache; biasanya sudah kedaluwarsa lebih dulu lewat version
+VENUE_RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Leaderboard rekomendasi venue: jumlah venue per board (global, per kota, per negara) dan umurnya di cache
+VENUE_LEADERBOARD_SIZE = 20
+VENUE_LEADERBOARD_TIMEOUT = 60 * 60
+
+# Jumlah tetangga (venue paling mirip) yang disimpan per venue untuk rekomendasi personal
+VENUE_NEIGHBOURS_K = 20
+
+# Batas jumlah hasil full-text search venue (parameter q) yang diranking per query
+VENUE_SEARCH_MAX_RESULTS = 500
+
+# Bitset tanggal terbooking per venue (lihat modules/booking/availability.py):
+# jumlah hari yang dicakup bitset mulai hari ini, dan umur entry di cache
+BOOKING_AVAILABILITY_HORIZON_DAYS = 366
+BOOKING_AVAILABILITY_TIMEOUT = 60 * 60 * 24
+
+# Jumlah tanggal maksimum dalam satu request booking batch
+BOOKING_BATCH_MAX_DATES = 60
+
+# Jumlah baris yang dibaca dari database per batch saat export data (command export_data dan endpoint export)
+EXPORT_CHUNK_SIZE = 2000
+
+# Instrumentasi request (lapangin/middleware.py): jumlah query dan waktu database per request, header
+# Server-Timing, dan persentil per endpoint. Request yang lebih lambat dari SLOW_MS ditulis ke log
+# lapangin.performance; SAMPLE_SIZE adalah jumlah request terakhir per endpoint yang disimpan
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'True').lower() == 'true'
+REQUEST_METRICS_SLOW_MS = int(os.getenv('REQUEST_METRICS_SLOW_MS', '1000'))
+REQUEST_METRICS_SAMPLE_SIZE = 1000
+
+# Statistik user untuk dashboard admin (modules/user/stats.py): umur metric di cache sebelum dihitung
+# ulang, rentang hari grafik user baru, dan jumlah reviewer teratas
+USER_STATS_TIMEOUT = 15 * 60
+USER_STATS_SIGNUP_DAYS = 30
+USER_STATS_TOP_REVIEWERS = 10
+
+# Umur maksimum snapshot hak akses user di sesi (modules/user/capabilities.py); perubahan peran dan
+# venue milik user sudah membuang snapshot lewat versi di cache
+USER_CAPABILITIES_TIMEOUT = 60 * 60
+
+# Umur index kepemilikan venue per owner di cache (modules/venue/ownership.py); signal venue
+# membuangnya saat venue dibuat, dihapus, atau owner-nya diganti
+VENUE_OWNERSHIP_TIMEOUT = 60 * 60 * 24
+
+# Prefix URL thumbnail di payload API (modules/venue/thumbnails.py), mis. domain CDN; kosong berarti
+# memakai host request
+THUMBNAIL_BASE_URL = os.getenv('THUMBNAIL_BASE_URL', '')
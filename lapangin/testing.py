@@ -0,0 +1,131 @@
+"""Utilitas test bersama: batas jumlah query (query budget) per endpoint dan fixture data besar."""
+from contextlib import ContextDecorator
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class query_budget(ContextDecorator):
+    """
+    Gagalkan test jika blok/fungsi menjalankan lebih dari max_queries query. Pesan errornya memuat
+    semua SQL yang dijalankan. Bisa dipakai sebagai context manager maupun decorator method test:
+
+        @query_budget(5)
+        def test_list(self): ...
+
+        with query_budget(3, label='venue:search_venues_api'):
+            self.client.get(url)
+    """
+
+    def __init__(self, max_queries, label=None, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.label = label
+        self.using = using
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        self.context.__enter__()
+        return self.context
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return False
+        executed = len(self.context.captured_queries)
+        if executed > self.max_queries:
+            queries = '\n'.join(
+                f'{index}. {query["sql"]}' for index, query in enumerate(self.context.captured_queries, start=1)
+            )
+            label = f' {self.label}' if self.label else ''
+            raise AssertionError(
+                f'Query budget{label} terlampaui: {executed} query, batas {self.max_queries}.\n{queries}'
+            )
+        return False
+
+
+class QueryBudgetMixin:
+    """
+    Mixin TestCase untuk memanggil endpoint dengan batas query per nama URL di query_budgets.
+    Cache dikosongkan setiap test, jadi yang diukur adalah jalur tanpa cache. Body response streaming
+    ikut dibaca di dalam budget karena query-nya baru berjalan saat body dikirim.
+    """
+
+    # Nama URL -> jumlah query maksimum, termasuk query session dan user untuk request yang login
+    query_budgets = {}
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def request_within_budget(self, name, args=None, method='get', data=None, budget=None, **extra):
+        if budget is None:
+            budget = self.query_budgets[name]
+        with query_budget(budget, label=name):
+            response = getattr(self.client, method)(reverse(name, args=args), data, **extra)
+            if response.streaming:
+                response.streaming_content = [b''.join(response.streaming_content)]
+        return response
+
+    def get_within_budget(self, name, args=None, data=None, **extra):
+        return self.request_within_budget(name, args, 'get', data, **extra)
+
+    def post_within_budget(self, name, args=None, data=None, **extra):
+        return self.request_within_budget(name, args, 'post', data, **extra)
+
+
+def create_catalog(venues=300, users=30, bookings_per_user=10, reviews_per_user=10):
+    """
+    Fixture berukuran cukup untuk memunculkan pola N+1: ratusan venue, booking, dan review yang
+    tersebar di beberapa user. Venue pertama populer: setiap user punya satu booking dan satu review
+    di sana. Dibuat dengan bulk_create; return dict berisi list objeknya.
+    """
+    from modules.booking.models import Booking
+    from modules.review.models import Review
+    from modules.review.ratings import rebuild_rating_histograms, rebuild_venue_ratings
+    from modules.user.models import UserProfile
+    from modules.user.search import index_users
+    from modules.venue.models import Venue
+    from modules.venue.search import get_search_backend
+
+    User = get_user_model()
+    user_list = User.objects.bulk_create([
+        User(username=f'fixture{i}', email=f'fixture{i}@example.com', first_name='Fixture', last_name=str(i))
+        for i in range(users)
+    ])
+    UserProfile.objects.bulk_create([UserProfile(user=user, full_name=user.get_full_name()) for user in user_list])
+    index_users(user_list)
+    venue_list = Venue.objects.bulk_create([
+        Venue(
+            name=f'Stadion Fixture {i}', city=f'Kota {i % 10}', country='Indonesia', capacity=1000 + i,
+            price=100000 + i * 1000, description=f'Deskripsi stadion {i}',
+        )
+        for i in range(venues)
+    ])
+
+    start = date.today() + timedelta(days=1)
+    booking_list = Booking.objects.bulk_create([
+        Booking(
+            user=user, venue=venue_list[0 if i == 0 else (u * bookings_per_user + i) % venues],
+            booking_date=start + timedelta(days=u),
+        )
+        for u, user in enumerate(user_list)
+        for i in range(bookings_per_user)
+    ])
+    review_list = Review.objects.bulk_create([
+        Review(
+            user=user, venue=venue_list[0 if i == 0 else (u + i * users) % venues],
+            rating=Decimal(1 + (u + i) % 5), comment='Oke',
+        )
+        for u, user in enumerate(user_list)
+        for i in range(reviews_per_user)
+    ])
+    # bulk_create tidak memicu signal, jadi agregat dan histogram rating serta index pencarian dibangun sekaligus
+    rebuild_venue_ratings()
+    rebuild_rating_histograms()
+    get_search_backend().rebuild()
+    return {'users': user_list, 'venues': venue_list, 'bookings': booking_list, 'reviews': review_list}
@@ -23,9 +23,8 @@ class CustomUserCreationForm(UserCreationForm):
         
         if commit:
             user.save()
-            # Create UserProfile
-            UserProfile.objects.create(
-                user=user,
+            # Profil sudah dibuat signal post_save User, tinggal isi data dari form
+            UserProfile.objects.filter(user=user).update(
                 full_name=full_name,
                 phone=self.cleaned_data.get('phone', '')
             )
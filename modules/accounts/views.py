@@ -10,7 +10,8 @@ import json
 from .forms import CustomUserCreationForm
 import datetime
 from modules.booking.models import Booking
-from modules.user.models import UserProfile
+from modules.booking.views import BOOKING_LIST_FIELDS
+from modules.user.profiles import get_user_profile
 from datetime import date
 from django.views.decorators.http import require_POST
 from modules.user.forms import UserProfileForm
@@ -71,11 +72,8 @@ def logout_user(request):
 
 def get_page_data(request):
     if request.user.is_authenticated:
-        # Get or create UserProfile
-        profile, created = UserProfile.objects.get_or_create(
-            user=request.user,
-            defaults={'full_name': f"{request.user.first_name} {request.user.last_name}".strip()}
-        )
+        # Profil sudah dimuat bersama user oleh auth middleware, tidak ada query tambahan
+        profile = get_user_profile(request.user)
         return JsonResponse({
             'is_authenticated': True,
             'user_id': request.user.id,
@@ -91,13 +89,9 @@ def get_page_data(request):
 
 @login_required(login_url='/accounts/login/')
 def profile_page(request):
-    # Get or create UserProfile
-    profile, created = UserProfile.objects.get_or_create(
-        user=request.user,
-        defaults={'full_name': f"{request.user.first_name} {request.user.last_name}".strip()}
-    )
+    profile = get_user_profile(request.user)
     
-    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').order_by('-booking_date')
+    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').only(*BOOKING_LIST_FIELDS).order_by('-booking_date')
     bookings_data = []
     for booking in user_bookings:
         can_modify = booking.booking_date >= date.today()
@@ -123,7 +117,7 @@ def profile_page(request):
 @require_POST
 @login_required
 def edit_profile(request):
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = get_user_profile(request.user)
     form = UserProfileForm(request.POST, instance=profile)
     full_name = request.POST.get('full_name', '').strip()
     if full_name:
@@ -1,3 +1,35 @@
+import json
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from lapangin.testing import QueryBudgetMixin
+
+
+class AuthenticationApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query login, register, dan logout Flutter."""
+
+    query_budgets = {
+        # User + last_login + pembuatan sesi baru (cek key, INSERT, lalu UPDATE data sesi, dalam savepoint)
+        'authentication:login': 9,
+        # Cek username + INSERT user, lalu signal: profil dan token pencarian
+        'authentication:register': 5,
+        # Sesi + user, lalu sesi dibaca ulang dan dihapus oleh flush()
+        'authentication:logout': 4,
+        # Sesi + user beserta profilnya
+        'accounts:get_page_data': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='pemain', password='password123')
+
+    def test_register_login_logout(self):
+        payload = json.dumps({'username': 'baru', 'password1': 'password123', 'password2': 'password123'})
+        response = self.post_within_budget('authentication:register', data=payload, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.post_within_budget('authentication:login', data={'username': 'pemain', 'password': 'password123'})
+        self.assertTrue(response.json()['status'])
+        self.assertTrue(self.get_within_budget('accounts:get_page_data').json()['is_authenticated'])
+        self.assertEqual(self.post_within_budget('authentication:logout').status_code, 200)
@@ -60,7 +60,6 @@ def register(request):
         
         # Create the new user
         user = User.objects.create_user(username=username, password=password1)
-        user.save()
         
         return JsonResponse({
             "username": user.username,
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BookingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'modules.booking'
+
+    def ready(self):
+        # Signal Booking untuk menjaga bitset availability di cache
+        from modules.booking import signals  # noqa: F401
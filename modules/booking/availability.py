@@ -0,0 +1,155 @@
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from modules.booking.models import Booking
+from modules.venue.models import Venue
+
+KEY_PREFIX = 'booking:availability'
+
+
+@dataclass
+class VenueAvailability:
+    """
+    Tanggal terbooking satu venue: bit ke-n menandai origin + n hari, untuk n < horizon.
+    Tanggal sesudah horizon disimpan di overflow (sebagai ordinal), tanggal sebelum origin tidak dicatat.
+    """
+    origin: date
+    horizon: int
+    bits: int = 0
+    overflow: set = field(default_factory=set)
+
+    @classmethod
+    def from_cache(cls, value):
+        origin, horizon, bits, overflow = value
+        return cls(date.fromordinal(origin), horizon, bits, set(overflow))
+
+    def to_cache(self):
+        return (self.origin.toordinal(), self.horizon, self.bits, tuple(sorted(self.overflow)))
+
+    def offset(self, day):
+        return (day - self.origin).days
+
+    def is_booked(self, day):
+        offset = self.offset(day)
+        if offset >= self.horizon:
+            return day.toordinal() in self.overflow
+        return offset >= 0 and bool(self.bits >> offset & 1)
+
+    def add(self, day):
+        offset = self.offset(day)
+        if offset >= self.horizon:
+            self.overflow.add(day.toordinal())
+        elif offset >= 0:
+            self.bits |= 1 << offset
+
+    def discard(self, day):
+        offset = self.offset(day)
+        if offset >= self.horizon:
+            self.overflow.discard(day.toordinal())
+        elif offset >= 0:
+            self.bits &= ~(1 << offset)
+
+    def booked_dates(self, since=None):
+        """Tanggal terbooking mulai since (default origin), urut naik."""
+        start = max(self.offset(since), 0) if since else 0
+        bits = self.bits >> start << start
+        days = []
+        while bits:
+            lowest = bits & -bits
+            days.append(self.origin + timedelta(days=lowest.bit_length() - 1))
+            bits ^= lowest
+        days.extend(day for day in map(date.fromordinal, sorted(self.overflow)) if not since or day >= since)
+        return days
+
+
+def _venue_key(venue_id):
+    return f'{KEY_PREFIX}:{uuid.UUID(str(venue_id)).hex}'
+
+
+def _current_version(venue_id):
+    key = f'{_venue_key(venue_id)}:version'
+    version = cache.get(key)
+    if version is None:
+        # Nilai awal berbasis waktu supaya version baru tidak bertabrakan dengan entry lama
+        # kalau key version ini sempat ter-evict
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def build_availability(venue_id, today=None):
+    today = today or date.today()
+    availability = VenueAvailability(today, settings.BOOKING_AVAILABILITY_HORIZON_DAYS)
+    booked = Booking.objects.filter(venue_id=venue_id, booking_date__gte=today).values_list('booking_date', flat=True)
+    for day in booked.order_by():
+        availability.add(day)
+    return availability
+
+
+def get_availability(venue_id):
+    """
+    VenueAvailability dari cache, dibangun dengan satu range query jika belum ada.
+    Return None jika venue tidak ada.
+    """
+    version = _current_version(venue_id)
+    data_key = f'{_venue_key(venue_id)}:{version}'
+    cached = cache.get(data_key)
+    if cached is not None:
+        return VenueAvailability.from_cache(cached)
+
+    if not Venue.objects.filter(pk=venue_id).exists():
+        return None
+    availability = build_availability(venue_id)
+    cache.add(data_key, availability.to_cache(), settings.BOOKING_AVAILABILITY_TIMEOUT)
+    return availability
+
+
+def is_date_booked(venue_id, day):
+    """Cek cepat apakah tanggal sudah dibooking. Tanggal di luar jangkauan bitset dicek ke database."""
+    availability = get_availability(venue_id)
+    if availability is None or day < availability.origin:
+        return Booking.objects.filter(venue_id=venue_id, booking_date=day).exists()
+    return availability.is_booked(day)
+
+
+def apply_booking_change(venue_id, added=(), removed=()):
+    """
+    Perbarui bitset secara incremental sesudah transaksi commit. Setiap perubahan menaikkan version
+    venue dan menulis entry baru dari entry version sebelumnya; jika entry itu tidak ada (mis. ada
+    perubahan lain yang sedang berjalan), entry dibangun ulang dari database saat dibaca berikutnya.
+    """
+    def update():
+        _current_version(venue_id)
+        try:
+            version = cache.incr(f'{_venue_key(venue_id)}:version')
+        except ValueError:
+            return
+        cached = cache.get(f'{_venue_key(venue_id)}:{version - 1}')
+        if cached is None:
+            return
+        availability = VenueAvailability.from_cache(cached)
+        for day in removed:
+            availability.discard(day)
+        for day in added:
+            availability.add(day)
+        cache.add(f'{_venue_key(venue_id)}:{version}', availability.to_cache(), settings.BOOKING_AVAILABILITY_TIMEOUT)
+
+    transaction.on_commit(update)
+
+
+def invalidate_availability(venue_id):
+    """Buang bitset venue; dipakai untuk perubahan yang tidak bisa diterapkan incremental."""
+    def invalidate():
+        _current_version(venue_id)
+        try:
+            cache.incr(f'{_venue_key(venue_id)}:version')
+        except ValueError:
+            pass
+
+    transaction.on_commit(invalidate)
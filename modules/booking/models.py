@@ -8,6 +8,13 @@ class Booking(models.Model):
     booking_date = models.DateField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Venue dan tanggal saat dimuat, supaya signal availability tahu bit mana yang harus dipindah
+        instance._loaded_slot = (instance.__dict__.get('venue_id'), instance.__dict__.get('booking_date'))
+        return instance
+
     def __str__(self):
         return f"{self.venue.name} by {self.user.username} on {self.booking_date}"
 
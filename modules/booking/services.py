@@ -0,0 +1,136 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+
+from modules.booking.availability import apply_booking_change, invalidate_availability, is_date_booked
+from modules.booking.models import Booking
+from modules.user.stats import BOOKINGS_PER_USER, invalidate_stats
+
+
+@dataclass(frozen=True)
+class BookingResult:
+    """Hasil penulisan booking. conflict True berarti tanggalnya sudah dibooking, booking None."""
+    booking: Optional[Booking] = None
+    conflict: bool = False
+
+    @property
+    def ok(self):
+        return not self.conflict
+
+
+CONFLICT = BookingResult(conflict=True)
+
+
+def create_booking(user, venue, booking_date):
+    """
+    Buat booking dengan satu INSERT. unique_together (venue, booking_date) yang menentukan siapa yang
+    menang kalau ada dua request bersamaan, jadi hasilnya sama di SQLite maupun PostgreSQL.
+    """
+    # Jalur cepat dari bitset availability, tanpa round trip ke database
+    if is_date_booked(venue.pk, booking_date):
+        return CONFLICT
+    try:
+        with transaction.atomic():
+            booking = Booking.objects.create(user=user, venue=venue, booking_date=booking_date)
+    except IntegrityError:
+        # Didahului request lain; bitset yang bilang tanggal ini kosong sudah tertinggal
+        invalidate_availability(venue.pk)
+        return CONFLICT
+    return BookingResult(booking)
+
+
+def reschedule_booking(booking, new_date):
+    """Pindahkan booking ke tanggal lain dengan satu UPDATE, dengan aturan konflik yang sama seperti create_booking."""
+    if new_date == booking.booking_date:
+        return BookingResult(booking)
+    if is_date_booked(booking.venue_id, new_date):
+        return CONFLICT
+
+    old_date = booking.booking_date
+    booking.booking_date = new_date
+    try:
+        with transaction.atomic():
+            booking.save(update_fields=['booking_date'])
+    except IntegrityError:
+        booking.booking_date = old_date
+        invalidate_availability(booking.venue_id)
+        return CONFLICT
+    return BookingResult(booking)
+
+
+BATCH_ALL_OR_NOTHING = 'all_or_nothing'
+BATCH_PARTIAL = 'partial'
+BATCH_MODES = (BATCH_ALL_OR_NOTHING, BATCH_PARTIAL)
+
+# Status per tanggal di BatchBookingResult
+CREATED = 'created'
+ALREADY_BOOKED = 'already_booked'
+PAST_DATE = 'past_date'
+SKIPPED = 'skipped'
+
+
+@dataclass(frozen=True)
+class BatchBookingResult:
+    """statuses: tanggal -> salah satu status di atas, bookings: booking yang benar-benar dibuat."""
+    statuses: dict
+    bookings: list
+
+    @property
+    def ok(self):
+        return all(status == CREATED for status in self.statuses.values())
+
+
+def create_bookings(user, venue, dates, mode=BATCH_ALL_OR_NOTHING):
+    """
+    Booking banyak tanggal sekaligus: satu query untuk tanggal yang sudah terisi, satu bulk INSERT.
+    all_or_nothing: tidak ada yang dibuat jika satu tanggal saja gagal. partial: tanggal yang kosong
+    tetap dibuat, bentrok dengan request lain di tengah jalan dilewati lewat ignore_conflicts.
+    """
+    dates = sorted(set(dates))
+    today = date.today()
+    taken = set(
+        Booking.objects.filter(venue=venue, booking_date__in=dates).order_by().values_list('booking_date', flat=True)
+    )
+    statuses = {}
+    for day in dates:
+        if day < today:
+            statuses[day] = PAST_DATE
+        elif day in taken:
+            statuses[day] = ALREADY_BOOKED
+    free = [day for day in dates if day not in statuses]
+
+    if (mode == BATCH_ALL_OR_NOTHING and statuses) or not free:
+        return BatchBookingResult({day: statuses.get(day, SKIPPED) for day in dates}, [])
+
+    new_bookings = [Booking(user=user, venue=venue, booking_date=day) for day in free]
+    if mode == BATCH_PARTIAL:
+        with transaction.atomic():
+            Booking.objects.bulk_create(new_bookings, ignore_conflicts=True)
+            # ignore_conflicts tidak mengisi pk, jadi ambil lagi baris yang benar-benar masuk
+            bookings = list(
+                Booking.objects.filter(venue=venue, user=user, booking_date__in=free).order_by('booking_date')
+            )
+    else:
+        try:
+            with transaction.atomic():
+                bookings = Booking.objects.bulk_create(new_bookings)
+        except IntegrityError:
+            # Didahului request lain di antara pengecekan dan INSERT
+            invalidate_availability(venue.pk)
+            taken = set(
+                Booking.objects.filter(venue=venue, booking_date__in=free).order_by().values_list('booking_date', flat=True)
+            )
+            return BatchBookingResult(
+                {day: statuses.get(day) or (ALREADY_BOOKED if day in taken else SKIPPED) for day in dates}, []
+            )
+
+    created = {booking.booking_date for booking in bookings}
+    for day in free:
+        statuses[day] = CREATED if day in created else ALREADY_BOOKED
+    # bulk_create tidak memicu signal, jadi bitset availability dan statistik user diperbarui langsung
+    apply_booking_change(venue.pk, added=sorted(created))
+    if created:
+        invalidate_stats(BOOKINGS_PER_USER)
+    return BatchBookingResult({day: statuses[day] for day in dates}, bookings)
@@ -0,0 +1,37 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from modules.booking.availability import apply_booking_change, invalidate_availability
+from modules.booking.models import Booking
+from modules.venue.models import Venue
+
+
+@receiver(post_save, sender=Booking)
+def update_availability_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    slot = (instance.venue_id, instance.booking_date)
+    if created:
+        apply_booking_change(instance.venue_id, added=[instance.booking_date])
+    else:
+        old_venue_id, old_date = getattr(instance, '_loaded_slot', (None, None))
+        if old_venue_id != instance.venue_id or old_date is None:
+            invalidate_availability(instance.venue_id)
+            if old_venue_id is not None and old_venue_id != instance.venue_id:
+                invalidate_availability(old_venue_id)
+        elif old_date != instance.booking_date:
+            apply_booking_change(instance.venue_id, added=[instance.booking_date], removed=[old_date])
+    instance._loaded_slot = slot
+
+
+@receiver(post_delete, sender=Booking)
+def update_availability_on_delete(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Venue) and origin.pk == instance.venue_id:
+        # Bitset venue yang dihapus dibuang sekaligus oleh drop_availability_on_venue_delete
+        return
+    apply_booking_change(instance.venue_id, removed=[instance.booking_date])
+
+
+@receiver(post_delete, sender=Venue)
+def drop_availability_on_venue_delete(sender, instance, **kwargs):
+    invalidate_availability(instance.pk)
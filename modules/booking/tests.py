@@ -1,3 +1,316 @@
+import json
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from lapangin.testing import QueryBudgetMixin, create_catalog
+from modules.venue.models import Venue
+from .availability import VenueAvailability, get_availability
+from .models import Booking
+from .services import create_booking, reschedule_booking
+
+User = get_user_model()
+
+
+class VenueAvailabilityTest(TestCase):
+    """Bitset tanggal terbooking di cache untuk kalender dan pengecekan booking."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='penyewa', password='password123')
+        self.venue = Venue.objects.create(
+            name='Stadion Kalender', city='Depok', country='Indonesia', capacity=1000, price=100
+        )
+        self.today = date.today()
+        self.client.login(username='penyewa', password='password123')
+
+    def booked_dates(self):
+        url = reverse('booking:get_booked_dates_api', args=[self.venue.id])
+        return self.client.get(url).json()['booked_dates']
+
+    def book(self, day):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Booking.objects.create(user=self.user, venue=self.venue, booking_date=day)
+
+    def test_bitset_and_overflow(self):
+        availability = VenueAvailability(self.today, 10)
+        for offset in (0, 3, 9, 10, 400):
+            availability.add(self.today + timedelta(days=offset))
+        availability.add(self.today - timedelta(days=1))
+        availability.discard(self.today + timedelta(days=3))
+
+        self.assertTrue(availability.is_booked(self.today + timedelta(days=400)))
+        self.assertFalse(availability.is_booked(self.today + timedelta(days=3)))
+        self.assertEqual(
+            availability.booked_dates(since=self.today + timedelta(days=1)),
+            [self.today + timedelta(days=offset) for offset in (9, 10, 400)],
+        )
+        restored = VenueAvailability.from_cache(availability.to_cache())
+        self.assertEqual(restored.booked_dates(), availability.booked_dates())
+
+    def test_calendar_reads_from_cache(self):
+        self.book(self.today + timedelta(days=2))
+        self.book(self.today + timedelta(days=500))
+        Booking.objects.bulk_create([
+            Booking(user=self.user, venue=self.venue, booking_date=self.today - timedelta(days=1))
+        ])
+        expected = [(self.today + timedelta(days=offset)).isoformat() for offset in (500, 2)]
+
+        self.assertEqual(self.booked_dates(), expected)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.booked_dates(), expected)
+        self.assertFalse(any('booking_booking' in query['sql'] for query in ctx.captured_queries))
+
+        flutter_url = reverse('booking:flutter_get_booked_dates', args=[self.venue.id])
+        self.assertEqual(self.client.get(flutter_url).json()['data']['booked_dates'], expected)
+
+    def test_create_edit_delete_update_cache_incrementally(self):
+        self.assertEqual(self.booked_dates(), [])
+        first_day = self.today + timedelta(days=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('booking:create_booking_api'),
+                json.dumps({'venue_id': str(self.venue.id), 'booking_date': first_day.isoformat()}),
+                content_type='application/json',
+            )
+        booking_id = response.json()['booking_details']['id']
+        self.assertEqual(self.booked_dates(), [first_day.isoformat()])
+
+        new_day = self.today + timedelta(days=7)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('booking:edit_booking_api', args=[booking_id]),
+                json.dumps({'booking_date': new_day.isoformat()}),
+                content_type='application/json',
+            )
+        self.assertEqual(self.booked_dates(), [new_day.isoformat()])
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(get_availability(self.venue.id).is_booked(new_day))
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('booking:delete_booking_api', args=[booking_id]))
+        self.assertEqual(self.booked_dates(), [])
+
+    def test_create_rejects_date_booked_in_cache(self):
+        day = self.today + timedelta(days=1)
+        self.book(day)
+        response = self.client.post(
+            reverse('booking:create_booking_api'),
+            json.dumps({'venue_id': str(self.venue.id), 'booking_date': day.isoformat()}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['message'], 'Tanggal ini sudah dibooking.')
+
+    def test_missing_or_deleted_venue_returns_404(self):
+        url = reverse('booking:get_booked_dates_api', args=[self.venue.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.venue.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class BookingServiceTest(TestCase):
+    """Penulisan booking lewat satu INSERT/UPDATE atomik dengan hasil konflik yang bertipe."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='penyewa', password='password123')
+        self.other = User.objects.create_user(username='lain', password='password123')
+        self.venue = Venue.objects.create(
+            name='Stadion Servis', city='Bogor', country='Indonesia', capacity=1000, price=100
+        )
+        self.day = date.today() + timedelta(days=3)
+
+    def test_create_and_conflict(self):
+        result = create_booking(self.user, self.venue, self.day)
+        self.assertTrue(result.ok)
+        self.assertEqual(result.booking.booking_date, self.day)
+
+        conflict = create_booking(self.other, self.venue, self.day)
+        self.assertTrue(conflict.conflict)
+        self.assertIsNone(conflict.booking)
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_conflict_from_database_when_cache_is_stale(self):
+        # Bitset sudah di-cache, lalu booking masuk lewat jalur yang tidak memicu signal
+        self.assertFalse(get_availability(self.venue.id).is_booked(self.day))
+        Booking.objects.bulk_create([Booking(user=self.other, venue=self.venue, booking_date=self.day)])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = create_booking(self.user, self.venue, self.day)
+        self.assertTrue(result.conflict)
+        self.assertTrue(get_availability(self.venue.id).is_booked(self.day))
+
+    def test_reschedule(self):
+        booking = create_booking(self.user, self.venue, self.day).booking
+        taken = self.day + timedelta(days=1)
+        Booking.objects.bulk_create([Booking(user=self.other, venue=self.venue, booking_date=taken)])
+
+        self.assertTrue(reschedule_booking(booking, self.day).ok)
+        self.assertTrue(reschedule_booking(booking, taken).conflict)
+        booking.refresh_from_db()
+        self.assertEqual(booking.booking_date, self.day)
+
+        free = self.day + timedelta(days=2)
+        self.assertTrue(reschedule_booking(booking, free).ok)
+        booking.refresh_from_db()
+        self.assertEqual(booking.booking_date, free)
+
+    def test_flutter_create_conflict_response(self):
+        create_booking(self.other, self.venue, self.day)
+        self.client.login(username='penyewa', password='password123')
+        response = self.client.post(
+            reverse('booking:flutter_create_booking'),
+            json.dumps({'venue_id': str(self.venue.id), 'booking_date': self.day.isoformat()}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'status': False, 'message': 'This date is already booked.'})
+
+
+class BatchBookingTest(TestCase):
+    """flutter/batch/: banyak tanggal dalam satu request, mode all_or_nothing dan partial."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='panitia', password='password123')
+        self.other = User.objects.create_user(username='lain', password='password123')
+        self.venue = Venue.objects.create(
+            name='Stadion Turnamen', city='Solo', country='Indonesia', capacity=20000, price=100
+        )
+        self.start = date.today() + timedelta(days=10)
+        self.url = reverse('booking:flutter_batch_booking')
+        self.client.login(username='panitia', password='password123')
+
+    def post(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                self.url, json.dumps({'venue_id': str(self.venue.id), **payload}), content_type='application/json'
+            )
+
+    def statuses(self, response):
+        return [result['status'] for result in response.json()['data']['results']]
+
+    def test_range_books_every_day_in_few_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.post({
+                'start_date': self.start.isoformat(),
+                'end_date': (self.start + timedelta(days=29)).isoformat(),
+            })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['data']['created_count'], 30)
+        self.assertEqual(Booking.objects.filter(venue=self.venue, user=self.user).count(), 30)
+        self.assertEqual(len([q for q in ctx.captured_queries if 'booking_booking' in q['sql']]), 2)
+
+        booked = get_availability(self.venue.id)
+        self.assertTrue(booked.is_booked(self.start + timedelta(days=29)))
+
+    def test_all_or_nothing_rejects_whole_batch(self):
+        taken = self.start + timedelta(days=1)
+        create_booking(self.other, self.venue, taken)
+        dates = [(self.start + timedelta(days=offset)).isoformat() for offset in range(3)]
+
+        response = self.post({'dates': dates})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.statuses(response), ['skipped', 'already_booked', 'skipped'])
+        self.assertFalse(Booking.objects.filter(user=self.user).exists())
+
+    def test_partial_books_free_dates(self):
+        taken = self.start + timedelta(days=1)
+        create_booking(self.other, self.venue, taken)
+        past = date.today() - timedelta(days=1)
+        dates = [past.isoformat()] + [(self.start + timedelta(days=offset)).isoformat() for offset in range(3)]
+
+        response = self.post({'dates': dates, 'mode': 'partial'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.statuses(response), ['past_date', 'created', 'already_booked', 'created'])
+        results = response.json()['data']['results']
+        self.assertIsNotNone(results[1]['booking_id'])
+        self.assertIsNone(results[2]['booking_id'])
+
+    def test_validation(self):
+        self.assertEqual(self.post({'dates': ['2025-13-01']}).status_code, 400)
+        self.assertEqual(self.post({'dates': [self.start.isoformat()], 'mode': 'kadang'}).status_code, 400)
+        self.assertEqual(self.post({
+            'start_date': self.start.isoformat(),
+            'end_date': (self.start + timedelta(days=1000)).isoformat(),
+        }).status_code, 400)
+        response = self.client.post(
+            self.url, json.dumps({'venue_id': str(uuid.uuid4()), 'dates': [self.start.isoformat()]}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class BookingApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint JSON booking tidak boleh bertambah seiring jumlah booking user/venue."""
+
+    query_budgets = {
+        'booking:get_booked_dates_api': 2,
+        'booking:flutter_get_booked_dates': 2,
+        'booking:create_booking_api': 8,
+        'booking:flutter_create_booking': 8,
+        'booking:flutter_batch_booking': 7,
+        'booking:get_user_bookings_api': 3,
+        'booking:flutter_get_user_bookings': 3,
+        'booking:edit_booking_api': 8,
+        'booking:flutter_edit_booking': 8,
+        'booking:delete_booking_api': 4,
+        'booking:flutter_delete_booking': 4,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = create_catalog()
+        cls.venue = cls.catalog['venues'][0]
+        cls.user = cls.catalog['users'][0]
+        cls.bookings = [booking for booking in cls.catalog['bookings'] if booking.user_id == cls.user.id]
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def post_json(self, name, payload, args=None):
+        return self.post_within_budget(name, args=args, data=json.dumps(payload), content_type='application/json')
+
+    def day(self, offset):
+        return (date.today() + timedelta(days=offset)).isoformat()
+
+    def test_booked_dates(self):
+        data = self.get_within_budget('booking:get_booked_dates_api', args=[self.venue.id]).json()
+        self.assertEqual(len(data['booked_dates']), 30)
+        self.get_within_budget('booking:flutter_get_booked_dates', args=[self.venue.id])
+
+    def test_history(self):
+        self.assertEqual(len(self.get_within_budget('booking:get_user_bookings_api').json()['bookings']), 10)
+        data = self.get_within_budget('booking:flutter_get_user_bookings').json()
+        self.assertEqual(data['data']['total_bookings'], 10)
+
+    def test_create(self):
+        venue_id = str(self.venue.id)
+        response = self.post_json('booking:create_booking_api', {'venue_id': venue_id, 'booking_date': self.day(100)})
+        self.assertTrue(response.json()['success'])
+        response = self.post_json('booking:flutter_create_booking', {'venue_id': venue_id, 'booking_date': self.day(101)})
+        self.assertEqual(response.status_code, 201)
+        response = self.post_json('booking:flutter_batch_booking', {
+            'venue_id': venue_id, 'start_date': self.day(110), 'end_date': self.day(139),
+        })
+        self.assertEqual(response.json()['data']['created_count'], 30)
 
-# Create your tests here.
+    def test_edit_and_delete(self):
+        first, second, third = self.bookings[:3]
+        self.get_within_budget('booking:edit_booking_api', args=[first.id], budget=3)
+        response = self.post_json('booking:edit_booking_api', {'booking_date': self.day(200)}, args=[first.id])
+        self.assertTrue(response.json()['success'])
+        response = self.post_json('booking:flutter_edit_booking', {'booking_date': self.day(201)}, args=[first.id])
+        self.assertTrue(response.json()['status'])
+        self.assertTrue(self.post_within_budget('booking:delete_booking_api', args=[second.id]).json()['success'])
+        self.assertTrue(self.post_within_budget('booking:flutter_delete_booking', args=[third.id]).json()['status'])
@@ -16,6 +16,7 @@ urlpatterns = [
     # Flutter API endpoints
     path('flutter/booked-dates/<uuid:venue_id>/', views.flutter_get_booked_dates, name='flutter_get_booked_dates'),
     path('flutter/create/', views.flutter_create_booking, name='flutter_create_booking'),
+    path('flutter/batch/', views.flutter_batch_booking, name='flutter_batch_booking'),
     path('flutter/my-bookings/', views.flutter_get_user_bookings, name='flutter_get_user_bookings'),
     path('flutter/edit/<int:booking_id>/', views.flutter_edit_booking, name='flutter_edit_booking'),
     path('flutter/delete/<int:booking_id>/', views.flutter_delete_booking, name='flutter_delete_booking'),
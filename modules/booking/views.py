@@ -1,15 +1,27 @@
 from .models import Booking
-from datetime import date
+from datetime import date, timedelta
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import ValidationError
 from django.db.models import F
 from django.http import JsonResponse
 from django.shortcuts import render, get_object_or_404
 from django.urls import reverse
 from django.views.decorators.http import require_POST, require_GET, require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from modules.venue.models import Venue
+from modules.venue.models import Venue, card_fields
+from modules.venue.thumbnails import absolute_thumbnail_url
+from modules.booking.availability import get_availability
+from modules.user.capabilities import is_admin, user_info
+from modules.booking.services import BATCH_ALL_OR_NOTHING, BATCH_MODES, create_booking, create_bookings, reschedule_booking
 import json
 
+# Booking list hanya butuh kolom kartu venue, bukan description/facilities/rules
+BOOKING_LIST_FIELDS = ('id', 'booking_date', 'created_at', 'venue', *card_fields('venue'))
+# Edit/hapus satu booking juga mengecek pemiliknya lewat user_id
+BOOKING_DETAIL_FIELDS = BOOKING_LIST_FIELDS + ('user',)
+DEFAULT_THUMBNAIL = '/static/img/default-thumbnail.jpg'
+
 @login_required
 def booking_history_page(request):
     return render(request, 'booking_history.html')
@@ -17,13 +29,13 @@ def booking_history_page(request):
 
 @require_GET
 def get_booked_dates_api(request, venue_id):
-    if not Venue.objects.filter(pk=venue_id).exists():
+    # Dibaca dari bitset availability di cache, bukan query ke Booking
+    availability = get_availability(venue_id)
+    if availability is None:
         return JsonResponse({'error': 'Venue not found.'}, status=404)
 
-    booked_dates = Booking.objects.filter(
-        venue_id=venue_id,  
-        booking_date__gte=date.today()
-    ).values_list('booking_date', flat=True)
+    # Urutan terbaru dulu, sama seperti ordering bawaan Booking
+    booked_dates = reversed(availability.booked_dates(since=date.today()))
 
     booked_date_strings = [d.isoformat() for d in booked_dates]
 
@@ -47,23 +59,18 @@ def create_booking_api(request):
         if not all([venue_id, date_str]):
             return JsonResponse({'success': False, 'message': 'Data tidak lengkap (venue_id, booking_date).'}, status=400)
 
-        venue = get_object_or_404(Venue, pk=venue_id)
+        venue = get_object_or_404(Venue.objects.card(), pk=venue_id)
         booking_date = date.fromisoformat(date_str)
 
         # Validation
         if booking_date < date.today():
             return JsonResponse({'success': False, 'message': 'Tanggal booking tidak boleh di masa lalu.'}, status=400)
 
-        # Check if already booked
-        if Booking.objects.filter(venue=venue, booking_date=booking_date).exists():
+        # Create Booking (insert atomik, bentrok tanggal dilaporkan lewat result.conflict)
+        result = create_booking(request.user, venue, booking_date)
+        if result.conflict:
             return JsonResponse({'success': False, 'message': 'Tanggal ini sudah dibooking.'}, status=400)
-
-        # Create Booking
-        booking = Booking.objects.create(
-            user=request.user,
-            venue=venue,
-            booking_date=booking_date
-        )
+        booking = result.booking
 
         return JsonResponse({
             'success': True,
@@ -82,14 +89,12 @@ def create_booking_api(request):
     except Venue.DoesNotExist:
         return JsonResponse({'success': False, 'message': 'Venue tidak ditemukan.'}, status=404)
     except Exception as e:
-        if 'UNIQUE constraint failed' in str(e):
-            return JsonResponse({'success': False, 'message': 'Tanggal ini sudah dibooking.'}, status=400)
         return JsonResponse({'success': False, 'message': f'Terjadi kesalahan server: {str(e)}'}, status=500)
 
 
 @csrf_exempt
 def get_user_bookings_api(request):
-    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').order_by('-booking_date')
+    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').only(*BOOKING_LIST_FIELDS).order_by('-booking_date')
     bookings_data = []
     for booking in user_bookings:
         can_modify = booking.booking_date >= date.today()
@@ -97,7 +102,7 @@ def get_user_bookings_api(request):
             'booking_id': booking.id,
             'venue_id': booking.venue.id,
             'venue_name': booking.venue.name,
-            'venue_thumbnail': booking.venue.thumbnail if booking.venue.thumbnail else '/static/img/default-thumbnail.jpg',
+            'venue_thumbnail': absolute_thumbnail_url(booking.venue.thumbnail or DEFAULT_THUMBNAIL, request),
             'booking_date': booking.booking_date.isoformat(),
             'created_at': booking.created_at.isoformat(),
             'can_modify': can_modify,
@@ -132,15 +137,9 @@ def edit_booking_api(request, booking_id):
             if new_date < date.today():
                 return JsonResponse({'success': False, 'message': 'Tanggal baru tidak boleh di masa lalu.'}, status=400)
 
-            if Booking.objects.filter(
-                venue=booking.venue,
-                booking_date=new_date
-            ).exclude(pk=booking.id).exists():
+            if reschedule_booking(booking, new_date).conflict:
                 return JsonResponse({'success': False, 'message': 'Tanggal baru tersebut sudah dibooking.'}, status=400)
 
-            booking.booking_date = new_date
-            booking.save(update_fields=['booking_date'])
-
             return JsonResponse({
                 'success': True,
                 'message': 'Tanggal booking berhasil diperbarui.',
@@ -170,7 +169,9 @@ def delete_booking_api(request, booking_id):
             'success': False,
             'message': 'Authentication credentials were not provided.'
         }, status=401)
-    booking = get_object_or_404(Booking, pk=booking_id, user=request.user)
+    booking = get_object_or_404(
+        Booking.objects.select_related('venue').only(*BOOKING_DETAIL_FIELDS), pk=booking_id, user=request.user
+    )
 
     if booking.booking_date < date.today():
         return JsonResponse({'success': False, 'message': 'Booking yang sudah lewat tidak bisa dihapus.'}, status=403)
@@ -193,29 +194,15 @@ def delete_booking_api(request, booking_id):
 # FLUTTER API ENDPOINTS
 # ============================================
 
-def get_user_info(user):
-    """Helper function to get user info for Flutter"""
-    return {
-        'user_id': user.id,
-        'username': user.username,
-        'is_authenticated': True,
-        'is_superuser': user.is_superuser,
-        'is_staff': user.is_staff,
-        'is_admin': user.is_superuser or user.is_staff,
-    }
-
-
 @csrf_exempt
 @require_GET
 def flutter_get_booked_dates(request, venue_id):
     """Get booked dates for a venue - Flutter API"""
-    if not Venue.objects.filter(pk=venue_id).exists():
+    availability = get_availability(venue_id)
+    if availability is None:
         return JsonResponse({'status': False, 'message': 'Venue not found.'}, status=404)
 
-    booked_dates = Booking.objects.filter(
-        venue_id=venue_id,
-        booking_date__gte=date.today()
-    ).values_list('booking_date', flat=True)
+    booked_dates = reversed(availability.booked_dates(since=date.today()))
 
     booked_date_strings = [d.isoformat() for d in booked_dates]
 
@@ -251,7 +238,7 @@ def flutter_create_booking(request):
                 'message': 'Incomplete data. venue_id and booking_date are required.'
             }, status=400)
 
-        venue = get_object_or_404(Venue, pk=venue_id)
+        venue = get_object_or_404(Venue.objects.card(), pk=venue_id)
         booking_date = date.fromisoformat(date_str)
 
         if booking_date < date.today():
@@ -260,27 +247,23 @@ def flutter_create_booking(request):
                 'message': 'Booking date cannot be in the past.'
             }, status=400)
 
-        if Booking.objects.filter(venue=venue, booking_date=booking_date).exists():
+        result = create_booking(request.user, venue, booking_date)
+        if result.conflict:
             return JsonResponse({
                 'status': False,
                 'message': 'This date is already booked.'
             }, status=400)
-
-        booking = Booking.objects.create(
-            user=request.user,
-            venue=venue,
-            booking_date=booking_date
-        )
+        booking = result.booking
 
         return JsonResponse({
             'status': True,
             'message': 'Booking created successfully!',
-            'user': get_user_info(request.user),
+            'user': user_info(request.user),
             'data': {
                 'booking_id': booking.id,
                 'venue_id': str(booking.venue.id),
                 'venue_name': booking.venue.name,
-                'venue_thumbnail': booking.venue.thumbnail if booking.venue.thumbnail else '',
+                'venue_thumbnail': absolute_thumbnail_url(booking.venue.thumbnail, request),
                 'booking_date': booking.booking_date.isoformat(),
                 'created_at': booking.created_at.isoformat(),
             }
@@ -293,11 +276,90 @@ def flutter_create_booking(request):
     except Venue.DoesNotExist:
         return JsonResponse({'status': False, 'message': 'Venue not found.'}, status=404)
     except Exception as e:
-        if 'UNIQUE constraint failed' in str(e):
-            return JsonResponse({'status': False, 'message': 'This date is already booked.'}, status=400)
         return JsonResponse({'status': False, 'message': f'Server error: {str(e)}'}, status=500)
 
 
+@csrf_exempt
+@require_POST
+def flutter_batch_booking(request):
+    """Book a list or range of dates for one venue in a single request - Flutter API"""
+    if not request.user.is_authenticated:
+        return JsonResponse({
+            'status': False,
+            'message': 'Authentication required. Please login first.',
+            'user': None
+        }, status=401)
+
+    max_dates = settings.BOOKING_BATCH_MAX_DATES
+    try:
+        data = json.loads(request.body)
+        venue_id = data.get('venue_id')
+        mode = data.get('mode', BATCH_ALL_OR_NOTHING)
+
+        if mode not in BATCH_MODES:
+            return JsonResponse({
+                'status': False,
+                'message': f'Invalid mode. Use one of: {", ".join(BATCH_MODES)}.'
+            }, status=400)
+
+        if isinstance(data.get('dates'), list):
+            dates = [date.fromisoformat(value) for value in data['dates']]
+        elif data.get('start_date') and data.get('end_date'):
+            start_date = date.fromisoformat(data['start_date'])
+            end_date = date.fromisoformat(data['end_date'])
+            if end_date < start_date:
+                return JsonResponse({'status': False, 'message': 'end_date cannot be before start_date.'}, status=400)
+            days = (end_date - start_date).days + 1
+            dates = [start_date + timedelta(days=offset) for offset in range(min(days, max_dates + 1))]
+        else:
+            dates = []
+
+        if not venue_id or not dates:
+            return JsonResponse({
+                'status': False,
+                'message': 'Incomplete data. venue_id and either dates or start_date/end_date are required.'
+            }, status=400)
+
+        if len(set(dates)) > max_dates:
+            return JsonResponse({
+                'status': False,
+                'message': f'At most {max_dates} dates can be booked in one request.'
+            }, status=400)
+
+        try:
+            venue = Venue.objects.card().get(pk=venue_id)
+        except (Venue.DoesNotExist, ValidationError):
+            return JsonResponse({'status': False, 'message': 'Venue not found.'}, status=404)
+
+        result = create_bookings(request.user, venue, dates, mode)
+        booking_ids = {booking.booking_date: booking.id for booking in result.bookings}
+
+        return JsonResponse({
+            'status': bool(result.bookings),
+            'message': f'{len(result.bookings)} of {len(result.statuses)} dates booked.',
+            'user': user_info(request.user),
+            'data': {
+                'venue_id': str(venue.id),
+                'venue_name': venue.name,
+                'mode': mode,
+                'created_count': len(result.bookings),
+                'results': [
+                    {
+                        'booking_date': booking_date.isoformat(),
+                        'status': status,
+                        'booking_id': booking_ids.get(booking_date),
+                    }
+                    for booking_date, status in result.statuses.items()
+                ],
+            }
+        }, status=201 if result.bookings else 400)
+
+    except json.JSONDecodeError:
+        return JsonResponse({'status': False, 'message': 'Invalid JSON format.'}, status=400)
+    except (ValueError, TypeError):
+        return JsonResponse({'status': False, 'message': 'Invalid date format. Use YYYY-MM-DD.'}, status=400)
+
+
 @csrf_exempt
 @require_GET
 def flutter_get_user_bookings(request):
@@ -309,7 +371,7 @@ def flutter_get_user_bookings(request):
             'user': None
         }, status=401)
 
-    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').order_by('-booking_date')
+    user_bookings = Booking.objects.filter(user=request.user).select_related('venue').only(*BOOKING_LIST_FIELDS).order_by('-booking_date')
     bookings_data = []
     
     for booking in user_bookings:
@@ -332,7 +394,7 @@ def flutter_get_user_bookings(request):
             'venue_id': str(booking.venue.id),
             'venue_name': booking.venue.name,
             'venue_city': booking.venue.city,
-            'venue_thumbnail': booking.venue.thumbnail if booking.venue.thumbnail else '',
+            'venue_thumbnail': absolute_thumbnail_url(booking.venue.thumbnail, request),
             'venue_price': booking.venue.price,
             'booking_date': booking.booking_date.isoformat(),
             'created_at': booking.created_at.isoformat(),
@@ -344,7 +406,7 @@ def flutter_get_user_bookings(request):
     return JsonResponse({
         'status': True,
         'message': 'Bookings retrieved successfully.',
-        'user': get_user_info(request.user),
+        'user': user_info(request.user),
         'data': {
             'total_bookings': len(bookings_data),
             'bookings': bookings_data
@@ -364,15 +426,14 @@ def flutter_edit_booking(request, booking_id):
         }, status=401)
 
     try:
-        booking = Booking.objects.get(pk=booking_id)
+        booking = Booking.objects.select_related('venue').only(*BOOKING_DETAIL_FIELDS).get(pk=booking_id)
         
         # Check if user owns the booking OR is admin/staff
-        is_admin = request.user.is_superuser or request.user.is_staff
-        if booking.user != request.user and not is_admin:
+        if booking.user_id != request.user.id and not is_admin(request.user):
             return JsonResponse({
                 'status': False,
                 'message': 'You do not have permission to edit this booking.',
-                'user': get_user_info(request.user)
+                'user': user_info(request.user)
             }, status=403)
             
     except Booking.DoesNotExist:
@@ -405,23 +466,17 @@ def flutter_edit_booking(request, booking_id):
                 'message': 'New date cannot be in the past.'
             }, status=400)
 
-        if Booking.objects.filter(
-            venue=booking.venue,
-            booking_date=new_date
-        ).exclude(pk=booking.id).exists():
+        old_date = booking.booking_date
+        if reschedule_booking(booking, new_date).conflict:
             return JsonResponse({
                 'status': False,
                 'message': 'The new date is already booked.'
             }, status=400)
 
-        old_date = booking.booking_date
-        booking.booking_date = new_date
-        booking.save(update_fields=['booking_date'])
-
         return JsonResponse({
             'status': True,
             'message': 'Booking date updated successfully.',
-            'user': get_user_info(request.user),
+            'user': user_info(request.user),
             'data': {
                 'booking_id': booking.id,
                 'venue_id': str(booking.venue.id),
@@ -451,15 +506,14 @@ def flutter_delete_booking(request, booking_id):
         }, status=401)
 
     try:
-        booking = Booking.objects.get(pk=booking_id)
+        booking = Booking.objects.select_related('venue').only(*BOOKING_DETAIL_FIELDS).get(pk=booking_id)
         
         # Check if user owns the booking OR is admin/staff
-        is_admin = request.user.is_superuser or request.user.is_staff
-        if booking.user != request.user and not is_admin:
+        if booking.user_id != request.user.id and not is_admin(request.user):
             return JsonResponse({
                 'status': False,
                 'message': 'You do not have permission to delete this booking.',
-                'user': get_user_info(request.user)
+                'user': user_info(request.user)
             }, status=403)
             
     except Booking.DoesNotExist:
@@ -485,7 +539,7 @@ def flutter_delete_booking(request, booking_id):
         return JsonResponse({
             'status': True,
             'message': f'Booking for {booking_data["venue_name"]} on {booking_data["booking_date"]} has been cancelled.',
-            'user': get_user_info(request.user),
+            'user': user_info(request.user),
             'data': booking_data
         })
     except Exception as e:
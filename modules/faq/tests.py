@@ -2,6 +2,8 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User
 from .models import FAQ 
+import json
+from lapangin.testing import QueryBudgetMixin
 
 class FAQTestSetup(TestCase):
     """menyiapkan pengguna dan data awal"""
@@ -161,4 +163,41 @@ class FAQFilterTest(FAQTestSetup):
         self.assertEqual(response.status_code, 200)
         
         self.assertContains(response, self.faq1.question)
-        self.assertContains(response, self.faq2.question)
\ No newline at end of file
+        self.assertContains(response, self.faq2.question)
+
+class FAQApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint JSON FAQ tidak boleh bertambah seiring jumlah FAQ."""
+
+    query_budgets = {
+        # FK created_by diserialisasi sebagai id saja, jadi tetap satu query berapapun jumlah FAQ
+        'faq:show_json': 1,
+        'faq:show_json_by_category': 1,
+        # Sesi + user (created_by) + INSERT
+        'faq:create_faq_flutter': 3,
+        # View ini tidak membaca request.user: SELECT FAQ + UPDATE/DELETE
+        'faq:update_faq_flutter': 2,
+        'faq:delete_faq_flutter': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='password123', is_staff=True)
+        FAQ.objects.bulk_create([
+            FAQ(question=f'Pertanyaan {i}', answer='Jawaban', category='venue' if i % 2 else 'pembayaran',
+                created_by=cls.admin)
+            for i in range(100)
+        ])
+
+    def test_read(self):
+        self.assertEqual(len(self.get_within_budget('faq:show_json').json()), 100)
+        self.assertEqual(len(self.get_within_budget('faq:show_json_by_category', args=['venue']).json()), 50)
+
+    def test_write(self):
+        self.client.force_login(self.admin)
+        payload = json.dumps({'question': 'Baru?', 'answer': 'Ya', 'category': 'venue'})
+        pk = self.post_within_budget('faq:create_faq_flutter', data=payload, content_type='application/json').json()['pk']
+        response = self.post_within_budget(
+            'faq:update_faq_flutter', args=[pk], data=json.dumps({'answer': 'Tidak'}), content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.post_within_budget('faq:delete_faq_flutter', args=[pk]).status_code, 200)
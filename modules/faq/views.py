@@ -111,7 +111,6 @@ def create_faq_flutter(request):
             category=category,
             created_by=request.user if request.user.is_authenticated else None
         )
-        new_faq.save()
 
         return JsonResponse({"status": "success", "pk": str(new_faq.id)}, status=200)
     else:
@@ -0,0 +1,270 @@
+import json
+import random
+import time
+import tracemalloc
+from contextlib import ExitStack
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from lapangin.middleware import PERCENTILES, QueryCounter, percentile
+from modules.booking.availability import invalidate_availability
+from modules.booking.models import Booking
+from modules.review.models import Review
+from modules.venue.leaderboard import invalidate_leaderboards
+from modules.venue.models import Venue
+from modules.venue.response_cache import bump_versions
+
+ENDPOINTS = (
+    'search_venues_api', 'get_booked_dates_api', 'create_booking_api', 'get_venue_reviews', 'user_list_api',
+    'show_json',
+)
+# Endpoint yang membaca seluruh katalog; jumlah request-nya dibatasi heavy_requests
+HEAVY_ENDPOINTS = {'show_json'}
+# Porsi request yang mengenai venue terpopuler; sisanya venue acak
+HOT_SHARE = 0.8
+SAMPLE_VENUES = 200
+# Cache terpisah untuk benchmark supaya cache aplikasi tidak diisi data yang nanti di-rollback
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'lapangin-benchmark',
+    }
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class BenchmarkContext:
+    """Client dan sampel data yang dipakai untuk menyusun request tiap endpoint."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        User = get_user_model()
+        host = next((h for h in settings.ALLOWED_HOSTS if h and not h.startswith(('.', '*'))), 'localhost')
+        staff = User.objects.create(username='benchmark-staff', is_staff=True)
+        member = User.objects.create(username='benchmark-member')
+        self.anonymous = Client(HTTP_HOST=host)
+        self.staff = Client(HTTP_HOST=host)
+        self.staff.force_login(staff)
+        self.member = Client(HTTP_HOST=host)
+        self.member.force_login(member)
+
+        self.hot_venues = list(
+            Venue.objects.order_by('-review_count').values_list('id', flat=True)[:SAMPLE_VENUES // 4]
+        )
+        self.venues = list(Venue.objects.values_list('id', flat=True)[:SAMPLE_VENUES]) or self.hot_venues
+        self.cities = list(Venue.objects.values_list('city', flat=True).distinct()[:50])
+        self.booked_venues = set()
+
+    def venue(self):
+        pool = self.hot_venues if self.hot_venues and self.rng.random() < HOT_SHARE else self.venues
+        return self.rng.choice(pool)
+
+
+def search_venues_api(ctx):
+    params = ctx.rng.choice([
+        {},
+        {'search': 'stadion'},
+        {'city': ctx.rng.choice(ctx.cities)} if ctx.cities else {},
+        {'capacity_min': 10000, 'capacity_max': 50000},
+    ])
+    return ctx.anonymous.get(reverse('venue:search_venues_api'), params)
+
+
+def get_booked_dates_api(ctx):
+    return ctx.anonymous.get(reverse('booking:get_booked_dates_api', args=[ctx.venue()]))
+
+
+def create_booking_api(ctx):
+    venue_id = ctx.venue()
+    ctx.booked_venues.add(venue_id)
+    # Tanggal jauh ke depan supaya sebagian besar request benar-benar membuat booking
+    booking_date = date.today() + timedelta(days=ctx.rng.randint(400, 4000))
+    payload = {'venue_id': str(venue_id), 'booking_date': booking_date.isoformat()}
+    return ctx.member.post(reverse('booking:create_booking_api'), json.dumps(payload), content_type='application/json')
+
+
+def get_venue_reviews(ctx):
+    return ctx.member.get(reverse('review:get_venue_reviews', args=[ctx.venue()]))
+
+
+def user_list_api(ctx):
+    params = ctx.rng.choice([{}, {'search': 'synthetic1'}, {'status': 'active'}])
+    return ctx.staff.get(reverse('user:user_list_api'), params)
+
+
+def show_json(ctx):
+    return ctx.anonymous.get(reverse('venue:show_json'))
+
+
+REQUESTS = {
+    'search_venues_api': search_venues_api,
+    'get_booked_dates_api': get_booked_dates_api,
+    'create_booking_api': create_booking_api,
+    'get_venue_reviews': get_venue_reviews,
+    'user_list_api': user_list_api,
+    'show_json': show_json,
+}
+
+
+def run_on_commit_callbacks(pending):
+    """
+    Jalankan callback on_commit yang didaftarkan sesudah posisi pending[alias], seperti
+    TestCase.captureOnCommitCallbacks(execute=True). Benchmark berjalan di dalam transaksi yang
+    di-rollback, jadi tanpa ini pekerjaan sesudah commit (invalidasi cache) tidak pernah terjadi.
+    """
+    for conn in connections.all():
+        start = pending[conn.alias]
+        # Callback boleh mendaftarkan callback baru; ulangi sampai tidak ada yang tersisa
+        while len(conn.run_on_commit) > start:
+            callbacks = conn.run_on_commit[start:]
+            del conn.run_on_commit[start:]
+            for _sids, func, _robust in callbacks:
+                func()
+
+
+def timed_request(send, ctx):
+    """
+    Jalankan satu request (body streaming ikut dibaca) beserta callback on_commit-nya.
+    Return (ms, jumlah query, status).
+    """
+    counter = QueryCounter()
+    with ExitStack() as stack:
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(counter))
+        pending = {conn.alias: len(conn.run_on_commit) for conn in connections.all()}
+        start = time.perf_counter()
+        response = send(ctx)
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        run_on_commit_callbacks(pending)
+        elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, counter.count, response.status_code
+
+
+def measure(name, ctx, requests, warmup, memory_requests, cold):
+    send = REQUESTS[name]
+    for _ in range(warmup):
+        timed_request(send, ctx)
+
+    durations, queries, statuses = [], [], {}
+    for _ in range(requests):
+        if cold:
+            cache.clear()
+        elapsed, count, status = timed_request(send, ctx)
+        durations.append(elapsed)
+        queries.append(count)
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    # tracemalloc memperlambat request, jadi memori diukur di putaran terpisah dari latensi
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(memory_requests):
+            if cold:
+                cache.clear()
+            tracemalloc.reset_peak()
+            timed_request(send, ctx)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    durations.sort()
+    queries.sort()
+    return {
+        'requests': requests,
+        'status': statuses,
+        **{f'p{p}_ms': round(percentile(durations, p), 2) for p in PERCENTILES},
+        'mean_ms': round(sum(durations) / len(durations), 2) if durations else 0,
+        'queries_avg': round(sum(queries) / len(queries), 2) if queries else 0,
+        'queries_max': queries[-1] if queries else 0,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def dataset_size():
+    return {
+        'users': get_user_model().objects.count(),
+        'venues': Venue.objects.count(),
+        'bookings': Booking.objects.count(),
+        'reviews': Review.objects.count(),
+    }
+
+
+def run_benchmarks(endpoints=ENDPOINTS, requests=50, heavy_requests=5, warmup=3, memory_requests=3, cold=False,
+                   seed=0, shared_cache=False, progress=None):
+    """
+    Ukur latensi p50/p95/p99, jumlah query per request, dan puncak alokasi memori (tracemalloc) setiap
+    endpoint lewat Django test Client. Semua perubahan data (user benchmark, booking baru) di-rollback
+    di akhir; callback on_commit tiap request tetap dijalankan dan ikut terukur. Secara default
+    benchmark memakai cache lokal terpisah (BENCHMARK_CACHES) yang dibuang di akhir. shared_cache=True
+    mengukur terhadap cache yang dikonfigurasi, lalu membuang cache venue yang tersentuh; cold=True
+    dengan shared_cache mengosongkan cache itu sebelum setiap request.
+    """
+    with ExitStack() as stack:
+        if not shared_cache:
+            stack.enter_context(override_settings(CACHES=BENCHMARK_CACHES))
+            stack.callback(cache.clear)
+        return measure_endpoints(endpoints, requests, heavy_requests, warmup, memory_requests, cold, seed,
+                                 shared_cache, progress or (lambda message: None))
+
+
+def measure_endpoints(endpoints, requests, heavy_requests, warmup, memory_requests, cold, seed, shared_cache,
+                      progress):
+    report = {
+        'started_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'cache': settings.CACHES['default']['BACKEND'],
+        'shared_cache': shared_cache,
+        'cold': cold,
+        'seed': seed,
+        'dataset': dataset_size(),
+        'endpoints': {},
+    }
+    start = time.perf_counter()
+    ctx = None
+    try:
+        with transaction.atomic():
+            ctx = BenchmarkContext(random.Random(seed))
+            for name in endpoints:
+                count = min(requests, heavy_requests) if name in HEAVY_ENDPOINTS else requests
+                progress(f'{name}: {count} request...')
+                report['endpoints'][name] = measure(
+                    name, ctx, count, min(warmup, count), min(memory_requests, count), cold,
+                )
+            raise Rollback
+    except Rollback:
+        pass
+    finally:
+        # Cache bersama terlanjur diisi dari data yang sekarang sudah di-rollback
+        if shared_cache:
+            if ctx is not None:
+                for venue_id in ctx.booked_venues:
+                    invalidate_availability(venue_id)
+            bump_versions()
+            invalidate_leaderboards()
+    report['duration_s'] = round(time.perf_counter() - start, 2)
+    return report
+
+
+def compare_reports(previous, current):
+    """Selisih p95 dan query rata-rata per endpoint terhadap hasil sebelumnya: {endpoint: (p95_ms, query)}."""
+    changes = {}
+    for name, result in current['endpoints'].items():
+        before = previous.get('endpoints', {}).get(name)
+        if before:
+            changes[name] = (
+                round(result['p95_ms'] - before['p95_ms'], 2),
+                round(result['queries_avg'] - before['queries_avg'], 2),
+            )
+    return changes
@@ -0,0 +1,200 @@
+import csv
+import io
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+from modules.booking.models import Booking
+from modules.review.models import Review
+from modules.user.models import UserProfile
+from modules.venue.models import Venue
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+CSV = 'csv'
+JSONL = 'jsonl'
+PARQUET = 'parquet'
+FORMATS = (CSV, JSONL, PARQUET)
+CONTENT_TYPES = {
+    CSV: 'text/csv; charset=utf-8',
+    JSONL: 'application/x-ndjson',
+    PARQUET: 'application/vnd.apache.parquet',
+}
+
+
+class ExportError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type
+    fields: tuple
+    # Kolom untuk filter rentang tanggal; None jika dataset tidak punya kolom tanggal
+    date_field: str = None
+
+
+DATASETS = {
+    'venues': Dataset(Venue, (
+        'id', 'name', 'city', 'country', 'capacity', 'price', 'rating', 'review_count', 'home_teams',
+        'description', 'facilities', 'rules', 'owner_id', 'thumbnail',
+    )),
+    'bookings': Dataset(Booking, ('id', 'user_id', 'venue_id', 'booking_date', 'created_at'), 'created_at'),
+    'reviews': Dataset(Review, ('id', 'venue_id', 'user_id', 'rating', 'comment', 'created_at'), 'created_at'),
+    'profiles': Dataset(UserProfile, (
+        'id', 'user_id', 'full_name', 'phone', 'address', 'is_active', 'created_at', 'updated_at',
+    ), 'created_at'),
+}
+
+
+def parquet_available():
+    return pq is not None
+
+
+def export_fields(dataset, thumbnails=True):
+    fields = DATASETS[dataset].fields
+    return fields if thumbnails else tuple(field for field in fields if field != 'thumbnail')
+
+
+def export_queryset(dataset, fields, start=None, end=None):
+    """
+    values_list dataset diurutkan per primary key. start dan end (date, inklusif) memfilter kolom
+    tanggal dataset; dibandingkan sebagai rentang datetime supaya index kolomnya tetap terpakai.
+    """
+    spec = DATASETS[dataset]
+    queryset = spec.model.objects.order_by('pk').values_list(*fields)
+    if (start or end) and spec.date_field is None:
+        raise ExportError(f'Dataset {dataset} tidak bisa difilter berdasarkan tanggal.')
+    if start:
+        start = timezone.make_aware(datetime.combine(start, time.min))
+        queryset = queryset.filter(**{f'{spec.date_field}__gte': start})
+    if end:
+        end = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min))
+        queryset = queryset.filter(**{f'{spec.date_field}__lt': end})
+    return queryset
+
+
+def _plain(value):
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
+def _csv_value(value):
+    # Format tanggal sama dengan JSON Lines (ISO 8601)
+    return value.isoformat() if isinstance(value, (date, datetime)) else _plain(value)
+
+
+def _batches(queryset, chunk_size):
+    """List baris per chunk_size dari satu cursor database (.iterator())."""
+    batch = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_csv(fields, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in batches:
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def iter_jsonl(fields, batches):
+    for batch in batches:
+        yield ''.join(json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder) + '\n' for row in batch)
+
+
+def _arrow_type(field):
+    if isinstance(field, models.ForeignKey):
+        return _arrow_type(field.target_field)
+    if isinstance(field, (models.UUIDField, models.CharField, models.TextField)):
+        return pa.string()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, models.DecimalField):
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    if isinstance(field, models.FloatField):
+        return pa.float64()
+    return pa.int64()
+
+
+class _ByteSink(io.RawIOBase):
+    """File tujuan ParquetWriter yang isinya diambil (take) sesudah setiap row group."""
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def take(self):
+        data, self.parts = b''.join(self.parts), []
+        return data
+
+
+def iter_parquet(model, fields, batches):
+    """Parquet ditulis satu row group per batch; byte yang sudah jadi langsung di-yield."""
+    schema = pa.schema([(name, _arrow_type(model._meta.get_field(name.removesuffix('_id')))) for name in fields])
+    sink = _ByteSink()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in batches:
+            columns = zip(*batch)
+            writer.write_table(pa.table(
+                {name: [_plain(value) for value in column] for name, column in zip(fields, columns)}, schema=schema,
+            ))
+            yield sink.take()
+    yield sink.take()
+
+
+def export_rows(dataset, export_format, start=None, end=None, thumbnails=True, chunk_size=None):
+    """
+    Generator isi file export (str untuk csv/jsonl, bytes untuk parquet). Baris dibaca per chunk
+    lewat .iterator(), jadi memori tetap konstan berapapun ukuran tabelnya.
+    """
+    if dataset not in DATASETS:
+        raise ExportError(f'Dataset tidak dikenal: {dataset}.')
+    if export_format not in FORMATS:
+        raise ExportError(f'Format tidak dikenal: {export_format}.')
+    if export_format == PARQUET and not parquet_available():
+        raise ExportError('Format parquet membutuhkan pyarrow.')
+
+    fields = export_fields(dataset, thumbnails)
+    queryset = export_queryset(dataset, fields, start, end)
+    batches = _batches(queryset, chunk_size or settings.EXPORT_CHUNK_SIZE)
+    if export_format == CSV:
+        return iter_csv(fields, batches)
+    if export_format == JSONL:
+        return iter_jsonl(fields, batches)
+    return iter_parquet(DATASETS[dataset].model, fields, batches)
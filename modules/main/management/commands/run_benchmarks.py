@@ -0,0 +1,66 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from modules.main.benchmark import ENDPOINTS, compare_reports, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        'Ukur latensi p50/p95/p99, query per request, dan puncak memori endpoint API utama lewat '
+        'Django test Client. Hasil disimpan sebagai JSON agar bisa dibandingkan antar run.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', action='append', choices=ENDPOINTS, dest='endpoints',
+                            help='Endpoint yang diukur; boleh diulang (default semua).')
+        parser.add_argument('--requests', type=int, default=50, help='Request terukur per endpoint (default 50).')
+        parser.add_argument('--heavy-requests', type=int, default=5,
+                            help='Batas request untuk endpoint yang membaca seluruh katalog (default 5).')
+        parser.add_argument('--warmup', type=int, default=3, help='Request pemanasan yang tidak diukur.')
+        parser.add_argument('--memory-requests', type=int, default=3,
+                            help='Request tambahan dengan tracemalloc untuk puncak memori.')
+        parser.add_argument('--cold', action='store_true', help='Kosongkan cache sebelum setiap request.')
+        parser.add_argument(
+            '--shared-cache', action='store_true',
+            help='Ukur terhadap cache yang dikonfigurasi (default: cache lokal terpisah). Dengan --cold cache itu '
+                 'dikosongkan setiap request, dan cache venue yang tersentuh dibuang di akhir.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='File JSON hasil (default benchmark-<waktu>.json).')
+        parser.add_argument('--compare', help='File JSON run sebelumnya untuk dibandingkan.')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests minimal 1.')
+        previous = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    previous = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'Gagal membaca {options["compare"]}: {e}')
+
+        report = run_benchmarks(
+            endpoints=options['endpoints'] or ENDPOINTS, requests=options['requests'],
+            heavy_requests=options['heavy_requests'], warmup=options['warmup'],
+            memory_requests=options['memory_requests'], cold=options['cold'], seed=options['seed'],
+            shared_cache=options['shared_cache'], progress=self.stderr.write,
+        )
+        output = options['output'] or f'benchmark-{timezone.now():%Y%m%d-%H%M%S}.json'
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        changes = compare_reports(previous, report) if previous else {}
+        self.stdout.write(f'{"endpoint":<22} {"p50":>9} {"p95":>9} {"p99":>9} {"query":>7} {"memori":>10}')
+        for name, result in report['endpoints'].items():
+            line = (
+                f'{name:<22} {result["p50_ms"]:>7.1f}ms {result["p95_ms"]:>7.1f}ms {result["p99_ms"]:>7.1f}ms '
+                f'{result["queries_avg"]:>7.1f} {result["peak_memory_kb"]:>8.0f}KB'
+            )
+            if name in changes:
+                p95, queries = changes[name]
+                line += f'  (p95 {p95:+.1f}ms, query {queries:+.1f})'
+            self.stdout.write(line)
+        self.stdout.write(self.style.SUCCESS(f'Hasil disimpan ke {output}.'))
@@ -0,0 +1,193 @@
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from modules.booking.models import Booking
+from modules.review.models import Review
+from modules.review.ratings import rebuild_rating_histograms, rebuild_venue_ratings
+from modules.user.models import UserProfile
+from modules.user.search import index_users
+from modules.user.stats import invalidate_stats
+from modules.venue.leaderboard import invalidate_leaderboards
+from modules.venue.models import Venue
+from modules.venue.ownership import invalidate_ownership
+from modules.venue.response_cache import bump_versions
+from modules.venue.search import get_search_backend
+from modules.venue.synthetic import build_venues
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+USERNAME_PREFIX = 'synthetic'
+# Sebaran rating review condong ke 4-5 seperti data review sungguhan
+RATING_WEIGHTS = {1: 5, 2: 7, 3: 15, 4: 33, 5: 40}
+COMMENTS = ['', 'Lapangannya bagus.', 'Parkir agak sempit.', 'Rumput terawat, recommended!', 'Harga sesuai fasilitas.']
+
+
+@dataclass
+class SyntheticStats:
+    users: int = 0
+    venues: int = 0
+    bookings: int = 0
+    reviews: int = 0
+
+
+def popularity_weights(count, skew):
+    """Bobot kumulatif power law 1/rank^skew: venue di awal daftar menerima jauh lebih banyak booking/review."""
+    return list(accumulate(1 / (rank + 1) ** skew for rank in range(count)))
+
+
+def unique_pairs(rng, total, sample, batch_size, max_rounds=100):
+    """
+    Yield list pasangan unik hasil sample() per batch_size sampai total tercapai. Pasangan yang sudah
+    pernah keluar diulang undiannya, jadi venue populer yang sudah penuh meluber ke venue berikutnya.
+    """
+    seen = set()
+    produced = 0
+    rounds = 0
+    while produced < total and rounds < max_rounds:
+        batch = []
+        for pair in sample(min(batch_size, total - produced)):
+            if pair not in seen:
+                seen.add(pair)
+                batch.append(pair)
+        if not batch:
+            rounds += 1
+            continue
+        produced += len(batch)
+        yield batch
+
+
+def create_users(count, batch_size):
+    """User sintetis tanpa password yang bisa dipakai login; return list id-nya."""
+    User = get_user_model()
+    start = User.objects.filter(username__startswith=USERNAME_PREFIX).count()
+    password = make_password(None)
+    ids = []
+    for offset in range(0, count, batch_size):
+        users = User.objects.bulk_create([
+            User(
+                username=f'{USERNAME_PREFIX}{i}', email=f'{USERNAME_PREFIX}{i}@example.com', password=password,
+                first_name='Synthetic', last_name=str(i),
+            )
+            for i in range(start + offset, start + min(offset + batch_size, count))
+        ])
+        UserProfile.objects.bulk_create([UserProfile(user=user, full_name=user.get_full_name()) for user in users])
+        index_users(users)
+        ids.extend(user.pk for user in users)
+    return ids
+
+
+def create_venues(count, seed, batch_size, owner_ids):
+    """Simpan venue sintetis per batch. Id venue disimpan sebagai bytes UUID berurutan agar ringan di memori."""
+    owners = [get_user_model()(pk=pk) for pk in owner_ids]
+    ids = bytearray()
+    batch = []
+    for venue in build_venues(count, seed, owners, start=Venue.objects.count()):
+        ids += venue.id.bytes
+        batch.append(venue)
+        if len(batch) >= batch_size:
+            Venue.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        Venue.objects.bulk_create(batch)
+    return ids
+
+
+def venue_id_at(venue_ids, index):
+    return uuid.UUID(bytes=bytes(venue_ids[index * 16:(index + 1) * 16]))
+
+
+def create_bookings(count, rng, venue_ids, user_ids, weights, batch_size, days_back, days_ahead):
+    """Booking (venue, tanggal) unik; venue dipilih menurut bobot popularitas dan tanggal acak di rentang."""
+    venue_count = len(venue_ids) // 16
+    first_day = date.today() - timedelta(days=days_back)
+    span = days_back + days_ahead + 1
+
+    def sample(size):
+        venues = rng.choices(range(venue_count), cum_weights=weights, k=size)
+        return [venue * span + rng.randrange(span) for venue in venues]
+
+    created = 0
+    for batch in unique_pairs(rng, min(count, venue_count * span), sample, batch_size):
+        Booking.objects.bulk_create([
+            Booking(
+                venue_id=venue_id_at(venue_ids, key // span), user_id=rng.choice(user_ids),
+                booking_date=first_day + timedelta(days=key % span),
+            )
+            for key in batch
+        ])
+        created += len(batch)
+    return created
+
+
+def create_reviews(count, rng, venue_ids, user_ids, weights, batch_size):
+    """Paling banyak satu review per (user, venue), sama seperti add_review yang memakai update_or_create."""
+    venue_count = len(venue_ids) // 16
+    ratings, rating_weights = zip(*RATING_WEIGHTS.items())
+
+    def sample(size):
+        venues = rng.choices(range(venue_count), cum_weights=weights, k=size)
+        return [rng.randrange(len(user_ids)) * venue_count + venue for venue in venues]
+
+    created = 0
+    for batch in unique_pairs(rng, min(count, venue_count * len(user_ids)), sample, batch_size):
+        scores = rng.choices(ratings, rating_weights, k=len(batch))
+        Review.objects.bulk_create([
+            Review(
+                venue_id=venue_id_at(venue_ids, key % venue_count), user_id=user_ids[key // venue_count],
+                rating=Decimal(score), comment=rng.choice(COMMENTS),
+            )
+            for key, score in zip(batch, scores)
+        ])
+        created += len(batch)
+    return created
+
+
+def generate_dataset(venues, bookings, reviews, users, seed=0, skew=1.0, batch_size=5000,
+                     days_back=180, days_ahead=180, owners=None, progress=None):
+    """
+    Isi database dengan user, venue, booking, dan review sintetis. Popularitas venue mengikuti power
+    law (skew), jadi segelintir venue menampung sebagian besar booking dan review seperti di produksi.
+    Semua ditulis dengan bulk_create per batch_size, lalu agregat rating, index pencarian, dan versi
+    cache dibangun ulang sekali di akhir. Deterministik untuk seed yang sama pada database kosong.
+    """
+    progress = progress or (lambda message: None)
+    rng = random.Random(seed)
+    stats = SyntheticStats()
+
+    with transaction.atomic():
+        progress(f'Membuat {users} user...')
+        user_ids = create_users(users, batch_size)
+        stats.users = len(user_ids)
+        owner_ids = user_ids[:owners if owners is not None else max(1, len(user_ids) // 20)]
+
+        progress(f'Membuat {venues} venue...')
+        venue_ids = create_venues(venues, seed, batch_size, owner_ids)
+        stats.venues = len(venue_ids) // 16
+        if not stats.venues or not user_ids:
+            return stats
+
+        weights = popularity_weights(stats.venues, skew)
+        progress(f'Membuat {bookings} booking...')
+        stats.bookings = create_bookings(
+            bookings, rng, venue_ids, user_ids, weights, batch_size, days_back, days_ahead,
+        )
+        progress(f'Membuat {reviews} review...')
+        stats.reviews = create_reviews(reviews, rng, venue_ids, user_ids, weights, batch_size)
+
+    # bulk_create tidak memicu signal. Cache availability tidak perlu dibuang karena venue-nya baru.
+    progress('Membangun ulang rating venue dan index pencarian...')
+    rebuild_venue_ratings()
+    rebuild_rating_histograms()
+    get_search_backend().rebuild()
+    bump_versions()
+    invalidate_leaderboards()
+    invalidate_ownership(*owner_ids)
+    invalidate_stats()
+    return stats
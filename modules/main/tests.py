@@ -1,3 +1,275 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date, timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from lapangin.middleware import QueryMetricsMiddleware, metrics, percentile
+from lapangin.testing import QueryBudgetMixin, create_catalog, query_budget
+from modules.booking.models import Booking
+from modules.main.benchmark import ENDPOINTS, run_benchmarks, timed_request
+from modules.main.export import parquet_available
+from modules.main.synthetic import popularity_weights
+from modules.review.models import Review
+from modules.venue.models import Venue
+from modules.venue.response_cache import CATALOG, get_version
+
+User = get_user_model()
+
+
+class ExportDataTest(TestCase):
+    """Export dataset lewat command export_data dan endpoint admin."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='pemain', password='password123')
+        self.admin = User.objects.create_user(username='admin', password='password123', is_staff=True)
+        self.venue = Venue.objects.create(
+            name='Gelora', city='Jakarta', country='Indonesia', capacity=1000, price=100,
+            thumbnail='https://example.com/a.jpg',
+        )
+        today = date.today()
+        self.old = Booking.objects.create(user=self.user, venue=self.venue, booking_date=today + timedelta(days=1))
+        Booking.objects.filter(pk=self.old.pk).update(created_at=timezone.now() - timedelta(days=10))
+        self.new = Booking.objects.create(user=self.user, venue=self.venue, booking_date=today + timedelta(days=2))
+
+    def test_command_csv_without_thumbnails(self):
+        out = StringIO()
+        call_command('export_data', 'venues', no_thumbnails=True, stdout=out, stderr=StringIO())
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+
+        self.assertEqual(len(rows), 1)
+        self.assertEqual((rows[0]['id'], rows[0]['name']), (str(self.venue.id), 'Gelora'))
+        self.assertNotIn('thumbnail', rows[0])
+
+    def test_command_jsonl_to_file_with_date_range(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        path = os.path.join(tmp_dir, 'bookings.jsonl')
+        call_command(
+            'export_data', 'bookings', format='jsonl', output=path, start=timezone.localdate() - timedelta(days=1),
+            chunk_size=1, stderr=StringIO(),
+        )
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f]
+
+        self.assertEqual([row['id'] for row in rows], [self.new.id])
+        self.assertEqual(rows[0]['venue_id'], str(self.venue.id))
+
+    def test_command_rejects_date_range_for_venues(self):
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'venues', start=date.today(), stdout=StringIO())
+
+    def test_endpoint_requires_staff(self):
+        url = reverse('main:export_data', args=['bookings'])
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.login(username='pemain', password='password123')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_endpoint_streams_csv(self):
+        self.client.login(username='admin', password='password123')
+        response = self.client.get(reverse('main:export_data', args=['bookings']), {'end': timezone.localdate().isoformat()})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('bookings.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([int(row['id']) for row in rows], [self.old.id, self.new.id])
+
+    def test_endpoint_bad_request(self):
+        self.client.login(username='admin', password='password123')
+        self.assertEqual(self.client.get(reverse('main:export_data', args=['pembayaran'])).status_code, 400)
+        url = reverse('main:export_data', args=['bookings'])
+        self.assertEqual(self.client.get(url, {'start': 'kemarin'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'format': 'xml'}).status_code, 400)
+
+    @unittest.skipIf(parquet_available(), 'pyarrow terpasang')
+    def test_parquet_without_pyarrow(self):
+        self.client.login(username='admin', password='password123')
+        response = self.client.get(reverse('main:export_data', args=['venues']), {'format': 'parquet'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SyntheticBenchmarkTest(TestCase):
+    """Generator data sintetis dan runner benchmark dalam ukuran kecil."""
+
+    def generate(self, **options):
+        call_command(
+            'generate_synthetic_data', venues=40, bookings=300, reviews=200, users=10, batch_size=64,
+            stdout=StringIO(), **options,
+        )
+
+    def test_generate_creates_skewed_dataset(self):
+        self.generate()
+        self.assertEqual(Venue.objects.count(), 40)
+        self.assertEqual(Booking.objects.count(), 300)
+        self.assertEqual(Review.objects.count(), 200)
+        self.assertEqual(User.objects.filter(username__startswith='synthetic').count(), 10)
+
+        per_venue = sorted(Booking.objects.values_list('venue', flat=True).order_by(), key=str)
+        counts = sorted((per_venue.count(venue) for venue in set(per_venue)), reverse=True)
+        self.assertGreater(counts[0], 4 * (300 / 40))
+        # Agregat rating ikut dibangun ulang walaupun bulk_create tidak memicu signal
+        venue = Venue.objects.order_by('-review_count').first()
+        self.assertEqual(venue.review_count, Review.objects.filter(venue=venue).count())
+
+    def test_generate_twice_does_not_collide(self):
+        self.generate()
+        self.generate()
+        self.assertEqual(Venue.objects.count(), 80)
+        self.assertEqual(User.objects.filter(username__startswith='synthetic').count(), 20)
+
+    def test_popularity_weights_are_cumulative(self):
+        self.assertEqual(popularity_weights(3, 1.0), [1.0, 1.5, 1.5 + 1 / 3])
+
+    def test_run_benchmarks_writes_report_and_rolls_back(self):
+        self.generate()
+        bookings = Booking.objects.count()
+        output = os.path.join(tempfile.mkdtemp(), 'hasil.json')
+        self.addCleanup(shutil.rmtree, os.path.dirname(output))
+
+        out = StringIO()
+        call_command('run_benchmarks', requests=4, warmup=1, memory_requests=1, output=output,
+                     stdout=out, stderr=StringIO())
+        with open(output) as f:
+            report = json.load(f)
+
+        self.assertEqual(set(report['endpoints']), set(ENDPOINTS))
+        self.assertEqual(report['dataset']['venues'], 40)
+        for name, result in report['endpoints'].items():
+            self.assertEqual(set(result['status']), {'200'}, name)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+            self.assertGreater(result['peak_memory_kb'], 0)
+        self.assertGreater(report['endpoints']['create_booking_api']['queries_avg'], 0)
+        self.assertEqual(report['endpoints']['show_json']['requests'], 4)
+        self.assertEqual(Booking.objects.count(), bookings)
+        self.assertFalse(User.objects.filter(username__startswith='benchmark-').exists())
+
+        call_command('run_benchmarks', requests=2, warmup=0, memory_requests=1, endpoint=['show_json'],
+                     output=output, compare=output, stdout=out, stderr=StringIO())
+        self.assertIn('p95', out.getvalue())
+
+    def test_run_benchmarks_leaves_shared_cache_alone(self):
+        self.generate()
+        cache.set('benchmark-sentinel', 'tetap')
+        catalog_version = get_version(CATALOG)
+
+        run_benchmarks(endpoints=['create_booking_api', 'search_venues_api'], requests=2, warmup=0,
+                       memory_requests=1, cold=True)
+
+        self.assertEqual(cache.get('benchmark-sentinel'), 'tetap')
+        self.assertEqual(get_version(CATALOG), catalog_version)
+
+    def test_timed_request_runs_on_commit_callbacks(self):
+        ran = []
+
+        def send(ctx):
+            transaction.on_commit(lambda: ran.append('commit'))
+            return HttpResponse('ok')
+
+        with transaction.atomic():
+            timed_request(send, None)
+            self.assertEqual(ran, ['commit'])
+
+
+class RequestMetricsTest(TestCase):
+    """QueryMetricsMiddleware: Server-Timing, persentil per endpoint, dan log request lambat."""
+
+    def setUp(self):
+        metrics.reset()
+        self.addCleanup(metrics.reset)
+        User.objects.create_user(username='admin', password='password123', is_staff=True)
+        Venue.objects.create(name='Gelora', city='Jakarta', country='Indonesia', capacity=1000, price=100)
+        self.url = reverse('venue:search_venues_api')
+
+    def test_server_timing_and_endpoint_metrics(self):
+        response = self.client.get(self.url)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="[1-9]\d* queries", app;dur=[\d.]+$')
+        self.client.get(self.url)
+
+        self.client.login(username='admin', password='password123')
+        data = self.client.get(reverse('main:request_metrics')).json()
+        endpoint = data['endpoints']['GET venue:search_venues_api']
+        self.assertEqual(endpoint['requests'], 2)
+        self.assertGreaterEqual(endpoint['queries_max'], 1)
+        self.assertLessEqual(endpoint['p50_ms'], endpoint['p99_ms'])
+
+    def test_metrics_endpoint_requires_staff(self):
+        self.assertEqual(self.client.get(reverse('main:request_metrics')).status_code, 403)
+
+    @override_settings(REQUEST_METRICS_SLOW_MS=0)
+    def test_slow_request_is_logged(self):
+        with self.assertLogs('lapangin.performance', 'WARNING') as logs:
+            self.client.get(self.url)
+        self.assertIn('venue:search_venues_api', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_can_be_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            QueryMetricsMiddleware(lambda request: HttpResponse())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, p) for p in (50, 95, 99)], [50, 95, 99])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 50), 0)
+
+
+class QueryBudgetTest(TestCase):
+    """query_budget dari lapangin.testing sebagai context manager dan decorator."""
+
+    def test_exceeded_budget_lists_sql(self):
+        with self.assertRaises(AssertionError) as ctx:
+            with query_budget(1, label='dua-query'):
+                list(Venue.objects.all())
+                list(Booking.objects.all())
+        message = str(ctx.exception)
+        self.assertIn('dua-query', message)
+        self.assertIn('2 query, batas 1', message)
+        self.assertIn('"booking_booking"', message)
+
+    @query_budget(1)
+    def test_decorator_within_budget(self):
+        list(Venue.objects.all())
+
+
+class MainApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint export dan metrics tidak boleh bertambah seiring jumlah baris."""
+
+    query_budgets = {
+        # Sesi + user + satu query per EXPORT_CHUNK_SIZE baris
+        'main:export_data': 3,
+        # Sesi + user; angkanya dari memori proses, bukan database
+        'main:request_metrics': 2,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        create_catalog()
+        cls.admin = User.objects.create_user(username='admin', password='password123', is_staff=True)
+
+    def test_export(self):
+        self.client.force_login(self.admin)
+        for dataset in ('venues', 'bookings', 'reviews', 'profiles'):
+            for export_format in ('csv', 'jsonl'):
+                response = self.get_within_budget('main:export_data', args=[dataset], data={'format': export_format})
+                self.assertEqual(response.status_code, 200)
+
+    def test_request_metrics(self):
+        self.client.force_login(self.admin)
+        self.assertTrue(self.get_within_budget('main:request_metrics').json()['success'])
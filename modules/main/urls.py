@@ -8,4 +8,6 @@ app_name = 'main'
 urlpatterns = [
     path('', show_main, name='show_main'),
     path('about', show_about, name='about'),
+    path('export/<str:dataset>/', export_data, name='export_data'),
+    path('metrics/requests/', request_metrics_api, name='request_metrics'),
 ]
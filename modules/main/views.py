@@ -1,4 +1,13 @@
+from datetime import date
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.views.decorators.http import require_GET
+
+from lapangin.middleware import metrics
+from modules.main.export import CONTENT_TYPES, CSV, ExportError, export_rows
+from modules.user.capabilities import is_admin
 
 def show_main(request):
     context = {
@@ -9,4 +18,40 @@ def show_main(request):
 
 def show_about(request):
 
-    return render(request, "about.html");
\ No newline at end of file
+    return render(request, "about.html");
+
+@require_GET
+def request_metrics_api(request):
+    """
+    Persentil durasi, waktu database, dan jumlah query per endpoint dari QueryMetricsMiddleware,
+    khusus admin. Angkanya per proses worker. reset=1 mengosongkan sampel sesudah dibaca.
+    """
+    if not is_admin(request.user):
+        return JsonResponse({'success': False, 'message': 'Anda tidak memiliki akses.'}, status=403)
+    endpoints = metrics.snapshot()
+    if request.GET.get('reset') == '1':
+        metrics.reset()
+    return JsonResponse({'success': True, 'enabled': settings.REQUEST_METRICS_ENABLED, 'endpoints': endpoints})
+
+@require_GET
+def export_data(request, dataset):
+    """
+    Export satu dataset (venues, bookings, reviews, profiles) secara streaming, khusus admin.
+    Query param: format (csv, jsonl, parquet), start dan end (YYYY-MM-DD), thumbnails=0.
+    """
+    if not is_admin(request.user):
+        return JsonResponse({'success': False, 'message': 'Anda tidak memiliki akses.'}, status=403)
+
+    export_format = request.GET.get('format', CSV)
+    try:
+        start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+        end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+        rows = export_rows(
+            dataset, export_format, start=start, end=end, thumbnails=request.GET.get('thumbnails') != '0',
+        )
+    except (ExportError, ValueError) as e:
+        return JsonResponse({'success': False, 'message': str(e)}, status=400)
+
+    response = StreamingHttpResponse(rows, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+    return response
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.review.ratings import rebuild_rating_histograms, rebuild_venue_ratings
+from modules.venue.leaderboard import invalidate_leaderboards
+from modules.venue.response_cache import bump_versions
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang review_count, rating_sum, rating, dan histogram rating setiap venue dari tabel review.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Hanya bandingkan dengan nilai tersimpan tanpa menulis; gagal jika ada yang berbeda.',
+        )
+
+    def handle(self, *args, **options):
+        mismatched = rebuild_venue_ratings(check=options['check'])
+        for venue in mismatched:
+            self.stdout.write(
+                f'{venue.pk}: review_count={venue.review_count} rating_sum={venue.rating_sum} rating={venue.rating}'
+            )
+        histograms = rebuild_rating_histograms(check=options['check'])
+        for histogram in histograms:
+            self.stdout.write(f'{histogram.venue_id}: histogram={histogram.as_dict()}')
+
+        if options['check']:
+            if mismatched or histograms:
+                raise CommandError(
+                    f'{len(mismatched)} venue punya agregat rating dan {len(histograms)} venue punya histogram '
+                    'rating yang tidak sesuai.'
+                )
+            self.stdout.write(self.style.SUCCESS('Semua agregat rating venue sesuai.'))
+        else:
+            if mismatched or histograms:
+                bump_versions()
+            if mismatched:
+                invalidate_leaderboards()
+            self.stdout.write(self.style.SUCCESS(f'{len(mismatched)} venue diperbarui.'))
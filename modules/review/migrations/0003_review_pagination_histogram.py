@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from modules.review.ratings import rebuild_rating_histograms
+
+
+def backfill_histograms(apps, schema_editor):
+    rebuild_rating_histograms(apps.get_model('review', 'RatingHistogram'), apps.get_model('review', 'Review'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('review', '0002_initial'),
+        ('venue', '0010_venue_natural_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingHistogram',
+            fields=[
+                ('venue', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_histogram', serialize=False, to='venue.venue')),
+                ('star_1', models.PositiveIntegerField(default=0)),
+                ('star_2', models.PositiveIntegerField(default=0)),
+                ('star_3', models.PositiveIntegerField(default=0)),
+                ('star_4', models.PositiveIntegerField(default=0)),
+                ('star_5', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['venue', '-created_at', '-id'], name='review_venue_recent_idx'),
+        ),
+        migrations.RunPython(backfill_histograms, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from django.db import models
 from ..venue.models import Venue;
 from django.contrib.auth.models import User
+from .ratings import STAR_FIELDS, STARS, to_rating
 
 class Review(models.Model):
     venue = models.ForeignKey('venue.Venue', on_delete=models.CASCADE, related_name='reviews')
@@ -9,5 +10,37 @@ class Review(models.Model):
     comment = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Venue dan rating saat dimuat; signal memakai selisihnya untuk agregat rating venue
+        rating = instance.__dict__.get('rating')
+        instance._loaded_rating = (instance.__dict__.get('venue_id'), None if rating is None else to_rating(rating))
+        return instance
+
+    def __str__(self):
+        return f"Review for {self.venue.name} by {self.user.username}"
+
+    class Meta:
+        indexes = [
+            # Halaman review per venue: urut terbaru dengan keyset (created_at, id)
+            models.Index(fields=['venue', '-created_at', '-id'], name='review_venue_recent_idx'),
+        ]
+
+
+class RatingHistogram(models.Model):
+    """Jumlah review per bintang setiap venue, dijaga incremental oleh signal review."""
+    venue = models.OneToOneField(
+        'venue.Venue', on_delete=models.CASCADE, primary_key=True, related_name='rating_histogram'
+    )
+    star_1 = models.PositiveIntegerField(default=0)
+    star_2 = models.PositiveIntegerField(default=0)
+    star_3 = models.PositiveIntegerField(default=0)
+    star_4 = models.PositiveIntegerField(default=0)
+    star_5 = models.PositiveIntegerField(default=0)
+
+    def as_dict(self):
+        return {str(star): getattr(self, field) for star, field in zip(STARS, STAR_FIELDS)}
+
     def __str__(self):
-        return f"Review for {self.venue.name} by {self.user.username}"
\ No newline at end of file
+        return f"Rating histogram {self.venue_id}"
\ No newline at end of file
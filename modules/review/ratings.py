@@ -0,0 +1,151 @@
+from collections import Counter
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from modules.venue import leaderboard
+from modules.venue.models import CARD_FIELDS, Venue
+
+ONE_DECIMAL = Decimal('0.1')
+STARS = (1, 2, 3, 4, 5)
+STAR_FIELDS = tuple(f'star_{star}' for star in STARS)
+
+
+def star_for(rating):
+    """Bintang histogram untuk sebuah rating: dibulatkan setengah ke atas (3.5 -> 4), dibatasi 1-5."""
+    star = int(to_rating(rating).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+    return min(max(star, STARS[0]), STARS[-1])
+
+
+def star_deltas(added=(), removed=()):
+    """Selisih histogram {bintang: selisih} dari rating yang ditambah dan dihapus."""
+    deltas = Counter(star_for(rating) for rating in added)
+    deltas.subtract(star_for(rating) for rating in removed)
+    return deltas
+
+
+def star_counts():
+    """Count bersyarat per kolom histogram, dengan batas yang sama seperti star_for."""
+    counts = {}
+    for star, field in zip(STARS, STAR_FIELDS):
+        condition = Q()
+        if star > STARS[0]:
+            condition &= Q(rating__gte=Decimal(star) - Decimal('0.5'))
+        if star < STARS[-1]:
+            condition &= Q(rating__lt=Decimal(star) + Decimal('0.5'))
+        counts[field] = Count('id', filter=condition)
+    return counts
+
+
+def to_rating(value):
+    """Nilai rating seperti yang tersimpan di kolom DecimalField(decimal_places=1)."""
+    return Decimal(str(value)).quantize(ONE_DECIMAL, rounding=ROUND_HALF_UP)
+
+
+def compute_rating(review_count, rating_sum):
+    if not review_count:
+        return Decimal('0.0')
+    return (Decimal(rating_sum) / review_count).quantize(ONE_DECIMAL, rounding=ROUND_HALF_UP)
+
+
+def apply_rating_delta(venue_id, count_delta, sum_delta, star_deltas=None):
+    """
+    Tambahkan selisih ke review_count dan rating_sum lewat F() lalu hitung ulang rating dari keduanya.
+    Tiga query berapapun jumlah review venue; UPDATE pertama mengunci baris venue sampai commit.
+    star_deltas ({bintang: selisih}) ikut diterapkan ke histogram rating di transaksi yang sama.
+    Leaderboard rekomendasi ikut diperbarui dari data kartu yang dibaca di query kedua.
+    """
+    venues = Venue.objects.filter(pk=venue_id)
+    with transaction.atomic():
+        venues.update(review_count=F('review_count') + count_delta, rating_sum=F('rating_sum') + sum_delta)
+        venue = venues.only(*CARD_FIELDS, 'review_count', 'rating_sum').first()
+        if venue is None:
+            # Venue sedang dihapus (cascade ke review)
+            return None
+        venue.rating = compute_rating(venue.review_count, venue.rating_sum)
+        venues.update(rating=venue.rating)
+        apply_histogram_delta(venue_id, star_deltas or {})
+    leaderboard.update_venue_rating(venue)
+    return venue.rating
+
+
+def refresh_venue_rating(venue_id):
+    """Hitung ulang agregat dan histogram satu venue dari review-nya, untuk kasus yang tidak bisa dihitung incremental."""
+    from modules.review.models import RatingHistogram, Review
+
+    totals = Review.objects.filter(venue_id=venue_id).aggregate(count=Count('id'), total=Sum('rating'), **star_counts())
+    count, total = totals.pop('count'), totals.pop('total') or Decimal('0.0')
+    Venue.objects.filter(pk=venue_id).update(
+        review_count=count, rating_sum=total, rating=compute_rating(count, total)
+    )
+    venue = Venue.objects.card().filter(pk=venue_id).first()
+    if venue is not None:
+        RatingHistogram.objects.update_or_create(venue_id=venue_id, defaults=totals)
+        leaderboard.update_venue_rating(venue)
+
+
+def rebuild_venue_ratings(venue_model=Venue, review_model=None, check=False, batch_size=1000):
+    """
+    Hitung ulang review_count, rating_sum, dan rating semua venue dari tabel review.
+    Return daftar venue yang nilainya berbeda; jika check=True tidak ada yang ditulis.
+    """
+    if review_model is None:
+        from modules.review.models import Review as review_model
+
+    totals = review_model.objects.values('venue').annotate(count=Count('id'), total=Sum('rating')).order_by()
+    expected = {row['venue']: (row['count'], row['total']) for row in totals}
+
+    mismatched = []
+    venues = venue_model.objects.only('id', 'review_count', 'rating_sum', 'rating')
+    for venue in venues.iterator(chunk_size=batch_size):
+        count, total = expected.get(venue.pk, (0, Decimal('0.0')))
+        rating = compute_rating(count, total)
+        if (venue.review_count, venue.rating_sum, venue.rating) != (count, total, rating):
+            venue.review_count, venue.rating_sum, venue.rating = count, total, rating
+            mismatched.append(venue)
+
+    if not check:
+        venue_model.objects.bulk_update(mismatched, ['review_count', 'rating_sum', 'rating'], batch_size=batch_size)
+    return mismatched
+
+
+def apply_histogram_delta(venue_id, star_deltas):
+    """Tambahkan selisih per bintang ke histogram venue lewat F(); baris histogram dibuat jika belum ada."""
+    from modules.review.models import RatingHistogram
+
+    changes = {f'star_{star}': F(f'star_{star}') + delta for star, delta in star_deltas.items() if delta}
+    if not changes:
+        return
+    histograms = RatingHistogram.objects.filter(venue_id=venue_id)
+    if not histograms.update(**changes):
+        RatingHistogram.objects.bulk_create([RatingHistogram(venue_id=venue_id)], ignore_conflicts=True)
+        histograms.update(**changes)
+
+
+def rebuild_rating_histograms(histogram_model=None, review_model=None, check=False, batch_size=1000):
+    """
+    Hitung ulang histogram rating semua venue dari tabel review. Return daftar histogram yang berbeda
+    dari yang tersimpan (termasuk yang belum ada); jika check=True tidak ada yang ditulis.
+    """
+    if review_model is None:
+        from modules.review.models import Review as review_model
+    if histogram_model is None:
+        from modules.review.models import RatingHistogram as histogram_model
+
+    expected = {
+        row.pop('venue'): row
+        for row in review_model.objects.values('venue').annotate(**star_counts()).order_by()
+    }
+    mismatched = []
+    for histogram in histogram_model.objects.iterator(chunk_size=batch_size):
+        counts = expected.pop(histogram.venue_id, dict.fromkeys(STAR_FIELDS, 0))
+        if any(getattr(histogram, field) != counts[field] for field in STAR_FIELDS):
+            mismatched.append(histogram_model(venue_id=histogram.venue_id, **counts))
+    mismatched.extend(histogram_model(venue_id=venue_id, **counts) for venue_id, counts in expected.items())
+
+    if not check:
+        histogram_model.objects.bulk_create(
+            mismatched, batch_size=batch_size, update_conflicts=True, unique_fields=['venue'], update_fields=STAR_FIELDS,
+        )
+    return mismatched
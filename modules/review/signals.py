@@ -1,23 +1,52 @@
 from django.db.models.signals import post_save, post_delete
+from django.db.models import QuerySet
 from django.dispatch import receiver
-from django.db.models import Avg
 from .models import Review
+from .ratings import apply_rating_delta, refresh_venue_rating, star_deltas, to_rating
 from modules.venue.models import Venue
-from decimal import Decimal, ROUND_HALF_UP
+from modules.venue.response_cache import bump_versions
 
-@receiver([post_save, post_delete], sender=Review)
-def update_venue_rating(sender, instance, **kwargs):
-    venue = instance.venue
 
-    new_rating = Review.objects.filter(venue=venue).aggregate(
-        avg_rating=Avg('rating')
-    )['avg_rating']
+@receiver(post_save, sender=Review)
+def update_venue_rating(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    rating = to_rating(instance.rating)
+    old_venue_id, old_rating = getattr(instance, '_loaded_rating', (None, None))
+    if created:
+        apply_rating_delta(instance.venue_id, 1, rating, star_deltas(added=[rating]))
+    elif old_rating is None:
+        # Nilai lama tidak diketahui (instance tidak dimuat dari database), hitung ulang venue ini saja
+        refresh_venue_rating(instance.venue_id)
+        if old_venue_id not in (None, instance.venue_id):
+            refresh_venue_rating(old_venue_id)
+    elif old_venue_id != instance.venue_id:
+        apply_rating_delta(old_venue_id, -1, -old_rating, star_deltas(removed=[old_rating]))
+        apply_rating_delta(instance.venue_id, 1, rating, star_deltas(added=[rating]))
+    elif old_rating != rating:
+        apply_rating_delta(instance.venue_id, 0, rating - old_rating, star_deltas(added=[rating], removed=[old_rating]))
+    instance._loaded_rating = (instance.venue_id, rating)
+    # Rating (dan daftar review) venue berubah, response katalog yang di-cache ikut kedaluwarsa
+    bump_versions(instance.venue_id)
+    if old_venue_id not in (None, instance.venue_id):
+        bump_versions(old_venue_id)
 
-    if new_rating is not None:
-        venue.rating = Decimal(new_rating).quantize(
-            Decimal('0.1'),
-            rounding=ROUND_HALF_UP
-        )
+
+def deleted_with_venue(instance, origin):
+    """True jika review ikut terhapus karena venue-nya dihapus (cascade)."""
+    if isinstance(origin, Venue):
+        return origin.pk == instance.venue_id
+    return isinstance(origin, QuerySet) and origin.model is Venue
+
+
+@receiver(post_delete, sender=Review)
+def remove_venue_rating(sender, instance, origin=None, **kwargs):
+    if deleted_with_venue(instance, origin):
+        # Agregat venue yang sedang dihapus tidak perlu diperbarui, cukup sekali bump dari signal venue
+        return
+    venue_id, rating = getattr(instance, '_loaded_rating', (None, None))
+    if venue_id is None or rating is None:
+        refresh_venue_rating(instance.venue_id)
     else:
-        venue.rating = Decimal('0.0')
-    venue.save(update_fields=['rating'])
\ No newline at end of file
+        apply_rating_delta(venue_id, -1, -rating, star_deltas(removed=[rating]))
+    bump_versions(instance.venue_id)
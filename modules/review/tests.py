@@ -1,12 +1,18 @@
 from decimal import Decimal
 import json
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
-from .models import Review
+from .models import RatingHistogram, Review
 from .forms import ReviewForm
 import uuid
+from lapangin.testing import QueryBudgetMixin, create_catalog
 from modules.venue.models import Venue
+from modules.venue.pagination import encode_cursor
 
 class ReviewModuleTestCase(TestCase):
     
@@ -312,4 +318,164 @@ class ReviewModuleTestCase(TestCase):
     def test_get_venue_reviews_not_found(self):
         url = reverse('review:get_venue_reviews', kwargs={'venue_id': self.NON_EXISTENT_UUID})
         with self.assertRaises(Venue.DoesNotExist):
-            self.client.get(url)
\ No newline at end of file
+            self.client.get(url)
+
+class VenueRatingCounterTest(TestCase):
+    """review_count dan rating_sum di Venue dijaga incremental, rating diturunkan dari keduanya."""
+
+    def setUp(self):
+        self.venue = Venue.objects.create(name='Counter Venue', capacity=100, price=100)
+        self.users = [User.objects.create_user(username=f'reviewer{i}', password='password123') for i in range(5)]
+        for user, rating in zip(self.users, (5.0, 4.0, 3.5, 2.0)):
+            Review.objects.create(venue=self.venue, user=user, rating=rating)
+
+    def counters(self):
+        self.venue.refresh_from_db()
+        return self.venue.review_count, self.venue.rating_sum, self.venue.rating
+
+    def test_counters_follow_create_update_delete(self):
+        self.assertEqual(self.counters(), (4, Decimal('14.5'), Decimal('3.6')))
+
+        review = Review.objects.get(venue=self.venue, user=self.users[3])
+        review.rating = 4.5
+        review.save()
+        self.assertEqual(self.counters(), (4, Decimal('17.0'), Decimal('4.3')))
+
+        review.delete()
+        self.assertEqual(self.counters(), (3, Decimal('12.5'), Decimal('4.2')))
+
+    def test_write_does_not_scan_reviews(self):
+        with CaptureQueriesContext(connection) as ctx:
+            Review.objects.create(venue=self.venue, user=self.users[4], rating=1.0)
+        sql = ' '.join(query['sql'].upper() for query in ctx.captured_queries)
+        self.assertNotIn('AVG(', sql)
+        self.assertNotIn('SUM(', sql)
+
+    def test_rebuild_command(self):
+        Venue.objects.filter(pk=self.venue.pk).update(review_count=0, rating_sum=0, rating=0)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_venue_ratings', check=True, stdout=StringIO())
+
+        call_command('rebuild_venue_ratings', stdout=StringIO())
+        self.assertEqual(self.counters(), (4, Decimal('14.5'), Decimal('3.6')))
+
+        out = StringIO()
+        call_command('rebuild_venue_ratings', check=True, stdout=out)
+        self.assertIn('sesuai', out.getvalue())
+
+
+class ReviewPageHistogramTest(TestCase):
+    """get_venue_reviews dipaginasi dengan cursor, halaman pertama membawa histogram rating yang dijaga signal."""
+
+    def setUp(self):
+        self.venue = Venue.objects.create(name='Paged Venue', capacity=100, price=100)
+        self.users = [User.objects.create_user(username=f'pager{i}', password='password123') for i in range(25)]
+        ratings = [5.0] * 10 + [4.5] * 5 + [3.0] * 6 + [1.0] * 4
+        self.reviews = [
+            Review.objects.create(venue=self.venue, user=user, rating=rating)
+            for user, rating in zip(self.users, ratings)
+        ]
+        self.url = reverse('review:get_venue_reviews', kwargs={'venue_id': self.venue.id})
+
+    def histogram(self):
+        return RatingHistogram.objects.get(venue=self.venue).as_dict()
+
+    def test_pages_follow_cursor_newest_first(self):
+        first = self.client.get(self.url).json()
+        self.assertEqual(len(first['reviews']), 20)
+        self.assertTrue(first['has_next_page'])
+        self.assertEqual(first['histogram'], {'1': 4, '2': 0, '3': 6, '4': 0, '5': 15})
+        self.assertEqual(first['review_count'], 25)
+
+        second = self.client.get(self.url, {'cursor': first['next_cursor']}).json()
+        self.assertNotIn('histogram', second)
+        self.assertIsNone(second['next_cursor'])
+        ids = [review['id'] for review in first['reviews'] + second['reviews']]
+        self.assertEqual(ids, sorted((review.id for review in self.reviews), reverse=True))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'rusak'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_invalid_values(self):
+        """Cursor dengan created_at atau id yang tidak bisa di-parse ditolak 400, bukan error database."""
+        for values in (['bukan-tanggal', '1'], ['2024-01-01 10:00:00+00:00', 'zzz']):
+            with self.subTest(values=values):
+                response = self.client.get(self.url, {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_histogram_follows_create_update_delete(self):
+        self.assertEqual(self.histogram(), {'1': 4, '2': 0, '3': 6, '4': 0, '5': 15})
+        review = self.reviews[0]
+        review.rating = 2.0
+        review.save()
+        self.reviews[-1].delete()
+        self.assertEqual(self.histogram(), {'1': 3, '2': 1, '3': 6, '4': 0, '5': 14})
+
+        Review.objects.filter(pk=review.pk).update(rating=5.0)
+        call_command('rebuild_venue_ratings', stdout=StringIO())
+        self.assertEqual(self.histogram(), {'1': 3, '2': 0, '3': 6, '4': 0, '5': 15})
+
+    def test_first_page_is_cached_until_review_changes(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        Review.objects.create(venue=self.venue, user=User.objects.create_user(username='baru'), rating=2.0)
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['review_count'], 26)
+        self.assertEqual(data['histogram']['2'], 1)
+
+
+class ReviewApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint JSON review tidak boleh bertambah seiring jumlah review venue."""
+
+    query_budgets = {
+        'review:get_venue_reviews': 4,
+        'review:add_review': 15,
+        'review:api_add_review': 15,
+        'review:api_edit_review': 10,
+        'review:api_delete_review': 10,
+        'review:edit_review': 4,
+        'review:delete_review': 10,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = create_catalog()
+        cls.venue = cls.catalog['venues'][0]
+        cls.user = cls.catalog['users'][0]
+        cls.review = next(review for review in cls.catalog['reviews'] if review.user_id == cls.user.id and review.venue_id != cls.venue.id)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_venue_reviews(self):
+        data = self.get_within_budget('review:get_venue_reviews', args=[self.venue.id]).json()
+        self.assertEqual(len(data['reviews']), 20)
+        self.assertEqual(sum(data['histogram'].values()), 30)
+
+        data = self.get_within_budget(
+            'review:get_venue_reviews', args=[self.venue.id], data={'cursor': data['next_cursor']},
+        ).json()
+        self.assertEqual(len(data['reviews']), 10)
+        self.assertFalse(data['has_next_page'])
+
+    def test_add_edit_delete(self):
+        venue_id = str(self.catalog['venues'][-1].id)
+        response = self.post_within_budget('review:add_review', data={'venue_id': venue_id, 'rating': 4, 'comment': 'Oke'})
+        self.assertEqual(response.json()['status'], 'success')
+        response = self.post_within_budget('review:api_add_review', data={'venue_id': venue_id, 'rating': 5})
+        self.assertTrue(response.json()['success'])
+        response = self.post_within_budget('review:api_edit_review', data={'venue_id': venue_id, 'rating': 3})
+        self.assertTrue(response.json()['success'])
+        response = self.post_within_budget('review:api_delete_review', data={'venue_id': venue_id})
+        self.assertTrue(response.json()['success'])
+
+        self.get_within_budget('review:edit_review', args=[self.review.id], budget=3)
+        response = self.post_within_budget('review:edit_review', args=[self.review.id], data={'rating': 2, 'comment': 'Biasa'})
+        self.assertTrue(response.json()['success'])
+        response = self.post_within_budget('review:delete_review', args=[self.review.id])
+        self.assertEqual(response.json()['status'], 'success')
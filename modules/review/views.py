@@ -1,6 +1,12 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
-from .models import Review
+from .models import RatingHistogram, Review
+from .ratings import STAR_FIELDS
+from ..user.capabilities import is_admin
 from ..venue.models import Venue
+from ..venue.pagination import InvalidCursor, keyset_page
+from ..venue.response_cache import get_version, venue_scope
 from django.views.decorators.http import require_POST, require_http_methods
 from django.contrib.auth.decorators import login_required, user_passes_test
 from .forms import ReviewForm
@@ -8,8 +14,12 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 
-def is_admin(user):
-    return user.is_staff or user.is_superuser
+REVIEW_PAGE_SIZE = 20
+REVIEW_ORDERING = ('-created_at', '-id')
+REVIEW_FIELDS = (
+    'id', 'rating', 'comment', 'created_at', 'user__id', 'user__username', 'user__first_name', 'user__last_name',
+)
+FIRST_PAGE_KEY_PREFIX = 'review:first_page'
 
 @csrf_exempt
 @login_required
@@ -68,9 +78,9 @@ def add_review(request):
 @require_http_methods(["GET", "POST"])
 def edit_review(request, review_id):
     try:
-        review = Review.objects.get(pk=review_id)
+        review = Review.objects.select_related('user').get(pk=review_id)
 
-        if not (review.user == request.user or request.user.is_superuser or request.user.is_staff):
+        if not (review.user_id == request.user.id or is_admin(request.user)):
             return JsonResponse({'success': False, 'message': 'Anda tidak punya izin untuk mengedit review ini.'}, status=403)
 
         if request.method == 'POST':
@@ -110,7 +120,7 @@ def edit_review(request, review_id):
 def delete_review(request, review_id):
     review = get_object_or_404(Review, pk=review_id)
 
-    if not (review.user == request.user or request.user.is_superuser or request.user.is_staff):
+    if not (review.user_id == request.user.id or is_admin(request.user)):
         return JsonResponse({'status': 'error', 'message': 'Anda tidak punya izin untuk menghapus review ini.'}, status=403)
 
     try:
@@ -120,28 +130,66 @@ def delete_review(request, review_id):
     except Exception as e:
         return JsonResponse({'status': 'error', 'message': f'Terjadi kesalahan saat menghapus: {str(e)}'}, status=500)
 
+def review_page(venue_id, cursor=None):
+    """Satu halaman review venue dengan keyset (created_at, id) menurun. Raise InvalidCursor jika cursor rusak."""
+    reviews_qs = Review.objects.filter(venue_id=venue_id).select_related('user').only(*REVIEW_FIELDS)
+    reviews, next_cursor = keyset_page(reviews_qs, REVIEW_ORDERING, cursor, REVIEW_PAGE_SIZE)
+    return {
+        'reviews': [
+            {
+                'id': review.id,
+                'user_name': review.user.get_full_name() or review.user.username,
+                'user_id': review.user_id,
+                'rating': review.rating,
+                'comment': review.comment,
+                'created_at': review.created_at.isoformat()
+            }
+            for review in reviews
+        ],
+        'next_cursor': next_cursor,
+        'has_next_page': next_cursor is not None,
+    }
+
+
+def first_review_page(venue_id):
+    """
+    Halaman pertama beserta histogram rating, di-cache per version venue. Version dinaikkan signal
+    review, jadi entry lama tidak terbaca lagi begitu ada review yang berubah. Raise Venue.DoesNotExist.
+    """
+    key = f'{FIRST_PAGE_KEY_PREFIX}:{venue_scope(venue_id)}:{get_version(venue_scope(venue_id))}'
+    page = cache.get(key)
+    if page is None:
+        venue = Venue.objects.select_related('rating_histogram').only(
+            'id', 'rating', 'review_count', *(f'rating_histogram__{field}' for field in STAR_FIELDS),
+        ).get(pk=venue_id)
+        histogram = getattr(venue, 'rating_histogram', None) or RatingHistogram(venue_id=venue.id)
+        page = {
+            **review_page(venue.id),
+            'histogram': histogram.as_dict(),
+            'review_count': venue.review_count,
+            'rating': venue.rating,
+        }
+        cache.set(key, page, settings.VENUE_RESPONSE_CACHE_TIMEOUT)
+    return page
+
+
 def get_venue_reviews(request, venue_id):
-    venue = Venue.objects.get(pk=venue_id)
-    reviews_qs = venue.reviews.select_related('user').all().order_by('-created_at')
+    """
+    Review venue terbaru per REVIEW_PAGE_SIZE. Halaman pertama menyertakan histogram rating;
+    halaman berikutnya diminta dengan ?cursor=<next_cursor>.
+    """
+    cursor = request.GET.get('cursor')
+    if cursor:
+        try:
+            page = review_page(venue_id, cursor)
+        except InvalidCursor:
+            return JsonResponse({'status': 'error', 'message': 'Cursor tidak valid.'}, status=400)
+    else:
+        page = first_review_page(venue_id)
 
     current_user_id = request.user.id if request.user.is_authenticated else None
+    return JsonResponse({**page, 'current_user_id': current_user_id})
 
-    reviews_data = []
-    for review in reviews_qs:
-        reviews_data.append({
-            'id': review.id,
-            'user_name': review.user.get_full_name() or review.user.username,
-            'user_id': review.user.id,
-            'rating': review.rating,
-            'comment': review.comment,
-            'created_at': review.created_at.isoformat()
-        })
-
-    return JsonResponse({
-        'reviews': reviews_data,
-        'current_user_id': current_user_id
-    })
-    
 @csrf_exempt
 @require_POST
 def api_add_review(request):
@@ -0,0 +1,84 @@
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from modules.venue.response_cache import bump_scopes, get_version
+
+SESSION_KEY = 'capabilities'
+
+
+def is_admin(user):
+    return user.is_authenticated and (user.is_superuser or user.is_staff)
+
+
+def user_info(user):
+    """Identitas dan peran user untuk payload Flutter, langsung dari request.user tanpa query."""
+    if not user.is_authenticated:
+        return None
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'is_authenticated': True,
+        'is_superuser': user.is_superuser,
+        'is_staff': user.is_staff,
+        'is_admin': is_admin(user),
+    }
+
+
+def capability_scope(user_id):
+    return f'capabilities:{user_id}'
+
+
+def compute_capabilities(user):
+    """Snapshot lengkap hak akses user: peran, venue yang dimiliki, dan izin yang diturunkan darinya."""
+    from modules.venue.ownership import owned_venue_ids
+
+    if not user.is_authenticated:
+        return {
+            'is_authenticated': False, 'is_admin': False, 'is_venue_provider': False, 'owned_venue_ids': [],
+            'can_create_venue': False, 'can_manage_users': False, 'can_manage_faq': False,
+        }
+    owned = sorted(str(pk) for pk in owned_venue_ids(user.id))
+    admin = is_admin(user)
+    return {
+        **user_info(user),
+        'is_venue_provider': admin or bool(owned),
+        'owned_venue_ids': owned,
+        'can_create_venue': admin,
+        'can_manage_users': admin,
+        'can_manage_faq': user.is_staff,
+    }
+
+
+def get_capabilities(request):
+    """
+    Snapshot hak akses request.user dari sesi. Snapshot dihitung ulang jika versi user di cache sudah
+    dinaikkan (peran berubah, venue miliknya dibuat atau dihapus) atau umurnya melewati
+    USER_CAPABILITIES_TIMEOUT; selain itu biayanya satu cache get tanpa query database.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return compute_capabilities(user)
+
+    version = get_version(capability_scope(user.id))
+    stored = request.session.get(SESSION_KEY)
+    if (
+        stored and stored['user_id'] == user.id and stored['version'] == version
+        and stored['expires_at'] > time.time()
+    ):
+        return stored['data']
+
+    data = compute_capabilities(user)
+    request.session[SESSION_KEY] = {
+        'user_id': user.id, 'version': version, 'expires_at': time.time() + settings.USER_CAPABILITIES_TIMEOUT,
+        'data': data,
+    }
+    return data
+
+
+def invalidate_capabilities(*user_ids):
+    """Naikkan versi snapshot user sekarang dan sekali lagi sesudah commit; sesi lain ikut menghitung ulang."""
+    scopes = [capability_scope(user_id) for user_id in user_ids if user_id is not None]
+    bump_scopes(scopes)
+    transaction.on_commit(lambda: bump_scopes(scopes))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from modules.user.profiles import create_missing_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        'Buat UserProfile untuk user yang belum punya (user lama, atau user yang dibuat lewat bulk_create '
+        'sehingga signal post_save tidak berjalan).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        created = create_missing_profiles(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{created} profil user dibuat.'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from modules.user.search import rebuild_search_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        'Bangun ulang token pencarian user. Jalankan setelah impor massal user (bulk_create '
+        'tidak memicu signal yang biasanya memperbarui token).'
+    )
+
+    def handle(self, *args, **options):
+        written = rebuild_search_tokens()
+        self.stdout.write(self.style.SUCCESS(f'{written} token pencarian user ditulis.'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from modules.user.stats import METRICS, get_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Hitung ulang statistik user untuk dashboard admin dan simpan ke cache. Jadwalkan (mis. cron) '
+        'lebih sering dari USER_STATS_TIMEOUT supaya dashboard tidak pernah menghitung sendiri.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--metric', action='append', choices=sorted(METRICS), dest='metrics',
+                            help='Metric yang dihitung ulang; boleh diulang (default semua).')
+
+    def handle(self, *args, **options):
+        stats = get_stats(options['metrics'], refresh=True)
+        for name, value in stats.items():
+            self.stdout.write(f'{name}: dihitung {value["computed_at"]}')
+        self.stdout.write(self.style.SUCCESS(f'{len(stats)} metric statistik user diperbarui.'))
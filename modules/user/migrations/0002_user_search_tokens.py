@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from modules.user.search import rebuild_search_tokens
+
+# Index keyset direktori user (urut terbaru bergabung); auth_user milik Django, jadi lewat RunSQL
+JOINED_INDEX = 'auth_user_date_joined_id_idx'
+
+
+def backfill_search_tokens(apps, schema_editor):
+    rebuild_search_tokens(apps.get_model('auth', 'User'), apps.get_model('user', 'UserSearchToken'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=150)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'user_search_token',
+                'indexes': [models.Index(fields=['token', 'user'], name='user_search_token_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'token'), name='user_search_token_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+        migrations.RunSQL(
+            f'CREATE INDEX IF NOT EXISTS {JOINED_INDEX} ON auth_user (date_joined DESC, id DESC)',
+            f'DROP INDEX IF EXISTS {JOINED_INDEX}',
+        ),
+    ]
@@ -14,4 +14,24 @@ class UserProfile(models.Model):
         return f"{self.user.username}'s Profile"
 
     class Meta:
-        db_table = 'user_profile'
\ No newline at end of file
+        db_table = 'user_profile'
+
+class UserSearchToken(models.Model):
+    """
+    Token pencarian user yang sudah dinormalisasi (huruf kecil, per kata) dari username, email, dan
+    nama. Dicari dengan prefix lewat index (token, user), dijaga signal post_save User.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=150)
+
+    def __str__(self):
+        return f"{self.token} -> {self.user_id}"
+
+    class Meta:
+        db_table = 'user_search_token'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'token'], name='user_search_token_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['token', 'user'], name='user_search_token_idx'),
+        ]
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+
+from .models import UserProfile
+
+
+def get_user_profile(user):
+    """
+    Profil user tanpa get_or_create per request. Profil dibuat signal post_save saat user dibuat dan
+    ikut dimuat select_related oleh ProfileModelBackend, jadi biasanya tidak ada query tambahan.
+    User lama yang belum di-backfill dibuatkan profil di sini sekali saja.
+    """
+    try:
+        return user.profile
+    except UserProfile.DoesNotExist:
+        profile, _ = UserProfile.objects.get_or_create(user=user, defaults={'full_name': user.get_full_name()})
+        return profile
+
+
+def create_missing_profiles(batch_size=1000):
+    """Buat profil untuk user yang belum punya, per batch. Return jumlah profil yang dibuat."""
+    created = 0
+    batch = []
+    users = User.objects.filter(profile__isnull=True).only('id', 'first_name', 'last_name')
+    for user in users.iterator(chunk_size=batch_size):
+        batch.append(UserProfile(user=user, full_name=user.get_full_name()))
+        if len(batch) >= batch_size:
+            created += len(UserProfile.objects.bulk_create(batch, ignore_conflicts=True))
+            batch = []
+    if batch:
+        created += len(UserProfile.objects.bulk_create(batch, ignore_conflicts=True))
+    return created
@@ -0,0 +1,73 @@
+from django.contrib.auth.models import User
+
+from modules.venue.search import tokenize
+
+# Kolom User yang dipecah menjadi token pencarian
+SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+TOKEN_MAX_LENGTH = 150
+# Batas atas rentang prefix: token diawali p berada di [p, p + PREFIX_END)
+PREFIX_END = '\uffff'
+
+
+def user_tokens(user):
+    """Token unik dari kolom pencarian user: 'budi.s@mail.com' menjadi budi, s, mail, com."""
+    return {
+        token[:TOKEN_MAX_LENGTH]
+        for field in SEARCH_FIELDS
+        for token in tokenize(getattr(user, field, ''))
+    }
+
+
+def index_users(users):
+    """Tulis token pencarian untuk user yang belum punya token, mis. sesudah bulk_create."""
+    from modules.user.models import UserSearchToken
+
+    UserSearchToken.objects.bulk_create(
+        [UserSearchToken(user_id=user.pk, token=token) for user in users for token in user_tokens(user)],
+        ignore_conflicts=True,
+    )
+
+
+def index_user(user):
+    """Ganti token pencarian satu user (dua query)."""
+    from modules.user.models import UserSearchToken
+
+    UserSearchToken.objects.filter(user_id=user.pk).delete()
+    index_users([user])
+
+
+def rebuild_search_tokens(user_model=None, token_model=None, batch_size=2000):
+    """Bangun ulang seluruh tabel token dari tabel user, per batch. Return jumlah token yang ditulis."""
+    if user_model is None:
+        user_model = User
+    if token_model is None:
+        from modules.user.models import UserSearchToken as token_model
+
+    token_model.objects.all().delete()
+    written = 0
+    batch = []
+    for user in user_model.objects.only('pk', *SEARCH_FIELDS).iterator(chunk_size=batch_size):
+        batch.extend(token_model(user_id=user.pk, token=token) for token in user_tokens(user))
+        if len(batch) >= batch_size:
+            token_model.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        token_model.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    return written
+
+
+def search_users(queryset, query):
+    """
+    Filter user yang setiap kata di query menjadi awalan salah satu token-nya. Dicari sebagai
+    rentang token >= kata AND token < kata + PREFIX_END supaya memakai index B-tree di semua database.
+    """
+    from modules.user.models import UserSearchToken
+
+    for word in tokenize(query):
+        word = word[:TOKEN_MAX_LENGTH]
+        matches = UserSearchToken.objects.filter(token__gte=word, token__lt=word + PREFIX_END)
+        queryset = queryset.filter(pk__in=matches.values('user_id'))
+    return queryset
+
@@ -0,0 +1,69 @@
+from django.contrib.auth.models import User
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from modules.venue.ownership import venue_owners
+
+from .capabilities import invalidate_capabilities
+from .models import UserProfile
+from .search import SEARCH_FIELDS, index_user
+from .stats import BOOKINGS_PER_USER, INVALIDATED_BY, TOP_REVIEWERS, invalidate_stats
+
+
+def only_last_login(update_fields):
+    return update_fields is not None and set(update_fields) <= {'last_login'}
+
+
+@receiver(post_save, sender=User)
+def create_profile(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    # Profil dibuat sekali di sini, bukan get_or_create di setiap request yang membutuhkannya
+    UserProfile.objects.create(user=instance, full_name=instance.get_full_name())
+
+
+@receiver(post_save, sender=User)
+def update_search_tokens(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    # Login hanya menyimpan last_login; token cukup diperbarui jika kolom pencarian ikut disimpan
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    index_user(instance)
+
+
+def deleted_by_cascade(origin):
+    """True jika baris ikut terhapus karena venue atau user-nya dihapus; receiver induknya yang membuang cache."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is User or model._meta.label == 'venue.Venue'
+
+
+@receiver([post_save, post_delete], sender=User)
+@receiver([post_save, post_delete], sender='booking.Booking')
+@receiver([post_save, post_delete], sender='review.Review')
+def expire_user_stats(sender, update_fields=None, origin=None, **kwargs):
+    if only_last_login(update_fields):
+        return
+    if origin is not None and not isinstance(origin, sender) and deleted_by_cascade(origin):
+        return
+    invalidate_stats(*INVALIDATED_BY[sender._meta.label])
+
+
+@receiver(post_delete, sender='venue.Venue')
+def expire_user_stats_on_venue_delete(sender, **kwargs):
+    invalidate_stats(BOOKINGS_PER_USER, TOP_REVIEWERS)
+
+
+@receiver(post_save, sender=User)
+def expire_capabilities(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or only_last_login(update_fields):
+        return
+    invalidate_capabilities(instance.pk)
+
+
+@receiver([post_save, post_delete], sender='venue.Venue')
+def expire_owner_capabilities(sender, instance, raw=False, **kwargs):
+    # Daftar venue milik owner ada di snapshot, termasuk owner lama jika owner venue diganti
+    if not raw:
+        invalidate_capabilities(*venue_owners(instance))
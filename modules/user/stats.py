@@ -0,0 +1,139 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+KEY_PREFIX = 'user:stats'
+
+USER_COUNTS = 'users'
+SIGNUPS = 'signups'
+BOOKINGS_PER_USER = 'bookings_per_user'
+TOP_REVIEWERS = 'top_reviewers'
+
+# Metric yang kedaluwarsa saat baris model tersebut disimpan atau dihapus
+INVALIDATED_BY = {
+    'auth.User': (USER_COUNTS, SIGNUPS, BOOKINGS_PER_USER, TOP_REVIEWERS),
+    'booking.Booking': (BOOKINGS_PER_USER,),
+    'review.Review': (TOP_REVIEWERS,),
+}
+
+
+def user_counts():
+    """Jumlah total, aktif, nonaktif, dan staff dalam satu query agregat bersyarat."""
+    counts = User.objects.aggregate(
+        total=Count('id'), active=Count('id', filter=Q(is_active=True)), staff=Count('id', filter=Q(is_staff=True)),
+    )
+    counts['inactive'] = counts['total'] - counts['active']
+    return counts
+
+
+def signups_per_day():
+    """Jumlah user baru per hari selama USER_STATS_SIGNUP_DAYS terakhir, satu GROUP BY tanggal."""
+    today = timezone.localdate()
+    start = today - timedelta(days=settings.USER_STATS_SIGNUP_DAYS - 1)
+    rows = (
+        User.objects.filter(date_joined__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        .annotate(day=TruncDate('date_joined'))
+        .values('day')
+        .annotate(count=Count('id'))
+        .order_by('day')
+    )
+    counts = {row['day']: row['count'] for row in rows}
+    return [
+        {'date': day.isoformat(), 'count': counts.get(day, 0)}
+        for day in (start + timedelta(days=offset) for offset in range(settings.USER_STATS_SIGNUP_DAYS))
+    ]
+
+
+def bookings_per_user():
+    """
+    Sebaran jumlah booking per user: berapa user yang punya n booking. Dihitung dalam satu query
+    GROUP BY di atas GROUP BY per user, jadi yang dikirim database hanya satu baris per nilai n.
+    """
+    from modules.booking.models import Booking
+
+    qn = connection.ops.quote_name
+    table = qn(Booking._meta.db_table)
+    column = qn(Booking._meta.get_field('user').column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT per_user.bookings, COUNT(*) FROM '
+            f'(SELECT COUNT(*) AS bookings FROM {table} GROUP BY {column}) per_user '
+            f'GROUP BY per_user.bookings ORDER BY per_user.bookings'
+        )
+        distribution = [{'bookings': bookings, 'users': users} for bookings, users in cursor.fetchall()]
+
+    with_bookings = sum(row['users'] for row in distribution)
+    total_bookings = sum(row['bookings'] * row['users'] for row in distribution)
+    total_users = get_stats([USER_COUNTS])[USER_COUNTS]['data']['total']
+    return {
+        'distribution': distribution,
+        'users_with_bookings': with_bookings,
+        'users_without_bookings': max(total_users - with_bookings, 0),
+        'max': distribution[-1]['bookings'] if distribution else 0,
+        'mean': round(total_bookings / total_users, 2) if total_users else 0,
+    }
+
+
+def top_reviewers():
+    """USER_STATS_TOP_REVIEWERS user dengan review terbanyak beserta rata-rata rating yang diberikan."""
+    from modules.review.models import Review
+
+    rows = (
+        Review.objects.values('user_id', 'user__username')
+        .annotate(reviews=Count('id'), average_rating=Avg('rating'))
+        .order_by('-reviews', 'user_id')[:settings.USER_STATS_TOP_REVIEWERS]
+    )
+    return [
+        {
+            'user_id': row['user_id'],
+            'username': row['user__username'],
+            'reviews': row['reviews'],
+            'average_rating': round(float(row['average_rating']), 2),
+        }
+        for row in rows
+    ]
+
+
+METRICS = {
+    USER_COUNTS: user_counts,
+    SIGNUPS: signups_per_day,
+    BOOKINGS_PER_USER: bookings_per_user,
+    TOP_REVIEWERS: top_reviewers,
+}
+
+
+def _key(name):
+    return f'{KEY_PREFIX}:{name}'
+
+
+def compute_metric(name):
+    value = {'data': METRICS[name](), 'computed_at': timezone.now().isoformat()}
+    cache.set(_key(name), value, settings.USER_STATS_TIMEOUT)
+    return value
+
+
+def get_stats(names=None, refresh=False):
+    """
+    Metric statistik user dari cache ({nama: {'data', 'computed_at'}}); yang belum ada atau diminta
+    refresh dihitung ulang dan disimpan selama USER_STATS_TIMEOUT. Saat semua ada di cache biayanya
+    satu get_many, berapapun jumlah user.
+    """
+    names = list(names or METRICS)
+    cached = {} if refresh else cache.get_many([_key(name) for name in names])
+    return {name: cached.get(_key(name)) or compute_metric(name) for name in names}
+
+
+def invalidate_stats(*names):
+    """
+    Buang metric dari cache (semua jika tanpa argumen). Dibuang sekarang dan sekali lagi sesudah
+    commit, karena request yang membaca data sebelum commit bisa saja sudah mengisi ulang cache.
+    """
+    keys = [_key(name) for name in (names or METRICS)]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -4,6 +4,19 @@ from django.contrib.auth.models import User
 from modules.user.models import UserProfile
 from modules.user.forms import UserForm, UserProfileForm
 import json
+from datetime import date, timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models import Count
+from lapangin.testing import QueryBudgetMixin, create_catalog
+from modules.booking.models import Booking
+from modules.review.models import Review
+from modules.user.models import UserSearchToken
+from modules.user.profiles import get_user_profile
+from modules.user.stats import BOOKINGS_PER_USER, METRICS, TOP_REVIEWERS, USER_COUNTS, get_stats
+from modules.venue.models import Venue
+from modules.venue.pagination import encode_cursor
 
 
 class UserProfileModelTest(TestCase):
@@ -17,12 +30,12 @@ class UserProfileModelTest(TestCase):
     
     def test_user_profile_creation(self):
         """Test creating a user profile"""
-        profile = UserProfile.objects.create(
-            user=self.user,
-            full_name='Test User',
-            phone='081234567890',
-            address='Test Address'
-        )
+        profile = self.user.profile
+        profile.full_name = 'Test User'
+        profile.phone = '081234567890'
+        profile.address = 'Test Address'
+        profile.save()
+        profile.refresh_from_db()
         self.assertEqual(profile.user, self.user)
         self.assertEqual(profile.full_name, 'Test User')
         self.assertEqual(profile.phone, '081234567890')
@@ -30,12 +43,12 @@ class UserProfileModelTest(TestCase):
     
     def test_user_profile_str(self):
         """Test string representation of profile"""
-        profile = UserProfile.objects.create(user=self.user)
+        profile = self.user.profile
         self.assertEqual(str(profile), "testuser's Profile")
     
     def test_user_profile_defaults(self):
         """Test default values"""
-        profile = UserProfile.objects.create(user=self.user)
+        profile = UserProfile.objects.get(user=self.user)
         self.assertTrue(profile.is_active)
         self.assertEqual(profile.full_name, '')
         self.assertEqual(profile.phone, '')
@@ -148,7 +161,7 @@ class UserListViewTest(TestCase):
             username='user1',
             password='userpass'
         )
-        UserProfile.objects.create(user=self.regular_user, full_name='User One')
+        UserProfile.objects.filter(user=self.regular_user).update(full_name='User One')
     
     def test_user_list_requires_login(self):
         """Test that user list requires authentication"""
@@ -206,8 +219,7 @@ class UserDetailViewTest(TestCase):
             username='testuser',
             password='testpass'
         )
-        UserProfile.objects.create(
-            user=self.test_user,
+        UserProfile.objects.filter(user=self.test_user).update(
             full_name='Test User',
             phone='081234567890'
         )
@@ -326,7 +338,7 @@ class UserEditViewTest(TestCase):
             username='testuser',
             password='testpass'
         )
-        UserProfile.objects.create(user=self.test_user, full_name='Test User')
+        UserProfile.objects.filter(user=self.test_user).update(full_name='Test User')
     
     def test_user_edit_get(self):
         """Test GET request to edit user"""
@@ -565,4 +577,288 @@ class IntegrationTest(TestCase):
             reverse('user:user_delete', args=[user.id])
         )
         self.assertEqual(delete_response.status_code, 200)
-        self.assertFalse(User.objects.filter(id=user.id).exists())
\ No newline at end of file
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+
+class UserDirectoryTest(TestCase):
+    """Direktori user: keyset pagination, pencarian prefix lewat token, dan hitungan dalam satu query."""
+
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='adminpass', is_staff=True)
+        self.users = [
+            User.objects.create_user(
+                username=f'anggota{i:02d}', email=f'anggota{i:02d}@kampus.ac.id', first_name='Anggota',
+                last_name='Ganjil' if i % 2 else 'Genap', is_active=i % 5 != 0,
+            )
+            for i in range(60)
+        ]
+        self.client.force_login(self.admin)
+        self.url = reverse('user:user_list_api')
+
+    def test_pages_follow_cursor(self):
+        first = self.client.get(self.url).json()
+        self.assertEqual(len(first['users']), 50)
+        self.assertEqual(first['counts'], {
+            'total': User.objects.count(),
+            'active': User.objects.filter(is_active=True).count(),
+            'inactive': 12,
+            'staff': User.objects.filter(is_staff=True).count(),
+        })
+        second = self.client.get(self.url, {'cursor': first['next_cursor']}).json()
+        self.assertNotIn('counts', second)
+        self.assertFalse(second['has_next_page'])
+
+        ids = [user['id'] for user in first['users'] + second['users']]
+        expected = User.objects.order_by('-date_joined', '-id').values_list('id', flat=True)
+        self.assertEqual(ids, list(expected))
+        self.assertEqual(self.client.get(self.url, {'cursor': 'rusak'}).status_code, 400)
+
+    def test_cursor_with_invalid_values(self):
+        """Cursor dengan date_joined atau id yang tidak bisa di-parse ditolak 400, bukan error database."""
+        for values in (['bukan-tanggal', '1'], ['2024-01-01 10:00:00+00:00', 'zzz']):
+            with self.subTest(values=values):
+                response = self.client.get(self.url, {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_prefix_search_on_tokens(self):
+        def usernames(search, **params):
+            data = self.client.get(self.url, {'search': search, **params}).json()
+            return {user['username'] for user in data['users']}
+
+        self.assertEqual(usernames('anggota1'), {f'anggota1{i}' for i in range(10)})
+        self.assertEqual(usernames('KAMPUS ganjil'), {user.username for user in self.users[1::2]})
+        self.assertEqual(usernames('anggota0 ganj'), {'anggota01', 'anggota03', 'anggota05', 'anggota07', 'anggota09'})
+        self.assertEqual(usernames('anggota0 ganj', status='inactive'), {'anggota05'})
+        self.assertEqual(usernames('nggota'), set())
+
+    def test_tokens_follow_user_changes(self):
+        user = self.users[0]
+        user.last_name = 'Pindahan'
+        user.save()
+        data = self.client.get(self.url, {'search': 'pindah'}).json()
+        self.assertEqual([row['id'] for row in data['users']], [user.id])
+
+        # Login hanya menyimpan last_login, token tidak ditulis ulang
+        with self.assertNumQueries(1):
+            user.save(update_fields=['last_login'])
+
+        UserSearchToken.objects.all().delete()
+        call_command('rebuild_user_search_index', stdout=StringIO())
+        self.assertTrue(UserSearchToken.objects.filter(user=user, token='pindahan').exists())
+
+    def test_html_list_counts_without_count_queries(self):
+        cache.clear()
+        with self.assertNumQueries(4):
+            # Session, user, satu agregat hitungan, dan satu halaman user (tanpa COUNT terpisah)
+            response = self.client.get(reverse('user:user_list'))
+        self.assertEqual(response.context['inactive_users'], 12)
+        self.assertEqual(response.context['users'].paginator.count, User.objects.count())
+        # Hitungan berikutnya dibaca dari cache statistik user
+        with self.assertNumQueries(3):
+            self.client.get(reverse('user:user_list'), {'status': 'active'})
+
+
+class UserStatsTest(TestCase):
+    """Statistik dashboard admin: satu query per metric, di-cache, dibuang oleh signal model terkait."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='admin', password='adminpass', is_staff=True)
+        self.users = [User.objects.create_user(username=f'member{i}', password='pass') for i in range(4)]
+        self.venues = [Venue.objects.create(name=f'Stats Venue {i}', capacity=100, price=100) for i in range(3)]
+        start = date.today() + timedelta(days=1)
+        for i, user in enumerate(self.users[:3]):
+            for day in range(i + 1):
+                Booking.objects.create(user=user, venue=self.venues[i], booking_date=start + timedelta(days=day))
+        for venue in self.venues:
+            Review.objects.create(user=self.users[0], venue=venue, rating=4.0)
+        Review.objects.create(user=self.users[1], venue=self.venues[0], rating=2.0)
+
+    def test_metrics(self):
+        stats = get_stats()
+        self.assertEqual(stats[USER_COUNTS]['data']['total'], User.objects.count())
+        self.assertEqual(stats['signups']['data'][-1]['count'], User.objects.count())
+
+        per_user = stats[BOOKINGS_PER_USER]['data']
+        self.assertEqual(per_user['distribution'], [
+            {'bookings': 1, 'users': 1}, {'bookings': 2, 'users': 1}, {'bookings': 3, 'users': 1},
+        ])
+        self.assertEqual(per_user['users_without_bookings'], User.objects.count() - 3)
+        self.assertEqual(stats[TOP_REVIEWERS]['data'][:2], [
+            {'user_id': self.users[0].id, 'username': 'member0', 'reviews': 3, 'average_rating': 4.0},
+            {'user_id': self.users[1].id, 'username': 'member1', 'reviews': 1, 'average_rating': 2.0},
+        ])
+
+    def test_cached_until_related_model_changes(self):
+        get_stats()
+        with self.assertNumQueries(0):
+            get_stats()
+
+        Booking.objects.create(user=self.users[3], venue=self.venues[2], booking_date=date.today() + timedelta(days=30))
+        # Hanya metric booking yang dihitung ulang
+        with self.assertNumQueries(1):
+            stats = get_stats()
+        self.assertEqual(stats[BOOKINGS_PER_USER]['data']['users_with_bookings'], 4)
+
+        self.users[3].save(update_fields=['last_login'])
+        with self.assertNumQueries(0):
+            get_stats()
+
+        Review.objects.create(user=self.users[3], venue=self.venues[1], rating=5.0)
+        User.objects.create_user(username='baru', password='pass')
+        stats = get_stats()
+        self.assertEqual(stats[USER_COUNTS]['data']['total'], User.objects.count())
+        self.assertEqual(len(stats[TOP_REVIEWERS]['data']), 3)
+
+        self.venues[0].delete()
+        self.assertEqual(get_stats([TOP_REVIEWERS])[TOP_REVIEWERS]['data'][0]['reviews'], 2)
+
+    def test_metric_queries_do_not_scale_with_users(self):
+        with self.assertNumQueries(4):
+            get_stats()
+        expected = Booking.objects.values('user').annotate(n=Count('id')).count()
+        self.assertEqual(get_stats([BOOKINGS_PER_USER])[BOOKINGS_PER_USER]['data']['users_with_bookings'], expected)
+
+    def test_api_and_command(self):
+        url = reverse('user:user_stats_api')
+        self.client.force_login(self.users[0])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.admin)
+        data = self.client.get(url).json()
+        self.assertEqual(set(data['metrics']), {'users', 'signups', 'bookings_per_user', 'top_reviewers'})
+        data = self.client.get(url, {'metric': 'users', 'refresh': '1'}).json()
+        self.assertEqual(list(data['metrics']), ['users'])
+        self.assertEqual(self.client.get(url, {'metric': 'rahasia'}).status_code, 400)
+
+        cache.clear()
+        out = StringIO()
+        call_command('refresh_user_stats', stdout=out)
+        self.assertIn('4 metric', out.getvalue())
+        with self.assertNumQueries(0):
+            get_stats()
+
+
+class UserApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint JSON user tidak boleh bertambah seiring jumlah user dan profil."""
+
+    query_budgets = {
+        # Halaman pertama direktori ikut menghitung total/aktif/nonaktif (satu query agregat)
+        'user:user_list_api': 4,
+        # Profil ikut di-select_related saat auth middleware memuat user: sesi + user
+        'user:get_profile': 2,
+        # Menyimpan nama user ikut mengganti token pencarian (DELETE + INSERT)
+        'user:update_profile': 7,
+        # Sesi + user + venue milik user, lalu snapshot ditulis ke sesi (UPDATE di dalam savepoint).
+        # Request berikutnya hanya sesi + user
+        'user:capabilities_api': 6,
+        # Sesi + user + satu query per metric saat cache kosong; sesudahnya hanya sesi + user
+        'user:user_stats_api': 6,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = create_catalog()
+        cls.admin = User.objects.create_user(username='admin', password='adminpass', is_staff=True)
+
+    def test_user_list(self):
+        self.client.force_login(self.admin)
+        data = self.get_within_budget('user:user_list_api').json()
+        self.assertEqual(len(data['users']), min(50, User.objects.count()))
+        self.assertEqual(data['counts']['total'], User.objects.count())
+        data = self.get_within_budget('user:user_list_api', data={'search': 'fixture1', 'status': 'active'}).json()
+        self.assertEqual(len(data['users']), 11)
+
+    def test_profile(self):
+        self.client.force_login(self.catalog['users'][0])
+        self.assertEqual(self.get_within_budget('user:get_profile').json()['profile']['full_name'], 'Fixture 0')
+        response = self.post_within_budget(
+            'user:update_profile', data=json.dumps({'full_name': 'Pemain Satu', 'phone': '0812'}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_stats(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(set(self.get_within_budget('user:user_stats_api').json()['metrics']), set(METRICS))
+        self.get_within_budget('user:user_stats_api', budget=2)
+
+    def test_capabilities(self):
+        self.client.force_login(self.catalog['users'][0])
+        self.get_within_budget('user:capabilities_api')
+        self.get_within_budget('user:capabilities_api', budget=2)
+
+
+class UserProfileAccessorTest(TestCase):
+    """Profil dibuat sekali oleh signal dan dibaca tanpa get_or_create di setiap request."""
+
+    def test_signal_creates_profile(self):
+        user = User.objects.create_user(username='baru', password='pass12345', first_name='Pemain', last_name='Baru')
+        self.assertEqual(UserProfile.objects.get(user=user).full_name, 'Pemain Baru')
+
+    def test_page_data_reads_profile_with_user(self):
+        user = User.objects.create_user(username='pemain', password='pass12345')
+        self.client.force_login(user)
+        # Sesi + user beserta profilnya (select_related), tanpa SELECT/INSERT profil terpisah
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('accounts:get_page_data'))
+        self.assertTrue(response.json()['is_authenticated'])
+
+    def test_missing_profile_created_lazily(self):
+        user = User.objects.create_user(username='lama', password='pass12345')
+        UserProfile.objects.filter(user=user).delete()
+        user = User.objects.get(pk=user.pk)
+        self.assertEqual(get_user_profile(user).user, user)
+        self.assertEqual(UserProfile.objects.filter(user=user).count(), 1)
+
+    def test_create_missing_profiles_command(self):
+        users = User.objects.bulk_create([User(username=f'bulk{i}', first_name='Bulk', last_name=str(i)) for i in range(3)])
+        out = StringIO()
+        call_command('create_missing_profiles', batch_size=2, stdout=out)
+        self.assertIn('3 profil', out.getvalue())
+        self.assertEqual(UserProfile.objects.get(user=users[2]).full_name, 'Bulk 2')
+        self.assertFalse(User.objects.filter(profile__isnull=True).exists())
+
+
+class CapabilitiesTest(TestCase):
+    """Snapshot hak akses disimpan di sesi dan dihitung ulang saat versinya dinaikkan."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='provider', password='pass12345')
+        self.url = reverse('user:capabilities_api')
+
+    def create_venue(self, name):
+        return Venue.objects.create(
+            name=name, city='Jakarta', country='Indonesia', capacity=100, price=1000, owner=self.user,
+        )
+
+    def test_anonymous(self):
+        data = self.client.get(self.url).json()['capabilities']
+        self.assertFalse(data['is_authenticated'])
+        self.assertFalse(data['can_create_venue'])
+
+    def test_snapshot_cached_in_session(self):
+        venue = self.create_venue('Stadion Satu')
+        self.client.force_login(self.user)
+        data = self.client.get(self.url).json()['capabilities']
+        self.assertEqual(data['owned_venue_ids'], [str(venue.id)])
+        self.assertTrue(data['is_venue_provider'])
+        self.assertFalse(data['can_create_venue'])
+        # Sesi + user; snapshot dibaca dari sesi tanpa query venue
+        with self.assertNumQueries(2):
+            self.assertEqual(self.client.get(self.url).json()['capabilities'], data)
+
+    def test_invalidated_by_new_venue_and_role_change(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).json()['capabilities']['owned_venue_ids'], [])
+        venue = self.create_venue('Stadion Dua')
+        self.assertEqual(self.client.get(self.url).json()['capabilities']['owned_venue_ids'], [str(venue.id)])
+
+        self.user.is_staff = True
+        self.user.save()
+        data = self.client.get(self.url).json()['capabilities']
+        self.assertTrue(data['is_admin'])
+        self.assertTrue(data['can_create_venue'])
+
+        venue.delete()
+        self.assertEqual(self.client.get(self.url).json()['capabilities']['owned_venue_ids'], [])
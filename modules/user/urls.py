@@ -14,6 +14,8 @@ urlpatterns = [
     
     # ========== API VIEWS (Return JSON for Flutter) ==========
     path('api/list/', views.user_list_api, name='user_list_api'),
+    path('api/stats/', views.user_stats_api, name='user_stats_api'),
+    path('me/capabilities/', views.capabilities_api, name='capabilities_api'),
     
     # Profile API (GET current user's profile & UPDATE current user's profile)
     path('api/profile/', views.get_profile, name='get_profile'),
@@ -4,15 +4,22 @@ from django.contrib.auth.models import User
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.core.paginator import Paginator
-from django.db.models import Q
-from .models import UserProfile
+from .capabilities import get_capabilities, is_admin
+from .profiles import get_user_profile
+from .search import search_users
+from .stats import METRICS, USER_COUNTS, get_stats
+from modules.venue.pagination import InvalidCursor, keyset_page
 from .forms import UserForm, UserProfileForm
 import json
 
 
-# Helper function to check if user is admin
-def is_admin(user):
-    return user.is_staff or user.is_superuser
+USER_PAGE_SIZE = 50
+USER_ORDERING = ('-date_joined', '-id')
+USER_LIST_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'is_staff', 'is_superuser', 'is_active', 'date_joined',
+    'last_login', 'profile__full_name', 'profile__phone', 'profile__address', 'profile__is_active',
+)
+
 
 @login_required
 @user_passes_test(is_admin)
@@ -20,26 +27,14 @@ def user_list(request):
     """Display list of all users"""
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
-    
-    users = User.objects.all().select_related('profile').order_by('-date_joined')
-    
-    # Search filter
-    if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)
-        )
-    
-    # Status filter
-    if status_filter == 'active':
-        users = users.filter(is_active=True)
-    elif status_filter == 'inactive':
-        users = users.filter(is_active=False)
-    
+    counts = get_stats([USER_COUNTS])[USER_COUNTS]['data']
+    users = filter_users(User.objects.select_related('profile'), search_query, status_filter).order_by(*USER_ORDERING)
+
     # Pagination
     paginator = Paginator(users, 10)  # Show 10 users per page
+    if not search_query:
+        # Tanpa pencarian jumlah baris sudah diketahui dari agregat, COUNT terpisah tidak perlu
+        paginator.count = {'active': counts['active'], 'inactive': counts['inactive']}.get(status_filter, counts['total'])
     page_number = request.GET.get('page', 1)
     page_obj = paginator.get_page(page_number)
     
@@ -47,19 +42,30 @@ def user_list(request):
         'users': page_obj,
         'search_query': search_query,
         'status_filter': status_filter,
-        'total_users': User.objects.count(),
-        'active_users': User.objects.filter(is_active=True).count(),
-        'inactive_users': User.objects.filter(is_active=False).count(),
+        'total_users': counts['total'],
+        'active_users': counts['active'],
+        'inactive_users': counts['inactive'],
     }
     
     return render(request, 'user_list.html', context)
 
+
+def filter_users(users, search_query, status_filter):
+    """Filter pencarian prefix (lihat modules/user/search.py) dan status aktif untuk daftar user."""
+    if search_query:
+        users = search_users(users, search_query)
+    if status_filter == 'active':
+        users = users.filter(is_active=True)
+    elif status_filter == 'inactive':
+        users = users.filter(is_active=False)
+    return users
+
 @login_required
 @user_passes_test(is_admin)
 def user_detail(request, user_id):
     """View details of a specific user"""
-    user = get_object_or_404(User, id=user_id)
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    user = get_object_or_404(User.objects.select_related('profile'), id=user_id)
+    profile = get_user_profile(user)
     
     context = {
         'user_data': user,
@@ -91,9 +97,8 @@ def user_create(request):
                 user.set_password(password)
             user.save()
             
-            profile = profile_form.save(commit=False)
-            profile.user = user
-            profile.save()
+            # Profil kosong sudah dibuat signal post_save User, form profil mengisinya
+            UserProfileForm(data, instance=get_user_profile(user)).save()
             
             return JsonResponse({
                 'status': 'success',
@@ -124,8 +129,8 @@ def user_create(request):
 @user_passes_test(is_admin)
 def user_edit(request, user_id):
     """Edit existing user"""
-    user = get_object_or_404(User, id=user_id)
-    profile, created = UserProfile.objects.get_or_create(user=user)
+    user = get_object_or_404(User.objects.select_related('profile'), id=user_id)
+    profile = get_user_profile(user)
     
     if request.method == 'POST':
         if request.content_type == 'application/json':
@@ -229,28 +234,26 @@ def user_toggle_status(request, user_id):
 @login_required
 @user_passes_test(is_admin)
 def user_list_api(request):
-    """API endpoint for Flutter - returns JSON"""
+    """
+    API endpoint for Flutter - returns JSON. Dipaginasi per USER_PAGE_SIZE dengan keyset
+    (date_joined, id) menurun; halaman berikutnya lewat ?cursor=<next_cursor>. Halaman pertama
+    menyertakan jumlah total/aktif/nonaktif.
+    """
     search_query = request.GET.get('search', '')
     status_filter = request.GET.get('status', '')
-    
-    users = User.objects.all().select_related('profile').order_by('-date_joined')
-    
-    if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)
-        )
-    
-    if status_filter == 'active':
-        users = users.filter(is_active=True)
-    elif status_filter == 'inactive':
-        users = users.filter(is_active=False)
-    
+    cursor = request.GET.get('cursor')
+
+    users = filter_users(
+        User.objects.select_related('profile').only(*USER_LIST_FIELDS), search_query, status_filter,
+    )
+    try:
+        page_users, next_cursor = keyset_page(users, USER_ORDERING, cursor, USER_PAGE_SIZE)
+    except InvalidCursor:
+        return JsonResponse({'status': 'error', 'message': 'Cursor tidak valid.'}, status=400)
+
     # Serialize users to JSON
     users_data = []
-    for user in users:
+    for user in page_users:
         profile = getattr(user, 'profile', None)
         users_data.append({
             'id': user.id,
@@ -270,8 +273,31 @@ def user_list_api(request):
                 'is_active': profile.is_active if profile else True,
             } if profile else None
         })
-    
-    return JsonResponse({'users': users_data}, safe=False)
+
+    data = {'users': users_data, 'next_cursor': next_cursor, 'has_next_page': next_cursor is not None}
+    if not cursor:
+        data['counts'] = get_stats([USER_COUNTS])[USER_COUNTS]['data']
+    return JsonResponse(data)
+
+@login_required
+@user_passes_test(is_admin)
+def user_stats_api(request):
+    """
+    Statistik user untuk dashboard admin: jumlah per status, user baru per hari, sebaran booking
+    per user, dan reviewer teratas. Dibaca dari cache; refresh=1 menghitung ulang semuanya.
+    """
+    names = request.GET.getlist('metric') or list(METRICS)
+    unknown = [name for name in names if name not in METRICS]
+    if unknown:
+        return JsonResponse({'status': 'error', 'message': f'Metric tidak dikenal: {", ".join(unknown)}.'}, status=400)
+    return JsonResponse({'metrics': get_stats(names, refresh=request.GET.get('refresh') == '1')})
+
+def capabilities_api(request):
+    """
+    Snapshot hak akses user yang sedang login (peran, venue yang dimiliki, dan izin turunannya) dalam
+    satu response, untuk diambil client sekali saat login. Tamu mendapat snapshot tanpa izin.
+    """
+    return JsonResponse({'status': 'success', 'capabilities': get_capabilities(request)})
 
 # ========== PROFILE API FUNCTIONS ==========
 
@@ -280,7 +306,7 @@ def get_profile(request):
     """Get current logged-in user's profile - RETURNS JSON"""
     try:
         user = request.user
-        profile, created = UserProfile.objects.get_or_create(user=user)
+        profile = get_user_profile(user)
         
         data = {
             'id': user.id,
@@ -314,7 +340,7 @@ def update_profile(request):
     if request.method == 'POST':
         try:
             user = request.user
-            profile, created = UserProfile.objects.get_or_create(user=user)
+            profile = get_user_profile(user)
             
             # Get data from request
             if request.content_type == 'application/json':
@@ -82,4 +82,6 @@ class VenueConfig(AppConfig):
         Hubungkan signal post_migrate untuk membuat akun provider secara otomatis.
         """
         # Hubungkan fungsi create_default_venue_providers ke signal post_migrate
-        post_migrate.connect(create_default_venue_providers, sender=self)
\ No newline at end of file
+        post_migrate.connect(create_default_venue_providers, sender=self)
+        # Signal model Venue (index full-text search)
+        from modules.venue import signals  # noqa: F401
\ No newline at end of file
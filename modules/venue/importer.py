@@ -0,0 +1,209 @@
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from modules.venue.leaderboard import invalidate_leaderboards
+from modules.venue.models import Venue
+from modules.venue.response_cache import bump_versions
+from modules.venue.search import get_search_backend
+from modules.venue.thumbnails import store_thumbnail
+
+# Kolom CSV dataset -> field Venue
+CSV_COLUMNS = {
+    'Stadium': 'name',
+    'City': 'city',
+    'HomeTeams': 'home_teams',
+    'Capacity': 'capacity',
+    'Country': 'country',
+    'Thumbnail': 'thumbnail',
+    'Description': 'description',
+}
+# Natural key venue hasil import, sama dengan constraint venue_natural_key_unique
+NATURAL_KEY = ('name', 'city', 'country')
+# Field yang ditimpa saat venue sudah ada. Harga, rating, owner, dan field lain yang diubah
+# lewat aplikasi tidak disentuh, jadi import ulang aman dijalankan berkali-kali
+UPDATE_FIELDS = ('home_teams', 'capacity', 'thumbnail', 'description')
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_WORKERS = 4
+# Import dibatalkan begitu jumlah baris yang ditolak melebihi batas ini
+DEFAULT_MAX_REJECTS = 100
+DEFAULT_PRICE_SEED = 0
+
+# Harga venue baru, diturunkan dari hash natural key + seed (bukan random per baris)
+PRICE_MIN = 1000000
+PRICE_MAX = 10000000
+MAX_CAPACITY = 500000
+MAX_LENGTHS = {'name': 255, 'city': 100, 'country': 100}
+# Angka dengan pemisah ribuan, mis. "41,654", "41.654", atau "41 654"
+GROUPED_NUMBER = r'\d{1,3}(?:[,.\s]\d{3})+'
+
+
+class ImportRejected(Exception):
+    """Import dihentikan karena terlalu banyak baris yang tidak valid."""
+
+    def __init__(self, stats, max_rejects):
+        self.stats = stats
+        super().__init__(
+            f'{stats.rejected} baris ditolak (batas {max_rejects}) sesudah membaca {stats.rows} baris.'
+        )
+
+
+@dataclass
+class ImportStats:
+    rows: int = 0
+    rejected: int = 0
+    created: int = 0
+    updated: int = 0
+    seconds: float = 0.0
+
+    @property
+    def imported(self):
+        return self.rows - self.rejected
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Baca CSV per chunk sehingga memori tetap konstan berapapun jumlah barisnya."""
+    return pd.read_csv(
+        path, usecols=list(CSV_COLUMNS), dtype=str, keep_default_na=False, chunksize=chunk_size,
+    )
+
+
+def normalize_text(values):
+    """
+    Rapikan spasi; teks yang seluruhnya huruf kecil diubah ke Title Case. Teks huruf besar dibiarkan
+    karena bisa berupa singkatan atau kode (USA, UAE) dan bagian natural key venue yang sudah ada.
+    """
+    values = values.str.replace(r'\s+', ' ', regex=True).str.strip()
+    return values.where(~values.str.islower(), values.str.title())
+
+
+def parse_capacity(values):
+    """Kapasitas sebagai float (NaN jika bukan angka); pemisah ribuan dibuang."""
+    values = values.str.strip()
+    grouped = values.str.fullmatch(GROUPED_NUMBER)
+    values = values.where(~grouped, values.str.replace(r'[,.\s]', '', regex=True))
+    return pd.to_numeric(values, errors='coerce')
+
+
+def price_for(frame, seed=DEFAULT_PRICE_SEED):
+    """
+    Harga venue baru dari hash (name, city, country) dan seed. Venue yang sama selalu mendapat harga
+    yang sama, tidak bergantung urutan baris atau ukuran chunk.
+    """
+    hash_key = hashlib.md5(str(seed).encode()).hexdigest()[:16]
+    hashes = pd.util.hash_pandas_object(frame[list(NATURAL_KEY)], index=False, hash_key=hash_key).to_numpy()
+    return PRICE_MIN + (hashes % np.uint64(PRICE_MAX - PRICE_MIN + 1)).astype(np.int64)
+
+
+def clean_chunk(chunk, seed=DEFAULT_PRICE_SEED):
+    """
+    Validasi dan normalisasi satu chunk CSV secara vektor (tanpa loop per baris). Stadion duplikat
+    hanya dibuang di dalam chunk; antar chunk, baris dengan natural key yang sama menjadi upsert
+    (baris terakhir menang), sehingga memori tidak tumbuh seiring jumlah baris file.
+    Return (frame valid dengan nama kolom field Venue beserta price, frame baris yang ditolak
+    dengan kolom line dan reason).
+    """
+    frame = chunk.rename(columns=CSV_COLUMNS)
+    for field in ('name', 'home_teams', 'description', 'thumbnail'):
+        frame[field] = frame[field].str.strip()
+    frame['city'] = normalize_text(frame['city'])
+    frame['country'] = normalize_text(frame['country'])
+    frame['name'] = frame['name'].str.replace(r'\s+', ' ', regex=True)
+    capacity = parse_capacity(frame['capacity'])
+
+    # Case-sensitive seperti venue_natural_key_unique (dan upsert-nya): "GELORA" dan "Gelora" dua venue
+    keys = pd.util.hash_pandas_object(frame[list(NATURAL_KEY)], index=False).to_numpy()
+    duplicate = pd.Series(keys).duplicated().to_numpy()
+
+    checks = [
+        (frame['name'] == '', 'stadium kosong'),
+        (frame['city'] == '', 'kota kosong'),
+        (frame['country'] == '', 'negara kosong'),
+        (frame['country'].str.contains(r'\d'), 'negara tidak valid'),
+        (capacity.isna(), 'kapasitas bukan angka'),
+        ((capacity < 0) | (capacity > MAX_CAPACITY) | (capacity % 1 != 0), 'kapasitas tidak valid'),
+    ]
+    checks += [(frame[field].str.len() > length, f'{field} terlalu panjang') for field, length in MAX_LENGTHS.items()]
+    checks.append((duplicate, 'stadium duplikat'))
+    reason = np.select([np.asarray(mask, dtype=bool) for mask, _ in checks], [text for _, text in checks], default='')
+    rejected = reason != ''
+
+    valid = frame.loc[~rejected, list(CSV_COLUMNS.values())]
+    valid['capacity'] = capacity[~rejected].astype(int)
+    valid['price'] = price_for(valid, seed)
+
+    rejects = chunk.loc[rejected].copy()
+    rejects.insert(0, 'line', chunk.index[rejected] + 2)
+    rejects['reason'] = reason[rejected]
+    return valid, rejects
+
+
+def build_venues(frame, thumbnails):
+    """Venue dari frame hasil clean_chunk. thumbnails adalah hasil store_thumbnail per baris, urutannya sama."""
+    frame = frame.assign(thumbnail=list(thumbnails))
+    return [Venue(**row) for row in frame.to_dict('records')]
+
+
+def default_rejects_path(path):
+    return f'{os.path.splitext(path)[0]}.rejected.csv'
+
+
+def import_venues(
+    path, chunk_size=DEFAULT_CHUNK_SIZE, workers=DEFAULT_WORKERS, seed=DEFAULT_PRICE_SEED,
+    rejects_path=None, max_rejects=DEFAULT_MAX_REJECTS, validate_only=False, progress=None,
+):
+    """
+    Upsert venue dari CSV berdasarkan NATURAL_KEY tanpa menghapus venue lama, sehingga booking dan
+    review tetap utuh. Setiap chunk divalidasi dulu oleh clean_chunk; baris yang ditolak ditulis ke
+    rejects_path, dan ImportRejected di-raise sebelum chunk yang melewati max_rejects ditulis ke
+    database. Thumbnail di-decode dan disimpan oleh thread pool; thread utama hanya menulis ke
+    database. validate_only=True hanya memvalidasi seluruh file. progress(stats) dipanggil sesudah
+    setiap chunk. Return ImportStats.
+    """
+    rejects_path = rejects_path or default_rejects_path(path)
+    if os.path.exists(rejects_path):
+        os.remove(rejects_path)
+
+    stats = ImportStats()
+    before = Venue.objects.count()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for chunk in read_chunks(path, chunk_size):
+            valid, rejects = clean_chunk(chunk, seed)
+            stats.rows += len(chunk)
+            if len(rejects):
+                rejects.to_csv(rejects_path, mode='a', header=not stats.rejected, index=False)
+                stats.rejected += len(rejects)
+                if max_rejects is not None and stats.rejected > max_rejects:
+                    raise ImportRejected(stats, max_rejects)
+
+            if not validate_only and len(valid):
+                # bulk_create tidak memanggil Venue.save(), karena itu thumbnail disimpan di sini
+                venues = build_venues(valid, executor.map(store_thumbnail, valid['thumbnail']))
+                Venue.objects.bulk_create(
+                    venues, update_conflicts=True, unique_fields=NATURAL_KEY, update_fields=UPDATE_FIELDS,
+                )
+            stats.seconds = time.perf_counter() - start
+            if progress is not None:
+                progress(stats)
+
+    if not validate_only:
+        stats.created = Venue.objects.count() - before
+        stats.updated = stats.imported - stats.created
+        # bulk_create tidak memicu signal, jadi index pencarian dan cache diperbarui sekaligus di akhir
+        get_search_backend().rebuild()
+        bump_versions()
+        invalidate_leaderboards()
+    stats.seconds = time.perf_counter() - start
+    return stats
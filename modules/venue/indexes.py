@@ -0,0 +1,31 @@
+from django.db import DatabaseError, transaction
+
+NAME_TRIGRAM_INDEX = 'venue_name_trgm_idx'
+
+
+def create_name_trigram_index(connection):
+    """
+    Index GIN trigram untuk name__icontains di PostgreSQL (Django memakai UPPER(name) LIKE UPPER(...)).
+    Backend lain tidak punya trigram dan name__icontains tetap full scan; di SQLite pencarian teks yang
+    memakai index adalah FTS5 (parameter q). Return True jika index dibuat.
+    """
+    if connection.vendor != 'postgresql':
+        return False
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {NAME_TRIGRAM_INDEX} '
+                'ON venue_venue USING gin (UPPER("name"::text) gin_trgm_ops)'
+            )
+    except DatabaseError:
+        # Mis. user database tidak punya izin CREATE EXTENSION
+        return False
+    return True
+
+
+def drop_name_trigram_index(connection):
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP INDEX IF EXISTS {NAME_TRIGRAM_INDEX}')
@@ -0,0 +1,112 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import reverse
+
+from modules.venue.models import Venue
+from modules.venue.response_cache import bump_scopes, get_version
+
+KEY_PREFIX = 'venue:leaderboard'
+LEADERBOARD = 'leaderboard'
+BOARD_KINDS = ('all', 'city', 'country')
+
+
+def card_payload(venue):
+    """Data kartu venue seperti yang dikirim endpoint rekomendasi."""
+    return {
+        'id': venue.id,
+        'stadium': venue.name,
+        'city': venue.city,
+        'country': venue.country,
+        'capacity': venue.capacity,
+        'price': venue.price,
+        'thumbnail': venue.thumbnail if venue.thumbnail else '',
+        'rating': venue.rating,
+        'url_detail': reverse('venue:venue_detail', args=[venue.id]),
+    }
+
+
+def _entry(venue):
+    # (rating, id.hex) diurutkan menurun sama dengan ORDER BY rating DESC, id DESC di database
+    return venue.rating, venue.id.hex, card_payload(venue)
+
+
+def _board_key(kind, value=''):
+    digest = hashlib.md5(value.encode()).hexdigest()
+    return f'{KEY_PREFIX}:{get_version(LEADERBOARD)}:{kind}:{digest}'
+
+
+def _boards_for(venue):
+    return (('all', ''), ('city', venue.city), ('country', venue.country))
+
+
+def get_board(kind='all', value=''):
+    """
+    Top-K venue (K = VENUE_LEADERBOARD_SIZE) untuk seluruh katalog, satu kota, atau satu negara.
+    Dibangun sekali dari index (rating, id) / (city|country, rating, id), selanjutnya dari cache.
+    """
+    key = _board_key(kind, value)
+    board = cache.get(key)
+    if board is None:
+        venues = Venue.objects.card()
+        if kind != 'all':
+            venues = venues.filter(**{kind: value})
+        board = [_entry(venue) for venue in venues.order_by('-rating', '-id')[:settings.VENUE_LEADERBOARD_SIZE]]
+        cache.set(key, board, settings.VENUE_LEADERBOARD_TIMEOUT)
+    return board
+
+
+def top_venues(limit, city=None, country=None):
+    """Payload kartu venue dengan rating tertinggi. city didahulukan jika city dan country sama-sama diisi."""
+    if city:
+        board = get_board('city', city)
+    elif country:
+        board = get_board('country', country)
+    else:
+        board = get_board()
+    return [payload for _, _, payload in board[:limit]]
+
+
+def _update_board(key, venue):
+    board = cache.get(key)
+    if board is None:
+        return
+    size = settings.VENUE_LEADERBOARD_SIZE
+    entry = _entry(venue)
+    rest = [item for item in board if item[1] != entry[1]]
+
+    if len(board) < size:
+        # Board belum penuh berarti berisi semua venue di scope ini
+        rest.append(entry)
+    elif entry[:2] >= board[-1][:2]:
+        # Masih di atas batas bawah lama, jadi pasti tetap masuk top-K
+        rest.append(entry)
+    elif len(rest) < len(board):
+        # Venue turun ke bawah batas: penggantinya di luar board tidak diketahui, bangun ulang nanti
+        cache.delete(key)
+        return
+    else:
+        return
+
+    rest.sort(key=lambda item: item[:2], reverse=True)
+    cache.set(key, rest[:size], settings.VENUE_LEADERBOARD_TIMEOUT)
+
+
+def update_venue_rating(venue):
+    """
+    Perbarui board yang memuat venue ini (global, kotanya, negaranya) sesudah rating berubah.
+    venue harus memuat CARD_FIELDS dengan rating yang baru.
+    """
+    def update():
+        for kind, value in _boards_for(venue):
+            _update_board(_board_key(kind, value), venue)
+
+    transaction.on_commit(update)
+
+
+def invalidate_leaderboards():
+    """Buang semua board, mis. saat nama, kota, atau harga venue berubah."""
+    bump_scopes([LEADERBOARD])
+    transaction.on_commit(lambda: bump_scopes([LEADERBOARD]))
@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from modules.venue.recommendations import compute_neighbours, interaction_frame, store_neighbours
+
+
+class Command(BaseCommand):
+    help = (
+        'Hitung kemiripan antar venue (cosine item-item) dari riwayat booking dan review, '
+        'lalu simpan K tetangga teratas per venue ke VenueNeighbour.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k', type=int, default=settings.VENUE_NEIGHBOURS_K,
+            help=f'Jumlah tetangga per venue (default {settings.VENUE_NEIGHBOURS_K}).',
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        frame = interaction_frame()
+        neighbours = compute_neighbours(frame, options['k'])
+        stored = store_neighbours(neighbours)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(frame)} interaksi user-venue, {neighbours["venue"].nunique()} venue, '
+            f'{stored} tetangga disimpan dalam {elapsed:.2f} detik.'
+        ))
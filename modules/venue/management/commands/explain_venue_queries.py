@@ -0,0 +1,107 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from modules.venue.indexes import create_name_trigram_index, drop_name_trigram_index
+from modules.venue.models import Venue
+from modules.venue.pagination import keyset_filter
+from modules.venue.synthetic import generate_venues, synthetic_cities
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Isi katalog dengan venue sintetis lalu tampilkan query plan dan waktu query pencarian venue '
+        'sebelum dan sesudah index. Semua perubahan di-rollback di akhir. Hanya berjalan dengan DEBUG '
+        'atau --allow-destructive.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--venues', type=int, default=100000, help='Jumlah venue sintetis (default 100000).')
+        parser.add_argument('--repeat', type=int, default=5, help='Berapa kali tiap query dijalankan untuk median.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--allow-destructive', action='store_true',
+            help='Izinkan berjalan tanpa DEBUG. Index venue di-drop dan tabel dikunci selama command berjalan.',
+        )
+
+    def handle(self, *args, **options):
+        # Selama transaksi, index venue hilang dan tabel terkunci untuk request lain; jangan di database produksi
+        if not (settings.DEBUG or options['allow_destructive']):
+            raise CommandError(
+                'Command ini men-drop index dan mengisi venue sintetis. Jalankan dengan DEBUG=True atau '
+                '--allow-destructive (sebaiknya di database terpisah).'
+            )
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Data sintetis dan perubahan index sudah di-rollback.')
+
+    def run(self, options):
+        self.stdout.write(f"Membuat {options['venues']} venue sintetis...")
+        generate_venues(options['venues'], seed=options['seed'])
+        self.analyze()
+
+        queries = self.scenarios()
+        indexes = Venue._meta.indexes
+        editor = connection.schema_editor()
+
+        with connection.cursor() as cursor:
+            for index in indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+        drop_name_trigram_index(connection)
+        self.analyze()
+        before = self.measure('SEBELUM index', queries, options['repeat'])
+
+        with connection.cursor() as cursor:
+            for index in indexes:
+                cursor.execute(str(index.create_sql(Venue, editor)))
+        create_name_trigram_index(connection)
+        self.analyze()
+        after = self.measure('SESUDAH index', queries, options['repeat'])
+
+        self.stdout.write('\nRingkasan (median ms):')
+        for label in queries:
+            self.stdout.write(f'  {label:<28} {before[label]:>10.2f} -> {after[label]:>10.2f}')
+
+    def scenarios(self):
+        busiest_city = synthetic_cities()[0][0]
+        base = Venue.objects.card()
+        middle = base.order_by('price', 'id').values_list('price', 'id')[base.count() // 2]
+        return {
+            'search default': base.order_by('price', 'id')[:19],
+            'search city': base.filter(city=busiest_city).order_by('price', 'id')[:19],
+            'search capacity range': base.filter(capacity__gte=40000, capacity__lte=45000).order_by('price', 'id')[:19],
+            'search name icontains': base.filter(name__icontains='garuda').order_by('price', 'id')[:19],
+            'search high to low': base.order_by('-price', '-id')[:19],
+            'keyset deep page': base.filter(keyset_filter(('price', 'id'), middle)).order_by('price', 'id')[:19],
+            'recommended': base.order_by('-rating', '-id')[:2],
+            'leaderboard city': base.filter(city=busiest_city).order_by('-rating', '-id')[:20],
+            'leaderboard country': base.filter(country='Indonesia').order_by('-rating', '-id')[:20],
+        }
+
+    def measure(self, title, queries, repeat):
+        self.stdout.write(f'\n===== {title} =====')
+        results = {}
+        for label, queryset in queries.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            results[label] = statistics.median(timings)
+            self.stdout.write(f'\n-- {label} ({results[label]:.2f} ms)')
+            self.stdout.write(queryset.explain())
+        return results
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
@@ -0,0 +1,78 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from modules.venue.importer import (
+    DEFAULT_CHUNK_SIZE, DEFAULT_MAX_REJECTS, DEFAULT_PRICE_SEED, DEFAULT_WORKERS, ImportRejected,
+    default_rejects_path, import_venues,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Import venue dari CSV secara bertahap (per chunk) dengan upsert berdasarkan stadium, kota, '
+        'dan negara. Venue yang sudah ada diperbarui, booking dan review tidak terhapus.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=os.path.join(settings.BASE_DIR, 'data', 'venue_dataset.csv'),
+            help='Lokasi file CSV (default data/venue_dataset.csv).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'Jumlah baris per chunk (default {DEFAULT_CHUNK_SIZE}).',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=DEFAULT_WORKERS,
+            help=f'Jumlah thread untuk decode thumbnail (default {DEFAULT_WORKERS}).',
+        )
+        parser.add_argument(
+            '--seed', type=int, default=DEFAULT_PRICE_SEED,
+            help=f'Seed harga venue baru (default {DEFAULT_PRICE_SEED}).',
+        )
+        parser.add_argument(
+            '--rejects', default=None,
+            help='File CSV untuk baris yang ditolak (default <path>.rejected.csv).',
+        )
+        parser.add_argument(
+            '--max-rejects', type=int, default=DEFAULT_MAX_REJECTS,
+            help=f'Hentikan import jika baris yang ditolak melebihi jumlah ini (default {DEFAULT_MAX_REJECTS}).',
+        )
+        parser.add_argument(
+            '--validate-only', action='store_true',
+            help='Hanya validasi file, tanpa menulis ke database.',
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['path']):
+            raise CommandError(f'File {options["path"]} tidak ditemukan.')
+        if options['chunk_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--chunk-size dan --workers minimal 1.')
+        rejects_path = options['rejects'] or default_rejects_path(options['path'])
+
+        def progress(stats):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{stats.rows} baris, {stats.rows_per_second:.0f} baris/detik')
+
+        try:
+            stats = import_venues(
+                options['path'], chunk_size=options['chunk_size'], workers=options['workers'],
+                seed=options['seed'], rejects_path=rejects_path, max_rejects=options['max_rejects'],
+                validate_only=options['validate_only'], progress=progress,
+            )
+        except ImportRejected as e:
+            raise CommandError(f'{e} Lihat {rejects_path}.')
+
+        if stats.rejected:
+            self.stdout.write(self.style.WARNING(f'{stats.rejected} baris ditolak, lihat {rejects_path}.'))
+        if options['validate_only']:
+            self.stdout.write(self.style.SUCCESS(
+                f'{stats.imported} dari {stats.rows} baris valid ({stats.rows_per_second:.0f} baris/detik).'
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{stats.imported} baris diimport ({stats.created} venue baru, {stats.updated} diperbarui) '
+            f'dalam {stats.seconds:.2f} detik, {stats.rows_per_second:.0f} baris/detik.'
+        ))
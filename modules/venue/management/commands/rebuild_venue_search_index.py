@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from modules.venue.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = (
+        'Bangun ulang index full-text search venue. Jalankan setelah impor massal (bulk_create '
+        'tidak memicu signal yang biasanya memperbarui index).'
+    )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        indexed = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{type(backend).__name__}: {indexed} venue terindeks.'))
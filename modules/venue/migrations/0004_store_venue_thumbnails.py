@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from modules.venue.thumbnails import store_thumbnail
+
+
+def move_thumbnails_to_storage(apps, schema_editor):
+    Venue = apps.get_model('venue', 'Venue')
+    venues = Venue.objects.filter(thumbnail__startswith='data:').only('id', 'thumbnail')
+    for venue in venues.iterator(chunk_size=100):
+        Venue.objects.filter(pk=venue.pk).update(thumbnail=store_thumbnail(venue.thumbnail))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0003_venue_facilities_venue_rules'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_thumbnails_to_storage, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+from modules.venue.indexes import create_name_trigram_index, drop_name_trigram_index
+
+
+def add_name_trigram_index(apps, schema_editor):
+    create_name_trigram_index(schema_editor.connection)
+
+
+def remove_name_trigram_index(apps, schema_editor):
+    drop_name_trigram_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0004_store_venue_thumbnails'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['price', 'id'], name='venue_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['city', 'price', 'id'], name='venue_city_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['capacity', 'price'], name='venue_capacity_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['-rating', '-id'], name='venue_rating_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['name'], name='venue_name_idx'),
+        ),
+        migrations.RunPython(add_name_trigram_index, remove_name_trigram_index),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations
+
+from modules.venue.search import FTS_TABLE, SEARCH_VECTOR_INDEX, create_fts_table, populate_fts_table, search_vector
+
+
+def create_search_index(apps, schema_editor):
+    """
+    PostgreSQL: GIN index di atas ekspresi SearchVector yang sama dengan query di search.py.
+    SQLite: tabel virtual FTS5 yang diisi dari venue yang sudah ada. Vendor lain memakai fallback icontains.
+    """
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+
+        Venue = apps.get_model('venue', 'Venue')
+        schema_editor.add_index(Venue, GinIndex(search_vector(), name=SEARCH_VECTOR_INDEX))
+    elif connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0]:
+                return
+            create_fts_table(cursor)
+            populate_fts_table(cursor)
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}')
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0005_venue_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
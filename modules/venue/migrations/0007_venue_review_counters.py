@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:15
+
+from django.db import migrations, models
+
+from modules.review.ratings import rebuild_venue_ratings
+
+
+def backfill_review_counters(apps, schema_editor):
+    rebuild_venue_ratings(apps.get_model('venue', 'Venue'), apps.get_model('review', 'Review'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0006_venue_full_text_search'),
+        ('review', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='venue',
+            name='rating_sum',
+            field=models.DecimalField(decimal_places=1, default=0, max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='venue',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_review_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0007_venue_review_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['city', '-rating', '-id'], name='venue_city_rating_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='venue',
+            index=models.Index(fields=['country', '-rating', '-id'], name='venue_country_rating_id_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0008_venue_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VenueNeighbour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('neighbour', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='venue.venue')),
+                ('venue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='venue.venue')),
+            ],
+            options={
+                'ordering': ['venue', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('venue', 'rank'), name='venue_neighbour_rank_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:34
+
+import logging
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+logger = logging.getLogger('lapangin.migrations')
+
+
+def rename_duplicate_venues(apps, schema_editor):
+    # Venue kembar (nama, kota, negara) tidak dihapus karena bisa punya booking dan review;
+    # selain yang pertama, namanya diberi akhiran potongan id supaya constraint bisa dibuat.
+    # Setiap baris yang di-rename ditulis ke log supaya bisa digabung atau dihapus secara manual
+    Venue = apps.get_model('venue', 'Venue')
+    renamed = 0
+    duplicates = (
+        Venue.objects.values('name', 'city', 'country').annotate(total=Count('id')).filter(total__gt=1).order_by()
+    )
+    for key in duplicates:
+        venues = Venue.objects.filter(name=key['name'], city=key['city'], country=key['country']).order_by('id')
+        for venue in venues[1:]:
+            suffix = f' ({venue.id.hex[:8]})'
+            new_name = venue.name[:255 - len(suffix)] + suffix
+            Venue.objects.filter(pk=venue.pk).update(name=new_name)
+            renamed += 1
+            logger.warning('Venue duplikat %s di-rename: %r -> %r (%s, %s)', venue.pk, venue.name, new_name,
+                           venue.city, venue.country)
+    if renamed:
+        logger.warning('%d venue duplikat di-rename sebelum venue_natural_key_unique dibuat.', renamed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0009_venue_neighbour'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_venues, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='venue',
+            constraint=models.UniqueConstraint(fields=('name', 'city', 'country'), name='venue_natural_key_unique'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:46
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('venue', '0010_venue_natural_key'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='venue',
+            name='venue_name_idx',
+        ),
+    ]
@@ -3,7 +3,22 @@ from django.contrib.auth.models import User
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
 from django.core.validators import MinValueValidator
+from django.db.models.functions import Substr
 import uuid
+from .thumbnails import store_thumbnail
+
+# Kolom yang dibutuhkan kartu venue di list/search, tanpa kolom teks besar
+CARD_FIELDS = ('id', 'name', 'city', 'country', 'capacity', 'price', 'thumbnail', 'rating', 'owner')
+# Kolom untuk halaman detail dan katalog lengkap
+DETAIL_FIELDS = CARD_FIELDS + ('description', 'facilities', 'rules')
+CARD_DESCRIPTION_LENGTH = 200
+
+
+def card_fields(relation=None):
+    """CARD_FIELDS, atau versi berprefix relasi (mis. 'venue__name') untuk only() dari model lain."""
+    if relation is None:
+        return CARD_FIELDS
+    return tuple(f'{relation}__{field}' for field in CARD_FIELDS)
 
 class User(AbstractUser):
     is_venue_provider = models.BooleanField(default=False)
@@ -23,6 +38,20 @@ class User(AbstractUser):
         related_query_name='venue_user',
     )
 
+class VenueQuerySet(models.QuerySet):
+    def card(self):
+        """Proyeksi untuk list venue: tidak memuat description, facilities, rules, dan home_teams."""
+        return self.only(*CARD_FIELDS)
+
+    def with_description_excerpt(self, length=CARD_DESCRIPTION_LENGTH):
+        """Tambahkan potongan awal description (description_excerpt) tanpa memuat kolom utuhnya."""
+        return self.annotate(description_excerpt=Substr('description', 1, length))
+
+    def detail(self):
+        """Proyeksi untuk detail venue dan katalog JSON."""
+        return self.only(*DETAIL_FIELDS)
+
+
 class Venue(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255)
@@ -37,6 +66,61 @@ class Venue(models.Model):
     rules = models.TextField(default='', blank=True)
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True)
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=0.0)
-    
+    # Agregat review yang dijaga incremental oleh signal review; rating = rating_sum / review_count
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.DecimalField(max_digits=12, decimal_places=1, default=0)
+
+    objects = VenueQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # search_venues_api: urutan harga (dan keyset cursor) dengan/tanpa filter kota
+            models.Index(fields=['price', 'id'], name='venue_price_id_idx'),
+            models.Index(fields=['city', 'price', 'id'], name='venue_city_price_id_idx'),
+            models.Index(fields=['capacity', 'price'], name='venue_capacity_price_idx'),
+            # Leaderboard rekomendasi: ORDER BY rating DESC, id DESC, global, per kota, dan per negara
+            models.Index(fields=['-rating', '-id'], name='venue_rating_id_idx'),
+            models.Index(fields=['city', '-rating', '-id'], name='venue_city_rating_id_idx'),
+            models.Index(fields=['country', '-rating', '-id'], name='venue_country_rating_id_idx'),
+            # name__icontains (LIKE '%x%') tidak bisa memakai B-tree; di PostgreSQL ada index trigram
+            # (indexes.py, migration 0005), di SQLite pencarian teks lewat FTS5 (parameter q)
+        ]
+        constraints = [
+            # Natural key untuk upsert command import_venues
+            models.UniqueConstraint(fields=['name', 'city', 'country'], name='venue_natural_key_unique'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Owner saat dimuat, supaya signal bisa membuang index kepemilikan owner lama jika owner diganti
+        instance._loaded_owner_id = instance.__dict__.get('owner_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Thumbnail berupa data URI dipindah ke thumbnail storage, kolom hanya menyimpan URL-nya
+        update_fields = kwargs.get('update_fields')
+        if 'thumbnail' not in self.get_deferred_fields() and (update_fields is None or 'thumbnail' in update_fields):
+            self.thumbnail = store_thumbnail(self.thumbnail)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
+
+
+class VenueNeighbour(models.Model):
+    """Venue yang paling mirip per venue (cosine item-item), diisi command build_venue_recommendations."""
+    venue = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='neighbours')
+    neighbour = models.ForeignKey(Venue, on_delete=models.CASCADE, related_name='+')
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ['venue', 'rank']
+        constraints = [
+            # Sekaligus index untuk lookup tetangga satu venue
+            models.UniqueConstraint(fields=['venue', 'rank'], name='venue_neighbour_rank_unique'),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f'{self.venue_id} -> {self.neighbour_id} ({self.score:.3f})'
@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+
+from modules.user.capabilities import is_admin
+from modules.venue.models import Venue
+
+KEY_PREFIX = 'venue:owned'
+
+
+def _key(user_id):
+    return f'{KEY_PREFIX}:{user_id}'
+
+
+def owned_venue_ids(user_id):
+    """
+    Set id venue milik user dari cache. Saat cache kosong dibaca sekali dari index owner_id lalu
+    disimpan selama VENUE_OWNERSHIP_TIMEOUT; signal venue membuangnya saat kepemilikan berubah.
+    """
+    if user_id is None:
+        return frozenset()
+    ids = cache.get(_key(user_id))
+    if ids is None:
+        ids = list(Venue.objects.filter(owner_id=user_id).values_list('id', flat=True))
+        cache.set(_key(user_id), ids, settings.VENUE_OWNERSHIP_TIMEOUT)
+    return frozenset(ids)
+
+
+def can_manage_venue(user, venue_id):
+    """
+    Admin, atau owner venue, tanpa mengambil baris venue utuh. Index kepemilikan menjawab tanpa query;
+    jika index bilang bukan owner, hanya owner_id baris yang dibaca karena index bisa tertinggal sesudah
+    queryset.update() atau bulk_create (owner baru tidak terkunci sampai cache kedaluwarsa).
+    Raise Http404 jika venue tidak ada. View tetap mencocokkan baris yang diambil lewat manages_venue.
+    """
+    if is_admin(user) or (user.is_authenticated and venue_id in owned_venue_ids(user.id)):
+        return True
+    if not user.is_authenticated:
+        return False
+    return get_object_or_404(Venue.objects.values_list('owner_id', flat=True), pk=venue_id) == user.id
+
+
+def manages_venue(user, venue):
+    """Hak kelola menurut baris venue yang sudah diambil: admin atau owner_id-nya sendiri."""
+    return is_admin(user) or venue.owner_id == user.id
+
+
+def venue_owners(venue):
+    """Owner sekarang dan owner saat venue dimuat (berbeda jika owner diganti)."""
+    return venue.owner_id, getattr(venue, '_loaded_owner_id', None)
+
+
+def invalidate_ownership(*user_ids):
+    """Buang index kepemilikan user sekarang dan sekali lagi sesudah commit."""
+    keys = [_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,87 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    """Encode nilai kolom urutan menjadi cursor opaque (base64url tanpa padding)."""
+    payload = json.dumps([str(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, fields):
+    """
+    Decode cursor menjadi nilai kolom urutan, masing-masing dikonversi dengan to_python() field-nya
+    supaya nilai rusak (mis. UUID atau desimal tidak valid) menjadi InvalidCursor, bukan error database.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor)
+
+    if not isinstance(values, list) or len(values) != len(fields) or not all(isinstance(value, str) for value in values):
+        raise InvalidCursor(cursor)
+    try:
+        return [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+
+
+def ordering_fields(queryset, ordering):
+    """Field untuk tiap nama di ordering: output_field anotasi (mis. search_rank) atau field model."""
+    fields = []
+    for name in ordering:
+        name = name.lstrip('-')
+        annotation = queryset.query.annotations.get(name)
+        fields.append(annotation.output_field if annotation is not None else queryset.model._meta.get_field(name))
+    return fields
+
+
+def keyset_filter(ordering, values):
+    """
+    Q untuk baris sesudah posisi cursor menurut ordering, mis. ('price', 'id') menjadi
+    price > p OR (price = p AND id > i). Field berawalan '-' diurutkan menurun.
+    """
+    condition = Q()
+    for index, field in enumerate(ordering):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        clause = Q(**{f'{field.lstrip("-")}__{lookup}': values[index]})
+        for previous_field, previous_value in zip(ordering[:index], values[:index]):
+            clause &= Q(**{previous_field.lstrip('-'): previous_value})
+        condition |= clause
+
+    # Batas inklusif pada field pertama (redundan secara logika) supaya planner bisa seek di index,
+    # bukan scan dari awal index lalu memfilter OR di atas
+    first = ordering[0]
+    bound = 'lte' if first.startswith('-') else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{bound}': values[0]}) & condition
+
+
+def cursor_for(obj, ordering):
+    return encode_cursor([getattr(obj, field.lstrip('-')) for field in ordering])
+
+
+def keyset_page(queryset, ordering, cursor=None, page_size=20):
+    """
+    Ambil satu halaman dengan keyset pagination: satu range scan tanpa COUNT maupun OFFSET.
+    Field terakhir di ordering harus unik (biasanya id). Return (items, next_cursor);
+    next_cursor None jika tidak ada halaman berikutnya. Raise InvalidCursor jika cursor rusak.
+    """
+    queryset = queryset.order_by(*ordering)
+    if cursor:
+        values = decode_cursor(cursor, ordering_fields(queryset, ordering))
+        queryset = queryset.filter(keyset_filter(ordering, values))
+
+    items = list(queryset[:page_size + 1])
+    if len(items) <= page_size:
+        return items, None
+    items = items[:page_size]
+    return items, cursor_for(items[-1], ordering)
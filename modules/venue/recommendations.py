@@ -0,0 +1,133 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+
+from modules.booking.models import Booking
+from modules.review.models import Review
+from modules.venue.leaderboard import card_payload, top_venues
+from modules.venue.models import Venue, VenueNeighbour
+
+# Bobot interaksi: satu booking bernilai 1, review bernilai sampai 2 sesuai ratingnya (rating / 5 * 2)
+BOOKING_WEIGHT = 1.0
+REVIEW_WEIGHT = 2.0
+# Interaksi terberat per user yang dipakai saat self-join, supaya satu akun yang sangat aktif
+# tidak membuat jumlah pasangan venue meledak
+MAX_ITEMS_PER_USER = 200
+# Jumlah venue terakhir dari riwayat user yang dipakai saat request
+HISTORY_SIZE = 20
+
+
+def interaction_frame():
+    """DataFrame (user, venue, weight): jumlah bobot booking dan review per pasangan user-venue."""
+    bookings = pd.DataFrame.from_records(
+        Booking.objects.order_by().values_list('user_id', 'venue_id').iterator(), columns=['user', 'venue']
+    )
+    bookings['weight'] = BOOKING_WEIGHT
+    reviews = pd.DataFrame.from_records(
+        Review.objects.order_by().values_list('user_id', 'venue_id', 'rating').iterator(),
+        columns=['user', 'venue', 'rating'],
+    )
+    reviews['weight'] = reviews['rating'].astype(float) / 5 * REVIEW_WEIGHT
+
+    frame = pd.concat([bookings, reviews[['user', 'venue', 'weight']]], ignore_index=True)
+    return frame.groupby(['user', 'venue'], as_index=False, sort=False)['weight'].sum()
+
+
+def compute_neighbours(frame, k, max_items_per_user=MAX_ITEMS_PER_USER):
+    """
+    Cosine similarity item-item dari matriks user x venue yang jarang (sparse), tanpa membentuk
+    matriks penuh: dot product tiap pasangan venue dihitung lewat self-join interaksi per user.
+    Return DataFrame (venue, neighbour, rank, score) berisi maksimal k tetangga per venue.
+    """
+    columns = ['venue', 'neighbour', 'rank', 'score']
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, venues = pd.factorize(frame['venue'])
+    data = pd.DataFrame({'user': frame['user'].to_numpy(), 'item': codes, 'weight': frame['weight'].to_numpy(float)})
+    data = data.sort_values(['user', 'weight'], ascending=[True, False])
+    data = data[data.groupby('user').cumcount() < max_items_per_user]
+
+    norms = np.sqrt(np.bincount(data['item'], weights=data['weight'] ** 2, minlength=len(venues)))
+    pairs = data.merge(data, on='user', suffixes=('_a', '_b'))
+    pairs = pairs[pairs['item_a'] != pairs['item_b']]
+    pairs = pairs.assign(product=pairs['weight_a'] * pairs['weight_b'])
+    dots = pairs.groupby(['item_a', 'item_b'], as_index=False, sort=False)['product'].sum()
+
+    dots['score'] = dots['product'] / (norms[dots['item_a']] * norms[dots['item_b']])
+    dots = dots.sort_values(['item_a', 'score', 'item_b'], ascending=[True, False, True])
+    dots['rank'] = dots.groupby('item_a').cumcount() + 1
+    top = dots[dots['rank'] <= k]
+
+    return pd.DataFrame({
+        'venue': venues[top['item_a'].to_numpy()],
+        'neighbour': venues[top['item_b'].to_numpy()],
+        'rank': top['rank'].to_numpy(),
+        'score': top['score'].to_numpy(),
+    }, columns=columns)
+
+
+def store_neighbours(neighbours, batch_size=5000):
+    """Ganti seluruh isi VenueNeighbour dalam satu transaksi. Return jumlah baris."""
+    with transaction.atomic():
+        VenueNeighbour.objects.all().delete()
+        VenueNeighbour.objects.bulk_create(
+            [
+                VenueNeighbour(venue_id=venue, neighbour_id=neighbour, rank=int(rank), score=float(score))
+                for venue, neighbour, rank, score in neighbours.itertuples(index=False)
+            ],
+            batch_size=batch_size,
+        )
+    return len(neighbours)
+
+
+def personal_recommendations(user, limit):
+    """
+    Rekomendasi dari tetangga venue yang pernah dibooking/direview user. Biayanya dibatasi HISTORY_SIZE
+    dan jumlah tetangga per venue, bukan ukuran katalog atau jumlah user.
+    Return (payload kartu venue, set venue id di riwayat user).
+    """
+    history = set(
+        Booking.objects.filter(user=user).order_by('-created_at').values_list('venue_id', flat=True)[:HISTORY_SIZE]
+    )
+    history.update(
+        Review.objects.filter(user=user).order_by('-created_at').values_list('venue_id', flat=True)[:HISTORY_SIZE]
+    )
+    if not history:
+        return [], history
+
+    scores = defaultdict(float)
+    for neighbour_id, score in VenueNeighbour.objects.filter(venue_id__in=history).values_list('neighbour_id', 'score'):
+        if neighbour_id not in history:
+            scores[neighbour_id] += score
+    ranked = sorted(scores, key=lambda pk: (-scores[pk], pk.hex))[:limit]
+    venues = Venue.objects.card().in_bulk(ranked)
+    return [card_payload(venues[pk]) for pk in ranked if pk in venues], history
+
+
+def recommend_venues(user, limit):
+    """
+    Rekomendasi personal, dilengkapi dari leaderboard global jika kurang (user baru, anonim, atau
+    tetangga belum dihitung). Return (payload, source) dengan source 'personal', 'mixed', atau 'leaderboard'.
+    """
+    venues, history = personal_recommendations(user, limit) if user.is_authenticated else ([], set())
+    personal_count = len(venues)
+
+    if personal_count < limit:
+        exclude = history | {venue['id'] for venue in venues}
+        for venue in top_venues(settings.VENUE_LEADERBOARD_SIZE):
+            if len(venues) >= limit:
+                break
+            if venue['id'] not in exclude:
+                venues.append(venue)
+
+    if personal_count == 0:
+        source = 'leaderboard'
+    elif personal_count < len(venues):
+        source = 'mixed'
+    else:
+        source = 'personal'
+    return venues, source
@@ -0,0 +1,138 @@
+import functools
+import hashlib
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import parse_etags, urlencode
+
+KEY_PREFIX = 'venue:cache'
+CATALOG = 'catalog'
+EVENTS = ('hits', 'misses', 'not_modified')
+
+# Nama view yang di-cache, untuk laporan statistik
+CACHED_VIEWS = []
+
+
+def venue_scope(venue_id):
+    return f'venue:{uuid.UUID(str(venue_id)).hex}'
+
+
+def get_version(scope):
+    key = f'{KEY_PREFIX}:version:{scope}'
+    version = cache.get(key)
+    if version is None:
+        # Nilai awal berbasis waktu supaya version baru tidak bertabrakan dengan entry lama
+        # kalau key version ini sempat ter-evict
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_scopes(scopes):
+    for scope in scopes:
+        get_version(scope)
+        try:
+            cache.incr(f'{KEY_PREFIX}:version:{scope}')
+        except ValueError:
+            pass
+
+
+def bump_versions(venue_id=None):
+    """
+    Tandai katalog (dan satu venue jika diberikan) berubah. Version dinaikkan sekarang dan sekali
+    lagi sesudah commit, karena request yang membaca data sebelum commit bisa saja sudah mengisi
+    cache di bawah version yang pertama.
+    """
+    scopes = [CATALOG] if venue_id is None else [CATALOG, venue_scope(venue_id)]
+    bump_scopes(scopes)
+    transaction.on_commit(lambda: bump_scopes(scopes))
+
+
+def record(name, event):
+    key = f'{KEY_PREFIX}:stats:{name}:{event}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def cache_stats():
+    """Jumlah hit, miss, dan 304 per view beserta hit ratio (304 dihitung sebagai hit)."""
+    keys = {f'{KEY_PREFIX}:stats:{name}:{event}': (name, event) for name in CACHED_VIEWS for event in EVENTS}
+    counts = cache.get_many(list(keys))
+    stats = {name: dict.fromkeys(EVENTS, 0) for name in CACHED_VIEWS}
+    for key, value in counts.items():
+        name, event = keys[key]
+        stats[name][event] = value
+    for counters in stats.values():
+        total = sum(counters[event] for event in EVENTS)
+        counters['hit_ratio'] = round((counters['hits'] + counters['not_modified']) / total, 4) if total else None
+    return stats
+
+
+def cached_response(name, scopes=None, vary_on_auth=False, timeout=None, store_body=True):
+    """
+    Cache response GET sebuah view di cache Django, dikunci dengan version katalog/venue.
+    scopes(request, *args, **kwargs) mengembalikan daftar scope; default hanya katalog.
+    ETag diturunkan dari version, sehingga If-None-Match bisa dijawab 304 tanpa query maupun
+    membaca body dari cache. Hanya response 200 yang disimpan. Body StreamingHttpResponse tidak
+    pernah disimpan (mengumpulkannya membuat memori tumbuh seukuran katalog); view yang streaming
+    memakai store_body=False sehingga hanya jalur ETag/304 yang aktif.
+    """
+    CACHED_VIEWS.append(name)
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            versions = '-'.join(
+                str(get_version(scope)) for scope in (scopes(request, *args, **kwargs) if scopes else [CATALOG])
+            )
+            variant = ('auth' if request.user.is_authenticated else 'anon') if vary_on_auth else 'all'
+            # Payload API memuat URL thumbnail absolut dari host request (thumbnails.absolute_thumbnail_url)
+            variant = f'{variant}-{hashlib.md5(request.get_host().encode()).hexdigest()[:8]}'
+            if request.GET:
+                query = urlencode(sorted(request.GET.lists()), doseq=True)
+                variant = f'{variant}-{hashlib.md5(query.encode()).hexdigest()[:12]}'
+            etag = f'"{name}-{versions}-{variant}"'
+
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                record(name, 'not_modified')
+                response = HttpResponseNotModified()
+                response['ETag'] = etag
+                return response
+
+            key = f'{KEY_PREFIX}:response:{name}:{versions}:{variant}'
+            cached = cache.get(key) if store_body else None
+            if cached is not None:
+                record(name, 'hits')
+                content_type, body = cached
+                response = HttpResponse(body, content_type=content_type)
+                response['X-Cache'] = 'HIT'
+            else:
+                record(name, 'misses')
+                response = view(request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+                if store_body and not response.streaming:
+                    cache.set(
+                        key, (response['Content-Type'], response.content), timeout or settings.VENUE_RESPONSE_CACHE_TIMEOUT
+                    )
+                response['X-Cache'] = 'MISS'
+
+            response['ETag'] = etag
+            # Client boleh menyimpan response, tapi harus revalidasi (If-None-Match) setiap kali
+            patch_cache_control(response, no_cache=True)
+            if vary_on_auth:
+                patch_vary_headers(response, ['Cookie'])
+            return response
+        return wrapper
+    return decorator
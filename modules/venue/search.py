@@ -0,0 +1,179 @@
+import re
+import uuid
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, FloatField, IntegerField, Q, Value, When
+
+from modules.venue.models import Venue
+
+# Kolom yang diindeks beserta bobotnya: nama paling penting, lalu kota dan klub, lalu deskripsi
+SEARCH_FIELDS = ('name', 'city', 'home_teams', 'description')
+POSTGRES_WEIGHTS = {'name': 'A', 'city': 'B', 'home_teams': 'B', 'description': 'C'}
+BM25_WEIGHTS = {'name': 10.0, 'city': 5.0, 'home_teams': 5.0, 'description': 1.0}
+
+FTS_TABLE = 'venue_venue_fts'
+SEARCH_VECTOR_INDEX = 'venue_search_vector_idx'
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text):
+    return [token.lower() for token in TOKEN_PATTERN.findall(text or '')]
+
+
+class BaseSearchBackend:
+    """
+    search() mengembalikan queryset yang sudah difilter ke venue yang cocok dan
+    diberi anotasi search_rank (semakin besar semakin relevan).
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def index_venue(self, venue):
+        pass
+
+    def remove_venue(self, venue_id):
+        pass
+
+    def rebuild(self):
+        # Index dipelihara database sendiri (atau tidak ada index terpisah), cukup laporkan jumlahnya
+        return Venue.objects.count()
+
+
+class BasicSearchBackend(BaseSearchBackend):
+    """Fallback tanpa full-text index: icontains per token dengan ranking sederhana per kolom."""
+
+    def search(self, queryset, query):
+        tokens = tokenize(query)
+        rank = Value(0.0, output_field=FloatField())
+        for token in tokens:
+            matches = Q()
+            for field in SEARCH_FIELDS:
+                matches |= Q(**{f'{field}__icontains': token})
+                rank = rank + Case(
+                    When(**{f'{field}__icontains': token}, then=Value(BM25_WEIGHTS[field])),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+            queryset = queryset.filter(matches)
+        return queryset.annotate(search_rank=rank)
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """SearchVector berbobot dengan GIN index di atas ekspresi yang sama (lihat migration 0006)."""
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        from django.db.models.functions import Cast
+
+        # Prefix matching untuk typeahead: 'gel stad' -> 'gel:* & stad:*'
+        search_query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokenize(query)), search_type='raw', config='simple'
+        )
+        vector = search_vector()
+        return queryset.annotate(
+            search_document=vector,
+            # Cast ke double precision supaya nilai rank tetap sama persis saat dipakai ulang di cursor
+            search_rank=Cast(SearchRank(vector, search_query), FloatField()),
+        ).filter(search_document=search_query)
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """Tabel virtual FTS5 yang diperbarui lewat signal save/delete Venue."""
+
+    def search(self, queryset, query):
+        match = ' '.join(f'"{token}"*' for token in tokenize(query))
+        weights = ', '.join(str(BM25_WEIGHTS[field]) for field in SEARCH_FIELDS)
+        # Filter queryset (kota, kapasitas, dst.) ikut di dalam query ranking, supaya LIMIT hanya
+        # memotong venue yang memang lolos filter
+        restrict, params = '', []
+        if queryset.query.has_filters():
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            restrict = f'AND venue_id IN ({sql}) '
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT venue_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s {restrict}'
+                f'ORDER BY bm25({FTS_TABLE}, 0, {weights}) LIMIT %s',
+                [match, *params, settings.VENUE_SEARCH_MAX_RESULTS],
+            )
+            ranked_ids = [uuid.UUID(row[0]) for row in cursor.fetchall()]
+
+        if not ranked_ids:
+            return queryset.none().annotate(search_rank=Value(0, output_field=IntegerField()))
+        total = len(ranked_ids)
+        return queryset.filter(pk__in=ranked_ids).annotate(search_rank=Case(
+            *[When(pk=pk, then=Value(total - position)) for position, pk in enumerate(ranked_ids)],
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+
+    def index_venue(self, venue):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE venue_id = %s', [venue.pk.hex])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (venue_id, {", ".join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s)',
+                [venue.pk.hex, *(getattr(venue, field) or '' for field in SEARCH_FIELDS)],
+            )
+
+    def remove_venue(self, venue_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE venue_id = %s', [uuid.UUID(str(venue_id)).hex])
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            populate_fts_table(cursor)
+            cursor.execute(f'SELECT COUNT(*) FROM {FTS_TABLE}')
+            return cursor.fetchone()[0]
+
+
+def search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field in SEARCH_FIELDS:
+        part = SearchVector(field, weight=POSTGRES_WEIGHTS[field], config='simple')
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def create_fts_table(cursor):
+    cursor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5('
+        f'venue_id UNINDEXED, {", ".join(SEARCH_FIELDS)}, '
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+    )
+
+
+def populate_fts_table(cursor):
+    columns = ', '.join(SEARCH_FIELDS)
+    cursor.execute(f'DELETE FROM {FTS_TABLE}')
+    cursor.execute(
+        f'INSERT INTO {FTS_TABLE} (venue_id, {columns}) SELECT id, {columns} FROM {Venue._meta.db_table}'
+    )
+
+
+def fts_table_exists():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        return cursor.fetchone() is not None
+
+
+_backends = {}
+
+
+def get_search_backend():
+    """Pilih backend sesuai database default; hasilnya disimpan per vendor."""
+    vendor = connection.vendor
+    if vendor not in _backends:
+        if vendor == 'postgresql':
+            _backends[vendor] = PostgresSearchBackend()
+        elif vendor == 'sqlite' and fts_table_exists():
+            _backends[vendor] = SQLiteSearchBackend()
+        else:
+            return BasicSearchBackend()
+    return _backends[vendor]
+
+
+def is_search_update(update_fields):
+    return update_fields is None or any(field in update_fields for field in SEARCH_FIELDS)
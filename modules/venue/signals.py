@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from modules.venue.leaderboard import invalidate_leaderboards
+from modules.venue.models import Venue
+from modules.venue.ownership import invalidate_ownership, venue_owners
+from modules.venue.response_cache import bump_versions
+from modules.venue.search import get_search_backend, is_search_update
+
+
+@receiver(post_save, sender=Venue)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Simpan yang hanya mengubah kolom lain (mis. rating) tidak perlu menyentuh index
+    if raw or not is_search_update(update_fields):
+        return
+    get_search_backend().index_venue(instance)
+
+
+@receiver(post_delete, sender=Venue)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove_venue(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Venue)
+def invalidate_cached_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_versions(instance.pk)
+        # Board menyimpan data kartu venue, jadi perubahan apa pun pada venue membuang semua board
+        invalidate_leaderboards()
+
+
+@receiver(post_save, sender=Venue)
+def update_ownership_index(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Simpan yang tidak menyentuh owner (mis. agregat rating) tidak mengubah kepemilikan
+    if raw or (not created and update_fields is not None and 'owner' not in update_fields):
+        return
+    invalidate_ownership(*venue_owners(instance))
+
+
+@receiver(post_delete, sender=Venue)
+def remove_from_ownership_index(sender, instance, **kwargs):
+    invalidate_ownership(instance.owner_id)
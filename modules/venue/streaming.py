@@ -0,0 +1,39 @@
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+
+def iter_json_array(items, prefix='', suffix='', chunk_size=None):
+    """
+    Yield potongan JSON array dari iterable dict, beberapa item sekaligus.
+    Hasil gabungannya identik byte-per-byte dengan json.dumps(list(items)) milik JsonResponse.
+    """
+    chunk_size = chunk_size or settings.VENUE_STREAM_CHUNK_SIZE
+    buffer = [prefix + '[']
+    separator = ''
+    for item in items:
+        buffer.append(separator + json.dumps(item, cls=DjangoJSONEncoder))
+        separator = ', '
+        if len(buffer) >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+    buffer.append(']' + suffix)
+    yield ''.join(buffer)
+
+
+def streaming_json_response(items, envelope=None, key=None, **kwargs):
+    """
+    StreamingHttpResponse untuk list JSON yang besar.
+    Jika envelope diberikan, items di-stream sebagai nilai envelope[key], mis.
+    streaming_json_response(venues, {'success': True, 'venues': None}, 'venues').
+    """
+    prefix = suffix = ''
+    if envelope is not None:
+        placeholder = f'{json.dumps(key)}: []'
+        encoded = json.dumps({**envelope, key: []}, cls=DjangoJSONEncoder)
+        head, tail = encoded.split(placeholder, 1)
+        prefix = f'{head}{json.dumps(key)}: '
+        suffix = tail
+    return StreamingHttpResponse(iter_json_array(items, prefix, suffix), content_type='application/json', **kwargs)
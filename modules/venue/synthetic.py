@@ -0,0 +1,52 @@
+import random
+from decimal import Decimal
+
+from modules.venue.models import Venue
+
+COUNTRIES = ['Indonesia', 'Malaysia', 'Thailand', 'Vietnam', 'Japan', 'Brazil', 'Spain', 'Germany', 'England', 'Italy']
+NAME_PREFIXES = ['Stadion', 'Arena', 'Lapangan', 'Gelora', 'Sport Center', 'Stadium', 'Field', 'Park']
+NAME_WORDS = ['Merdeka', 'Garuda', 'Nusantara', 'Harapan', 'Utama', 'Bintang', 'Jaya', 'Sakti', 'Mandala', 'Patriot']
+
+
+def synthetic_cities(count=300):
+    """Daftar (city, country) buatan. Kota di awal daftar lebih sering dipakai (distribusi miring)."""
+    return [(f'Kota {i:03d}', COUNTRIES[i % len(COUNTRIES)]) for i in range(count)]
+
+
+def build_venues(count, seed=0, owners=None, cities=None, start=0):
+    """
+    Yield instance Venue (belum disimpan) dengan data acak yang deterministik untuk seed yang sama.
+    start menggeser nomor di nama venue supaya pemanggilan berikutnya tidak bentrok dengan natural key.
+    """
+    rng = random.Random(seed)
+    cities = cities or synthetic_cities()
+    # Bobot 1/rank: segelintir kota besar punya banyak venue, sisanya sedikit
+    weights = [1 / (rank + 1) for rank in range(len(cities))]
+    for i in range(start, start + count):
+        city, country = rng.choices(cities, weights)[0]
+        yield Venue(
+            name=f'{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_WORDS)} {city} {i}',
+            city=city,
+            country=country,
+            home_teams='',
+            capacity=rng.randint(500, 90000),
+            price=Decimal(rng.randint(1000, 10000)) * 1000,
+            rating=Decimal(rng.randint(0, 50)) / 10,
+            owner=rng.choice(owners) if owners else None,
+        )
+
+
+def generate_venues(count, seed=0, batch_size=5000, owners=None):
+    """Simpan venue sintetis ke database per batch. Return jumlah venue yang dibuat."""
+    batch = []
+    created = 0
+    for venue in build_venues(count, seed, owners):
+        batch.append(venue)
+        if len(batch) >= batch_size:
+            Venue.objects.bulk_create(batch)
+            created += len(batch)
+            batch = []
+    if batch:
+        Venue.objects.bulk_create(batch)
+        created += len(batch)
+    return created
@@ -1,10 +1,35 @@
+import base64
+import hashlib
 import json
-from django.test import TestCase, Client
+import os
+import shutil
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.http import JsonResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from .models import Venue
+import pandas as pd
+from .models import CARD_DESCRIPTION_LENGTH, Venue, VenueNeighbour
+from .recommendations import compute_neighbours
+from .views import get_recommended_detail_api
+from modules.booking.models import Booking
+from modules.review.models import Review
 from .forms import VenueForm
+from .importer import clean_chunk, price_for, read_chunks
+from .leaderboard import top_venues
+from .ownership import owned_venue_ids
+from .pagination import encode_cursor
+from .search import BasicSearchBackend, get_search_backend
+from .thumbnails import store_thumbnail
 import uuid
+from lapangin.testing import QueryBudgetMixin, create_catalog
 
 User = get_user_model()
 
@@ -391,4 +416,972 @@ class VenueTest(TestCase):
         
         self.assertEqual(len(data_page2['venues']), 1) # Sisa 1 dari total 19
         self.assertFalse(data_page2['has_next_page'])
-        self.assertEqual(data_page2['current_page'], 2)
\ No newline at end of file
+        self.assertEqual(data_page2['current_page'], 2)
+
+TINY_PNG = base64.b64decode(
+    'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=='
+)
+
+
+class VenueThumbnailStorageTest(TestCase):
+
+    def setUp(self):
+        self.thumbnail_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.thumbnail_dir, ignore_errors=True)
+        settings_override = override_settings(THUMBNAIL_ROOT=self.thumbnail_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.data_uri = 'data:image/png;base64,' + base64.b64encode(TINY_PNG).decode()
+        self.digest = hashlib.sha256(TINY_PNG).hexdigest()
+
+    def test_save_moves_data_uri_to_storage(self):
+        """Thumbnail data URI disimpan sebagai file dan kolom hanya berisi URL pendek."""
+        venue = Venue.objects.create(
+            name='Stadion Thumbnail', city='Jakarta', country='Indonesia',
+            capacity=100, price=100, thumbnail=self.data_uri
+        )
+        venue.refresh_from_db()
+
+        self.assertEqual(venue.thumbnail, reverse('venue:thumbnail', args=[f'{self.digest}.png']))
+        with open(os.path.join(self.thumbnail_dir, f'{self.digest}.png'), 'rb') as f:
+            self.assertEqual(f.read(), TINY_PNG)
+
+    def test_same_image_is_stored_once(self):
+        """Gambar yang sama menghasilkan URL yang sama dan satu file saja."""
+        first = store_thumbnail(self.data_uri)
+        second = store_thumbnail(self.data_uri)
+
+        self.assertEqual(first, second)
+        self.assertEqual(os.listdir(self.thumbnail_dir), [f'{self.digest}.png'])
+
+    def test_plain_url_is_left_untouched(self):
+        """URL biasa tidak diubah."""
+        self.assertEqual(store_thumbnail('https://example.com/a.jpg'), 'https://example.com/a.jpg')
+        self.assertEqual(store_thumbnail(''), '')
+
+    def test_serve_thumbnail_with_cache_headers(self):
+        """Thumbnail diserve dengan Cache-Control jangka panjang dan ETag."""
+        url = store_thumbnail(self.data_uri)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(b''.join(response.streaming_content), TINY_PNG)
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=31536000', response['Cache-Control'])
+
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_api_payload_has_loadable_absolute_url(self):
+        """Payload API berisi URL thumbnail absolut yang bisa dimuat langsung oleh client."""
+        venue = Venue.objects.create(
+            name='Stadion Absolut', city='Jakarta', country='Indonesia',
+            capacity=100, price=100, thumbnail=self.data_uri
+        )
+        response = self.client.get(reverse('venue:get_venue_detail_api', args=[venue.id]))
+        url = response.json()['venue']['thumbnail']
+
+        self.assertEqual(url, f'http://testserver/venues/thumbnails/{self.digest}.png')
+        image = self.client.get(url)
+        self.assertEqual(image.status_code, 200)
+        self.assertEqual(b''.join(image.streaming_content), TINY_PNG)
+
+    @override_settings(THUMBNAIL_BASE_URL='https://cdn.example.com/')
+    def test_api_payload_uses_thumbnail_base_url(self):
+        """THUMBNAIL_BASE_URL menggantikan host request; URL eksternal tidak diubah."""
+        stored = Venue.objects.create(
+            name='Stadion CDN', city='Jakarta', country='Indonesia',
+            capacity=100, price=100, thumbnail=self.data_uri
+        )
+        external = Venue.objects.create(
+            name='Stadion Eksternal', city='Jakarta', country='Indonesia',
+            capacity=100, price=100, thumbnail='https://example.com/a.jpg'
+        )
+
+        stored_url = self.client.get(reverse('venue:get_venue_detail_api', args=[stored.id])).json()['venue']['thumbnail']
+        external_url = self.client.get(reverse('venue:get_venue_detail_api', args=[external.id])).json()['venue']['thumbnail']
+
+        self.assertEqual(stored_url, f'https://cdn.example.com/venues/thumbnails/{self.digest}.png')
+        self.assertEqual(external_url, 'https://example.com/a.jpg')
+
+    def test_absolute_url_is_stored_as_path(self):
+        """URL absolut yang dikirim balik client saat edit disimpan lagi sebagai path relatif."""
+        path = store_thumbnail(self.data_uri)
+
+        self.assertEqual(store_thumbnail(f'http://testserver{path}'), path)
+        self.assertEqual(store_thumbnail(f'https://cdn.example.com{path}'), path)
+
+    def test_serve_thumbnail_not_found(self):
+        """Nama file tidak valid atau tidak ada menghasilkan 404."""
+        missing = self.client.get(reverse('venue:thumbnail', args=['0' * 64 + '.jpg']))
+        invalid = self.client.get(reverse('venue:thumbnail', args=['..secret.jpg']))
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(invalid.status_code, 404)
+
+
+class VenueProjectionQueryTest(TestCase):
+    """Endpoint list tidak boleh memuat kolom teks besar milik Venue."""
+
+    HEAVY_COLUMNS = ('description', 'facilities', 'rules', 'home_teams')
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='booker', password='password123')
+        self.venue = Venue.objects.create(
+            name='Stadion Proyeksi', city='Bandung', country='Indonesia',
+            capacity=1000, price=100, rating=4.0,
+            description='x' * 5000, facilities='Parkir', rules='Dilarang merokok', home_teams='Persib'
+        )
+        Booking.objects.create(user=self.user, venue=self.venue, booking_date=date.today() + timedelta(days=3))
+
+    def assertNoHeavyColumns(self, queries):
+        venue_table = Venue._meta.db_table
+        for query in queries:
+            sql = query['sql']
+            if f'"{venue_table}"' not in sql:
+                continue
+            for column in self.HEAVY_COLUMNS:
+                column_sql = f'"{venue_table}"."{column}"'
+                # description hanya boleh muncul di dalam SUBSTR (description_excerpt)
+                remaining = sql.replace(f'SUBSTR({column_sql}', '')
+                self.assertNotIn(column_sql, remaining, f'Kolom {column} ikut di-SELECT:\n{sql}')
+
+    def get_with_queries(self, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, data or {})
+        self.assertEqual(response.status_code, 200)
+        self.assertNoHeavyColumns(ctx.captured_queries)
+        return response
+
+    def test_search_venues_api_projection(self):
+        response = self.get_with_queries(reverse('venue:search_venues_api'))
+        venue_data = response.json()['venues'][0]
+        self.assertEqual(venue_data['description'], 'x' * CARD_DESCRIPTION_LENGTH)
+        self.assertEqual(venue_data['description_excerpt'], 'x' * CARD_DESCRIPTION_LENGTH)
+
+    def test_search_venues_api_full_description_opt_in(self):
+        """?include=description memuat description utuh satu kali, tanpa kolom berat lainnya."""
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('venue:search_venues_api'), {'include': 'description'})
+        venue_data = response.json()['venues'][0]
+
+        self.assertEqual(venue_data['description'], 'x' * 5000)
+        self.assertEqual(venue_data['description_excerpt'], 'x' * CARD_DESCRIPTION_LENGTH)
+        select = next(query['sql'] for query in ctx.captured_queries if 'SUBSTR' in query['sql'])
+        for column in ('facilities', 'rules', 'home_teams'):
+            self.assertNotIn(f'"{Venue._meta.db_table}"."{column}"', select)
+
+    def test_recommended_venues_api_projection(self):
+        response = self.get_with_queries(reverse('venue:recommended_venue'))
+        self.assertEqual(response.json()['venues'][0]['stadium'], 'Stadion Proyeksi')
+
+    def test_recommended_detail_api_projection(self):
+        request = RequestFactory().get('/')
+        with CaptureQueriesContext(connection) as ctx:
+            response = get_recommended_detail_api(request)
+        self.assertEqual(response.status_code, 200)
+        self.assertNoHeavyColumns(ctx.captured_queries)
+
+    def test_user_bookings_api_projection(self):
+        self.client.login(username='booker', password='password123')
+        response = self.get_with_queries(reverse('booking:get_user_bookings_api'))
+        self.assertEqual(response.json()['bookings'][0]['venue_name'], 'Stadion Proyeksi')
+
+    def test_flutter_user_bookings_projection(self):
+        self.client.login(username='booker', password='password123')
+        response = self.get_with_queries(reverse('booking:flutter_get_user_bookings'))
+        self.assertEqual(response.json()['data']['total_bookings'], 1)
+
+
+class VenueStreamingJsonTest(TestCase):
+    """Katalog JSON di-stream tetapi isinya harus sama persis dengan JsonResponse."""
+
+    def setUp(self):
+        self.venues = [
+            Venue.objects.create(
+                name=f'Stadion "{i}"', city='Surabaya', country='Indonesia', capacity=1000 + i,
+                price=100 + i, rating=3.5, description='Deskripsi ü' if i % 2 else '', facilities='Parkir'
+            )
+            for i in range(7)
+        ]
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    @override_settings(VENUE_STREAM_CHUNK_SIZE=3)
+    def test_show_json_matches_json_response(self):
+        expected = JsonResponse([
+            {
+                'id': venue.id,
+                'stadium': venue.name,
+                'city': venue.city,
+                'country': venue.country,
+                'capacity': venue.capacity,
+                'price': venue.price,
+                'thumbnail': venue.thumbnail if venue.thumbnail else '',
+                'rating': venue.rating,
+                'description': venue.description or "Deskripsi tidak tersedia.",
+                'facilities': venue.facilities or "",
+                'rules': venue.rules or "",
+            }
+            for venue in Venue.objects.all()
+        ], safe=False)
+
+        response = self.client.get(reverse('venue:show_json'))
+
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(self.read(response), expected.content)
+
+    @override_settings(VENUE_STREAM_CHUNK_SIZE=2)
+    def test_get_venues_api_matches_json_response(self):
+        expected = JsonResponse({
+            'success': True,
+            'venues': [
+                {
+                    'id': venue.id,
+                    'stadium': venue.name,
+                    'city': venue.city,
+                    'country': venue.country,
+                    'capacity': venue.capacity,
+                    'price': venue.price,
+                    'thumbnail': venue.thumbnail if venue.thumbnail else '',
+                    'rating': venue.rating,
+                    'facilities': venue.facilities or "",
+                    'rules': venue.rules or "",
+                    'url_detail': reverse('venue:venue_detail', args=[venue.id]),
+                }
+                for venue in Venue.objects.all()
+            ],
+            'message': 'Venue berhasil dimuat.'
+        })
+
+        response = self.client.get(reverse('venue:get_venues_api'))
+
+        self.assertEqual(self.read(response), expected.content)
+
+    def test_empty_catalog(self):
+        Venue.objects.all().delete()
+
+        self.assertEqual(self.read(self.client.get(reverse('venue:show_json'))), b'[]')
+        self.assertEqual(
+            json.loads(self.read(self.client.get(reverse('venue:get_venues_api')))),
+            {'success': True, 'venues': [], 'message': 'Venue berhasil dimuat.'}
+        )
+
+
+class VenueCursorPaginationTest(TestCase):
+    """Keyset pagination (price, id) untuk search_venues_api."""
+
+    def setUp(self):
+        # Harga sengaja banyak yang sama supaya pemecah seri id ikut diuji
+        for i in range(40):
+            Venue.objects.create(
+                name=f'Venue {i}', city='Semarang', country='Indonesia', capacity=5000, price=100 + (i % 7)
+            )
+        self.url = reverse('venue:search_venues_api')
+
+    def walk(self, params):
+        seen = []
+        cursor = ''
+        while True:
+            with CaptureQueriesContext(connection) as ctx:
+                data = self.client.get(self.url, {**params, 'cursor': cursor}).json()
+            self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+            self.assertNotIn('total_pages', data)
+            seen.extend(venue['id'] for venue in data['venues'])
+            if not data['has_next_page']:
+                self.assertIsNone(data['next_cursor'])
+                return seen
+            cursor = data['next_cursor']
+
+    def test_cursor_low_to_high(self):
+        expected = [str(pk) for pk in Venue.objects.order_by('price', 'id').values_list('id', flat=True)]
+        self.assertEqual(self.walk({}), expected)
+
+    def test_cursor_high_to_low_with_filter(self):
+        expected = [
+            str(pk) for pk in
+            Venue.objects.filter(price__gte=103).order_by('-price', '-id').values_list('id', flat=True)
+        ]
+        Venue.objects.filter(price__lt=103).update(capacity=10)
+        self.assertEqual(self.walk({'sort': 'highToLow', 'capacity_min': 100}), expected)
+
+    def test_page_mode_still_works_and_returns_cursor(self):
+        first = self.client.get(self.url).json()
+        self.assertEqual(first['current_page'], 1)
+        self.assertEqual(first['total_pages'], 3)
+
+        second_by_page = self.client.get(self.url, {'page': 2}).json()
+        second_by_cursor = self.client.get(self.url, {'cursor': first['next_cursor']}).json()
+        self.assertEqual(second_by_page['venues'], second_by_cursor['venues'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'bukan-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_cursor_with_invalid_values(self):
+        """Cursor yang decode-nya valid tapi nilainya bukan desimal/UUID ditolak 400, bukan error database."""
+        for values in (['abc', 'def'], ['1', 'zzz']):
+            with self.subTest(values=values):
+                response = self.client.get(self.url, {'cursor': encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+
+
+class ExplainVenueQueriesCommandTest(TestCase):
+
+    def test_command_reports_plans_and_rolls_back(self):
+        venue_count = Venue.objects.count()
+        out = StringIO()
+
+        call_command('explain_venue_queries', venues=200, repeat=1, allow_destructive=True, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('SEBELUM index', output)
+        self.assertIn('SESUDAH index', output)
+        self.assertIn('venue_price_id_idx', output)
+        self.assertEqual(Venue.objects.count(), venue_count)
+
+    def test_command_refuses_without_debug_or_flag(self):
+        with self.assertRaises(CommandError):
+            call_command('explain_venue_queries', venues=10, repeat=1, stdout=StringIO())
+        self.assertEqual(Venue.objects.count(), 0)
+
+
+class VenueFullTextSearchTest(TestCase):
+    """Parameter q di search_venues_api: ranking relevansi, prefix, dan index yang ikut berubah."""
+
+    def setUp(self):
+        self.gelora = Venue.objects.create(
+            name='Gelora Bung Karno', city='Jakarta', country='Indonesia', capacity=77000, price=500,
+            home_teams='Persija', description='Stadion nasional.'
+        )
+        self.kanjuruhan = Venue.objects.create(
+            name='Kanjuruhan', city='Malang', country='Indonesia', capacity=42000, price=300,
+            home_teams='Arema', description='Dekat dengan Gelora lama.'
+        )
+        self.anfield = Venue.objects.create(
+            name='Anfield', city='Liverpool', country='England', capacity=54000, price=900,
+            home_teams='Liverpool FC', description='Markas Liverpool.'
+        )
+        self.url = reverse('venue:search_venues_api')
+
+    def search(self, q, **params):
+        return [venue['stadium'] for venue in self.client.get(self.url, {'q': q, **params}).json()['venues']]
+
+    def test_name_match_ranks_above_description_match(self):
+        self.assertEqual(self.search('gelora'), ['Gelora Bung Karno', 'Kanjuruhan'])
+
+    def test_prefix_and_multiple_terms(self):
+        self.assertEqual(self.search('gel bung'), ['Gelora Bung Karno'])
+        self.assertEqual(self.search('persi'), ['Gelora Bung Karno'])
+        self.assertEqual(self.search('tidakada'), [])
+
+    def test_combines_with_filters_and_explicit_sort(self):
+        self.assertEqual(self.search('gelora', capacity_min=50000), ['Gelora Bung Karno'])
+        self.assertEqual(self.search('gelora', sort='lowToHigh'), ['Kanjuruhan', 'Gelora Bung Karno'])
+
+    @override_settings(VENUE_SEARCH_MAX_RESULTS=3)
+    def test_filters_applied_before_result_limit(self):
+        # Venue Bandung lebih relevan untuk 'arena' tapi tersaring filter kota; batas hasil tidak boleh habis olehnya
+        for i in range(5):
+            Venue.objects.create(name=f'Arena Arena {i}', city='Bandung', country='Indonesia', capacity=1000, price=100)
+        Venue.objects.create(
+            name='Stadion Kota', city='Surabaya', country='Indonesia', capacity=1000, price=100, description='arena'
+        )
+        self.assertEqual(self.search('arena', city='Surabaya'), ['Stadion Kota'])
+
+    def test_index_follows_save_and_delete(self):
+        self.anfield.name = 'Goodison Park'
+        self.anfield.save()
+        self.assertEqual(self.search('anfield'), [])
+        self.assertEqual(self.search('goodison'), ['Goodison Park'])
+
+        self.gelora.delete()
+        self.assertEqual(self.search('gelora'), ['Kanjuruhan'])
+
+    def test_cursor_walks_ranked_results(self):
+        for i in range(25):
+            Venue.objects.create(
+                name=f'Arena {i}', city='Bandung', country='Indonesia', capacity=1000, price=100,
+                description='arena' if i % 2 else ''
+            )
+        seen = []
+        cursor = ''
+        while True:
+            data = self.client.get(self.url, {'q': 'arena', 'cursor': cursor}).json()
+            seen.extend(venue['id'] for venue in data['venues'])
+            if not data['has_next_page']:
+                break
+            cursor = data['next_cursor']
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+
+    def test_rebuild_command_indexes_bulk_created_venues(self):
+        Venue.objects.bulk_create([
+            Venue(name='Maracana', city='Rio', country='Brazil', capacity=78000, price=800)
+        ])
+        self.assertEqual(self.search('maracana'), [])
+
+        out = StringIO()
+        call_command('rebuild_venue_search_index', stdout=out)
+        self.assertIn('4 venue terindeks', out.getvalue())
+        self.assertEqual(self.search('maracana'), ['Maracana'])
+
+    def test_basic_backend_fallback(self):
+        results = BasicSearchBackend().search(Venue.objects.all(), 'gelora').order_by('-search_rank', 'id')
+        self.assertEqual([venue.name for venue in results], ['Gelora Bung Karno', 'Kanjuruhan'])
+
+
+class VenueResponseCacheTest(TestCase):
+    """Cache response katalog publik: version per venue, ETag/304, dan statistik hit ratio."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(username='staf', password='password123', is_staff=True)
+        self.user = User.objects.create_user(username='pengulas', password='password123')
+        self.venue = Venue.objects.create(
+            name='Stadion Cache', city='Medan', country='Indonesia', capacity=1000, price=100, rating=4.0
+        )
+        self.other = Venue.objects.create(
+            name='Stadion Lain', city='Medan', country='Indonesia', capacity=1000, price=100, rating=3.0
+        )
+        self.detail_url = reverse('venue:get_venue_detail_api', args=[self.venue.id])
+
+    def get(self, url, **headers):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, **headers)
+        if response.streaming:
+            response.content_bytes = b''.join(response.streaming_content)
+        else:
+            response.content_bytes = response.content
+        response.query_count = len(ctx.captured_queries)
+        return response
+
+    def test_second_request_is_served_from_cache(self):
+        for url in (self.detail_url, reverse('venue:recommended_venue')):
+            first = self.get(url)
+            second = self.get(url)
+            self.assertEqual(first['X-Cache'], 'MISS')
+            self.assertEqual(second['X-Cache'], 'HIT')
+            self.assertEqual(second.query_count, 0)
+            self.assertEqual(first.content_bytes, second.content_bytes)
+            self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_streaming_catalog_uses_etag_only(self):
+        # Body katalog yang di-stream tidak disimpan di cache; revalidasi tetap dijawab 304 tanpa query
+        for url in (reverse('venue:get_venues_api'), reverse('venue:show_json')):
+            first = self.get(url)
+            second = self.get(url)
+            self.assertTrue(second.streaming)
+            self.assertEqual(second['X-Cache'], 'MISS')
+            self.assertEqual(first.content_bytes, second.content_bytes)
+            self.assertEqual(first['ETag'], second['ETag'])
+            response = self.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.query_count, 0)
+
+    def test_if_none_match_returns_304(self):
+        etag = self.get(self.detail_url)['ETag']
+        response = self.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.query_count, 0)
+
+    def test_venue_save_invalidates_only_its_detail(self):
+        detail_etag = self.get(self.detail_url)['ETag']
+        other_url = reverse('venue:get_venue_detail_api', args=[self.other.id])
+        other_etag = self.get(other_url)['ETag']
+
+        self.venue.name = 'Stadion Baru'
+        self.venue.save()
+
+        response = self.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content_bytes)['venue']['stadium'], 'Stadion Baru')
+        self.assertEqual(self.get(other_url, HTTP_IF_NONE_MATCH=other_etag).status_code, 304)
+
+    def test_review_invalidates_catalog(self):
+        url = reverse('venue:recommended_venue')
+        self.assertEqual(json.loads(self.get(url).content_bytes)['venues'][0]['stadium'], 'Stadion Cache')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(venue=self.other, user=self.user, rating=5.0)
+
+        self.assertEqual(json.loads(self.get(url).content_bytes)['venues'][0]['stadium'], 'Stadion Lain')
+
+    def test_detail_varies_on_authentication(self):
+        self.assertFalse(json.loads(self.get(self.detail_url).content_bytes)['is_authenticated'])
+        self.client.login(username='pengulas', password='password123')
+        self.assertTrue(json.loads(self.get(self.detail_url).content_bytes)['is_authenticated'])
+
+    def test_stats_endpoint(self):
+        etag = self.get(self.detail_url)['ETag']
+        self.get(self.detail_url)
+        self.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        stats_url = reverse('venue:cache_stats_api')
+
+        self.assertEqual(self.client.get(stats_url).status_code, 403)
+        self.client.login(username='staf', password='password123')
+        stats = self.client.get(stats_url).json()['views']['venue_detail']
+        self.assertEqual((stats['hits'], stats['misses'], stats['not_modified']), (1, 1, 1))
+        self.assertAlmostEqual(stats['hit_ratio'], 0.6667)
+
+
+class VenueLeaderboardTest(TestCase):
+    """Leaderboard top-K di cache untuk endpoint rekomendasi, diperbarui dari jalur rating review."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f'fan{i}', password='password123') for i in range(3)]
+        self.venues = {}
+        for name, city, country, rating in [
+            ('Bandung A', 'Bandung', 'Indonesia', 4.5),
+            ('Bandung B', 'Bandung', 'Indonesia', 3.0),
+            ('Jakarta A', 'Jakarta', 'Indonesia', 4.0),
+            ('Tokyo A', 'Tokyo', 'Japan', 5.0),
+        ]:
+            self.venues[name] = Venue.objects.create(
+                name=name, city=city, country=country, capacity=1000, price=100, rating=rating
+            )
+        self.url = reverse('venue:recommended_venue')
+
+    def names(self, **params):
+        return [venue['stadium'] for venue in self.client.get(self.url, params).json()['venues']]
+
+    def review(self, venue_name, rating, user=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Review.objects.create(venue=self.venues[venue_name], user=self.users[user], rating=rating)
+
+    def test_top_n_global_city_country(self):
+        self.assertEqual(self.names(), ['Tokyo A', 'Bandung A'])
+        self.assertEqual(self.names(limit=3), ['Tokyo A', 'Bandung A', 'Jakarta A'])
+        self.assertEqual(self.names(city='Bandung'), ['Bandung A', 'Bandung B'])
+        self.assertEqual(self.names(country='Japan', limit=5), ['Tokyo A'])
+
+    def test_boards_served_without_venue_query(self):
+        self.names(city='Bandung')
+        with CaptureQueriesContext(connection) as ctx:
+            top_venues(2, city='Bandung')
+        self.assertEqual(len(ctx.captured_queries), 0)
+
+    def test_review_updates_boards_incrementally(self):
+        self.names(limit=4)
+        self.names(city='Bandung')
+
+        # Bandung B naik ke puncak lewat review (rating dihitung ulang jadi 5.0)
+        self.review('Bandung B', 5.0)
+        with CaptureQueriesContext(connection) as ctx:
+            global_board = [venue['stadium'] for venue in top_venues(4)]
+            city_board = [venue['stadium'] for venue in top_venues(2, city='Bandung')]
+        self.assertEqual(len(ctx.captured_queries), 0)
+        expected = sorted(['Bandung B', 'Tokyo A'], key=lambda name: self.venues[name].id.hex, reverse=True)
+        self.assertEqual(global_board[:2], expected)
+        self.assertEqual(city_board, ['Bandung B', 'Bandung A'])
+
+    @override_settings(VENUE_LEADERBOARD_SIZE=2)
+    def test_drop_below_bounded_board_rebuilds(self):
+        self.assertEqual(self.names(), ['Tokyo A', 'Bandung A'])
+        self.review('Tokyo A', 1.0)
+        self.assertEqual(self.names(), ['Bandung A', 'Jakarta A'])
+
+    def test_venue_edit_invalidates_boards(self):
+        self.names(city='Bandung')
+        venue = self.venues['Bandung A']
+        venue.name = 'Bandung Baru'
+        venue.save()
+        self.assertEqual(self.names(city='Bandung'), ['Bandung Baru', 'Bandung B'])
+
+
+class VenueRecommendationTest(TestCase):
+    """Rekomendasi personal dari tetangga item-item yang dihitung offline."""
+
+    def setUp(self):
+        cache.clear()
+        self.users = [User.objects.create_user(username=f'pemain{i}', password='password123') for i in range(4)]
+        self.venues = {
+            name: Venue.objects.create(
+                name=name, city='Kota', country='Indonesia', capacity=100, price=100, rating=rating
+            )
+            for name, rating in (('A', 1.0), ('B', 2.0), ('C', 3.0), ('D', 4.0), ('E', 5.0))
+        }
+        day = date.today()
+        for user, names in zip(self.users, ('AB', 'ABC', 'CD')):
+            for name in names:
+                day += timedelta(days=1)
+                Booking.objects.create(user=user, venue=self.venues[name], booking_date=day)
+        self.url = reverse('venue:personal_recommendations_api')
+
+    def test_compute_neighbours_cosine(self):
+        frame = pd.DataFrame({'user': [1, 1, 2, 2, 3], 'venue': ['a', 'b', 'a', 'b', 'a'], 'weight': [1.0] * 5})
+        neighbours = compute_neighbours(frame, k=5)
+        row = neighbours[neighbours['venue'] == 'b'].iloc[0]
+        self.assertEqual((row['neighbour'], row['rank']), ('a', 1))
+        self.assertAlmostEqual(row['score'], 2 / (2 ** 0.5 * 3 ** 0.5))
+        self.assertTrue(compute_neighbours(frame.iloc[0:0], k=5).empty)
+
+    def test_command_and_personal_endpoint(self):
+        out = StringIO()
+        call_command('build_venue_recommendations', k=3, stdout=out)
+        self.assertIn('tetangga disimpan', out.getvalue())
+        neighbours = VenueNeighbour.objects.filter(venue=self.venues['A'])
+        self.assertEqual(neighbours.first().neighbour, self.venues['B'])
+
+        Booking.objects.create(
+            user=self.users[3], venue=self.venues['A'], booking_date=date.today() + timedelta(days=400)
+        )
+        self.client.login(username='pemain3', password='password123')
+        with CaptureQueriesContext(connection) as ctx:
+            data = self.client.get(self.url, {'limit': 3}).json()
+        self.assertEqual([venue['stadium'] for venue in data['venues']], ['B', 'C', 'E'])
+        self.assertEqual(data['source'], 'mixed')
+        self.assertLessEqual(len(ctx.captured_queries), 8)
+
+    def test_anonymous_falls_back_to_leaderboard(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual(data['source'], 'leaderboard')
+        self.assertEqual([venue['stadium'] for venue in data['venues']], ['E', 'D'])
+
+
+class ImportVenuesCommandTest(TestCase):
+    """Command import_venues: upsert per chunk tanpa menghapus venue lama."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        settings_override = override_settings(THUMBNAIL_ROOT=os.path.join(self.tmp_dir, 'thumbnails'))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.path = os.path.join(self.tmp_dir, 'venues.csv')
+        self.data_uri = 'data:image/png;base64,' + base64.b64encode(TINY_PNG).decode()
+
+    def write_csv(self, rows):
+        pd.DataFrame(rows, columns=[
+            'Confederation', 'Stadium', 'City', 'HomeTeams', 'Capacity', 'Country', 'IOC', 'Thumbnail', 'Description',
+        ]).to_csv(self.path, index=False)
+
+    def run_import(self, **options):
+        out = StringIO()
+        call_command('import_venues', path=self.path, chunk_size=2, workers=2, stdout=out, **options)
+        return out.getvalue()
+
+    def test_import_creates_venues_and_stores_thumbnails(self):
+        self.write_csv([
+            ('AFC', f'Stadion {i}', 'Jakarta', 'Persija', 1000 + i, 'Indonesia', 'INA', self.data_uri, 'Deskripsi')
+            for i in range(5)
+        ])
+        output = self.run_import()
+
+        self.assertIn('5 venue baru', output)
+        self.assertIn('baris/detik', output)
+        venue = Venue.objects.get(name='Stadion 3')
+        self.assertEqual(venue.capacity, 1003)
+        digest = hashlib.sha256(TINY_PNG).hexdigest()
+        self.assertEqual(venue.thumbnail, reverse('venue:thumbnail', args=[f'{digest}.png']))
+        self.assertIn(venue, get_search_backend().search(Venue.objects.all(), 'Stadion 3'))
+
+    def test_reimport_updates_in_place_and_keeps_relations(self):
+        self.write_csv([
+            ('AFC', 'Gelora', 'Jakarta', 'Persija', 1000, 'Indonesia', 'INA', '', 'Lama'),
+            ('AFC', 'Kanjuruhan', 'Malang', 'Arema', 2000, 'Indonesia', 'INA', '', ''),
+        ])
+        self.run_import()
+        venue = Venue.objects.get(name='Gelora')
+        price = venue.price
+        user = User.objects.create_user(username='pemain', password='password123')
+        Booking.objects.create(user=user, venue=venue, booking_date=date.today() + timedelta(days=1))
+        Review.objects.create(user=user, venue=venue, rating=4.0, comment='Bagus')
+
+        self.write_csv([
+            ('AFC', 'Gelora', 'Jakarta', 'Persija', 1500, 'Indonesia', 'INA', '', 'Baru'),
+            ('AFC', 'Gelora', 'Bandung', 'Persib', 3000, 'Indonesia', 'INA', '', ''),
+        ])
+        output = self.run_import()
+
+        self.assertIn('1 venue baru, 1 diperbarui', output)
+        self.assertEqual(Venue.objects.count(), 3)
+        venue.refresh_from_db()
+        self.assertEqual((venue.capacity, venue.description, venue.price), (1500, 'Baru', price))
+        self.assertEqual(venue.bookings.count(), 1)
+        self.assertEqual(Review.objects.filter(venue=venue).count(), 1)
+
+    def test_missing_file(self):
+        with self.assertRaises(CommandError):
+            call_command('import_venues', path=os.path.join(self.tmp_dir, 'tidak-ada.csv'))
+
+    def test_clean_chunk_normalizes_and_rejects(self):
+        self.write_csv([
+            ('AFC', ' Gelora ', 'jakarta', '', '41,654', 'indonesia', 'INA', '', ''),
+            ('AFC', 'Kanjuruhan', 'Malang', '', 'banyak', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Si Jalak', 'Bandung', '', '-5', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'GELORA', 'Jakarta', '', '100', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Gelora', 'Jakarta', '', '200', 'Indonesia', 'INA', '', ''),
+        ])
+        chunk = next(iter(read_chunks(self.path)))
+        valid, rejects = clean_chunk(chunk)
+
+        # Natural key case-sensitive seperti constraint database: GELORA venue lain, bukan duplikat
+        self.assertEqual(
+            valid[['name', 'city', 'country', 'capacity']].to_dict('records'),
+            [
+                {'name': 'Gelora', 'city': 'Jakarta', 'country': 'Indonesia', 'capacity': 41654},
+                {'name': 'GELORA', 'city': 'Jakarta', 'country': 'Indonesia', 'capacity': 100},
+            ],
+        )
+        self.assertEqual(
+            rejects[['line', 'reason']].to_dict('records'),
+            [
+                {'line': 3, 'reason': 'kapasitas bukan angka'},
+                {'line': 4, 'reason': 'kapasitas tidak valid'},
+                {'line': 6, 'reason': 'stadium duplikat'},
+            ],
+        )
+
+    def test_duplicates_across_chunks_are_upserted(self):
+        # chunk_size=2: baris 1 dan 3 ada di chunk berbeda, jadi tidak ditolak melainkan menimpa
+        self.write_csv([
+            ('AFC', 'Gelora', 'Jakarta', '', '1000', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Kanjuruhan', 'Malang', '', '3000', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Gelora', 'Jakarta', '', '2000', 'Indonesia', 'INA', '', ''),
+        ])
+        output = self.run_import()
+
+        self.assertNotIn('ditolak', output)
+        self.assertEqual(Venue.objects.filter(name='Gelora').count(), 1)
+        self.assertEqual(Venue.objects.get(name='Gelora').capacity, 2000)
+
+    def test_normalize_keeps_acronyms(self):
+        self.write_csv([
+            ('CONCACAF', 'MetLife Stadium', 'East  Rutherford', '', '82500', 'USA', 'USA', '', ''),
+            ('AFC', 'Zayed Sports City', 'abu dhabi', '', '43000', 'UAE', 'UAE', '', ''),
+        ])
+        valid, rejects = clean_chunk(next(iter(read_chunks(self.path))))
+
+        self.assertEqual(len(rejects), 0)
+        self.assertEqual(
+            valid[['city', 'country']].to_dict('records'),
+            [{'city': 'East Rutherford', 'country': 'USA'}, {'city': 'Abu Dhabi', 'country': 'UAE'}],
+        )
+
+    def test_price_is_deterministic(self):
+        frame = pd.DataFrame({'name': ['A', 'B'], 'city': ['X', 'X'], 'country': ['Y', 'Y']})
+        prices = price_for(frame, seed=1)
+
+        self.assertEqual(list(price_for(frame.iloc[::-1], seed=1)), list(prices[::-1]))
+        self.assertNotEqual(list(price_for(frame, seed=2)), list(prices))
+        self.assertTrue(all(1000000 <= price <= 10000000 for price in prices))
+
+    def test_rejected_rows_written_to_side_file(self):
+        self.write_csv([
+            ('AFC', 'Gelora', 'Jakarta', '', '1000', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Gelora', 'Jakarta', '', '2000', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Kanjuruhan', 'Malang', '', '3000', '123', 'INA', '', ''),
+        ])
+        output = self.run_import()
+
+        self.assertIn('2 baris ditolak', output)
+        self.assertEqual(Venue.objects.get(name='Gelora').capacity, 1000)
+        rejects = pd.read_csv(os.path.join(self.tmp_dir, 'venues.rejected.csv'))
+        self.assertEqual(list(rejects['reason']), ['stadium duplikat', 'negara tidak valid'])
+
+    def test_too_many_rejects_stops_before_writing(self):
+        self.write_csv([
+            ('AFC', 'Gelora', 'Jakarta', '', 'x', 'Indonesia', 'INA', '', ''),
+            ('AFC', 'Kanjuruhan', 'Malang', '', '3000', 'Indonesia', 'INA', '', ''),
+        ])
+        with self.assertRaises(CommandError):
+            self.run_import(max_rejects=0)
+        self.assertFalse(Venue.objects.exists())
+
+        output = self.run_import(validate_only=True, max_rejects=1)
+        self.assertIn('1 dari 2 baris valid', output)
+        self.assertFalse(Venue.objects.exists())
+
+
+class VenueApiQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Jumlah query endpoint JSON venue tidak boleh bertambah seiring jumlah venue, booking, dan review."""
+
+    query_budgets = {
+        'venue:search_venues_api': 2,
+        'venue:get_venue_detail_api': 1,
+        'venue:recommended_venue': 1,
+        'venue:personal_recommendations_api': 6,
+        'venue:get_venues_api': 1,
+        'venue:show_json': 1,
+        'venue:check_create_permission_api': 2,
+        'venue:cache_stats_api': 2,
+        # Sesi + user + kartu venue lewat primary key; id venue dari index kepemilikan di cache
+        'venue:my_venues_api': 3,
+        # File thumbnail dibaca dari storage; tidak menyentuh sesi maupun database
+        'venue:thumbnail': 0,
+        'venue:create_venue_api': 6,
+        'venue:edit_venue_api': 7,
+        'venue:delete_venue_api': 11,
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.catalog = create_catalog()
+        cls.venue = cls.catalog['venues'][0]
+        cls.user = cls.catalog['users'][0]
+        cls.admin = User.objects.create_user(username='admin', password='password123', is_staff=True)
+
+    def venue_payload(self, name):
+        return json.dumps({'name': name, 'city': 'Jakarta', 'country': 'Indonesia', 'capacity': 100, 'price': 1000})
+
+    def test_search(self):
+        data = self.get_within_budget('venue:search_venues_api').json()
+        self.assertTrue(data['has_next_page'])
+        self.get_within_budget('venue:search_venues_api', data={'cursor': data['next_cursor'], 'city': 'Kota 1'})
+        self.get_within_budget('venue:search_venues_api', data={'q': 'stadion fixture'}, budget=3)
+
+        self.client.force_login(self.user)
+        self.get_within_budget('venue:search_venues_api', data={'sort': 'highToLow'}, budget=4)
+
+    def test_catalog(self):
+        response = self.get_within_budget('venue:show_json')
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 300)
+        response = self.get_within_budget('venue:get_venues_api')
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))['venues']), 300)
+        self.get_within_budget('venue:get_venue_detail_api', args=[self.venue.id])
+
+    def test_recommendations(self):
+        self.assertEqual(len(self.get_within_budget('venue:recommended_venue', data={'limit': 10}).json()['venues']), 10)
+        call_command('build_venue_recommendations', stdout=StringIO())
+        self.client.force_login(self.user)
+        data = self.get_within_budget('venue:personal_recommendations_api', data={'limit': 10}).json()
+        self.assertEqual(data['source'], 'personal')
+
+    def test_admin_endpoints(self):
+        self.client.force_login(self.admin)
+        self.get_within_budget('venue:check_create_permission_api')
+        self.get_within_budget('venue:cache_stats_api')
+        response = self.post_within_budget(
+            'venue:create_venue_api', data=self.venue_payload('Stadion Baru'), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+        response = self.post_within_budget(
+            'venue:edit_venue_api', args=[self.venue.id], data=self.venue_payload('Stadion Lama'),
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        # Venue dengan booking dan review terbanyak di fixture; cascade tidak boleh N+1 lewat signal
+        response = self.post_within_budget('venue:delete_venue_api', args=[self.venue.id])
+        self.assertEqual(response.status_code, 200)
+
+    def test_thumbnail(self):
+        thumbnail_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, thumbnail_dir, ignore_errors=True)
+        with override_settings(THUMBNAIL_ROOT=thumbnail_dir):
+            url = store_thumbnail('data:image/png;base64,' + base64.b64encode(TINY_PNG).decode())
+            name = url.rstrip('/').rsplit('/', 1)[-1]
+            response = self.get_within_budget('venue:thumbnail', args=[name])
+            self.assertEqual(response.status_code, 200)
+            self.get_within_budget('venue:thumbnail', args=[name], HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_my_venues(self):
+        owned = self.catalog['venues'][:5]
+        Venue.objects.filter(pk__in=[venue.pk for venue in owned]).update(owner=self.user)
+        self.client.force_login(self.user)
+        # Request pertama membangun index kepemilikan (satu query id venue per owner)
+        data = self.get_within_budget('venue:my_venues_api', budget=4).json()
+        self.assertEqual({venue['id'] for venue in data['venues']}, {str(venue.id) for venue in owned})
+        self.get_within_budget('venue:my_venues_api')
+
+
+class VenueOwnershipIndexTest(TestCase):
+    """Index id venue per owner di cache dijaga signal venue."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='pemilik', password='password123')
+        self.other = User.objects.create_user(username='lain', password='password123')
+        self.venue = self.create_venue('Stadion Milik')
+
+    def create_venue(self, name, owner=None):
+        return Venue.objects.create(
+            name=name, city='Jakarta', country='Indonesia', capacity=100, price=1000, owner=owner or self.owner,
+        )
+
+    def test_index_follows_create_delete_and_owner_change(self):
+        self.assertEqual(owned_venue_ids(self.owner.id), {self.venue.id})
+        with self.assertNumQueries(0):
+            owned_venue_ids(self.owner.id)
+
+        second = self.create_venue('Stadion Kedua')
+        self.assertEqual(owned_venue_ids(self.owner.id), {self.venue.id, second.id})
+        second.delete()
+        self.assertEqual(owned_venue_ids(self.owner.id), {self.venue.id})
+
+        self.assertEqual(owned_venue_ids(self.other.id), set())
+        venue = Venue.objects.get(pk=self.venue.pk)
+        venue.owner = self.other
+        venue.save()
+        self.assertEqual(owned_venue_ids(self.owner.id), set())
+        self.assertEqual(owned_venue_ids(self.other.id), {self.venue.id})
+
+    def test_non_owner_rejected_before_fetching_venue(self):
+        owned_venue_ids(self.other.id)
+        self.client.force_login(self.other)
+        for name in ('venue:edit_venue_api', 'venue:delete_venue_api'):
+            # Sesi, user, dan owner_id venue saja; baris venue utuh tidak diambil
+            with self.assertNumQueries(3):
+                response = self.client.post(reverse(name, args=[self.venue.id]), '{}', content_type='application/json')
+            self.assertEqual(response.status_code, 403)
+
+        self.client.force_login(self.owner)
+        response = self.client.post(reverse('venue:delete_venue_api', args=[self.venue.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Venue.objects.filter(pk=self.venue.pk).exists())
+
+    def test_stale_index_does_not_grant_access(self):
+        owned_venue_ids(self.owner.id)
+        # update() tidak memicu signal, jadi index owner lama tertinggal; baris venue tetap menentukan
+        Venue.objects.filter(pk=self.venue.pk).update(owner=self.other)
+        self.client.force_login(self.owner)
+        self.assertEqual(self.client.post(reverse('venue:delete_venue', args=[self.venue.id])).status_code, 403)
+        self.assertTrue(Venue.objects.filter(pk=self.venue.pk).exists())
+
+    def test_new_owner_not_locked_out_by_stale_index(self):
+        self.assertEqual(owned_venue_ids(self.other.id), set())
+        # update() tidak memicu signal; index kosong owner baru tidak boleh menolaknya
+        Venue.objects.filter(pk=self.venue.pk).update(owner=self.other)
+        self.client.force_login(self.other)
+        response = self.client.post(reverse('venue:delete_venue_api', args=[self.venue.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Venue.objects.filter(pk=self.venue.pk).exists())
+
+    def test_missing_venue_is_404_for_non_owner(self):
+        self.client.force_login(self.other)
+        missing = uuid.uuid4()
+        self.assertEqual(self.client.get(reverse('venue:edit_venue', args=[missing])).status_code, 404)
+        self.assertEqual(self.client.post(reverse('venue:delete_venue_api', args=[missing])).status_code, 404)
+
+    def test_superuser_without_staff_can_edit(self):
+        superuser = User.objects.create_user(username='super', password='password123', is_superuser=True)
+        self.client.force_login(superuser)
+        response = self.client.get(reverse('venue:edit_venue', args=[self.venue.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['stadium'], 'Stadion Milik')
+
+    def test_rating_update_keeps_index(self):
+        owned_venue_ids(self.owner.id)
+        self.venue.rating = 4.5
+        self.venue.save(update_fields=['rating'])
+        with self.assertNumQueries(0):
+            self.assertEqual(owned_venue_ids(self.owner.id), {self.venue.id})
+
+    def test_management_flag_and_my_venues(self):
+        self.create_venue('Stadion Orang Lain', owner=self.other)
+        self.client.force_login(self.owner)
+        venues = self.client.get(reverse('venue:search_venues_api')).json()['venues']
+        flags = {venue['stadium']: venue['can_access_management'] for venue in venues}
+        self.assertEqual(flags, {'Stadion Milik': True, 'Stadion Orang Lain': False})
+
+        data = self.client.get(reverse('venue:my_venues_api')).json()
+        self.assertEqual([venue['stadium'] for venue in data['venues']], ['Stadion Milik'])
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('venue:my_venues_api')).status_code, 403)
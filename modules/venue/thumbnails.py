@@ -0,0 +1,115 @@
+import base64
+import binascii
+import hashlib
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.urls import reverse
+
+DATA_URI_PATTERN = re.compile(r'^data:(?P<content_type>image/[\w.+-]+)?(?P<params>(;[^,;]*)*?);base64,', re.IGNORECASE)
+THUMBNAIL_NAME_PATTERN = re.compile(r'^[0-9a-f]{64}\.(jpg|png|gif|webp)$')
+
+EXTENSIONS = {
+    'image/jpeg': 'jpg',
+    'image/jpg': 'jpg',
+    'image/png': 'png',
+    'image/gif': 'gif',
+    'image/webp': 'webp',
+}
+CONTENT_TYPES = {
+    'jpg': 'image/jpeg',
+    'png': 'image/png',
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+}
+
+
+def get_thumbnail_storage():
+    """Storage tempat file thumbnail disimpan berdasarkan hash isinya."""
+    return FileSystemStorage(location=settings.THUMBNAIL_ROOT)
+
+
+def is_data_uri(value):
+    return isinstance(value, str) and value[:5].lower() == 'data:'
+
+
+def decode_data_uri(value):
+    """
+    Decode base64 data URI menjadi (extension, bytes).
+    Return None jika value bukan data URI gambar yang valid.
+    """
+    if not is_data_uri(value):
+        return None
+
+    match = DATA_URI_PATTERN.match(value)
+    if not match:
+        return None
+
+    content_type = (match.group('content_type') or 'image/jpeg').lower()
+    extension = EXTENSIONS.get(content_type)
+    if extension is None:
+        return None
+
+    try:
+        data = base64.b64decode(value[match.end():].strip(), validate=False)
+    except (binascii.Error, ValueError):
+        return None
+    if not data:
+        return None
+    return extension, data
+
+
+def thumbnail_url(name):
+    return reverse('venue:thumbnail', args=[name])
+
+
+def absolute_thumbnail_url(value, request):
+    """
+    URL thumbnail yang bisa dimuat langsung oleh client API (Flutter). Kolom thumbnail menyimpan path
+    relatif; path itu diberi THUMBNAIL_BASE_URL jika diatur, selain itu host request. URL eksternal
+    dan string kosong dikembalikan apa adanya.
+    """
+    if not value or not value.startswith('/'):
+        return value
+    base = settings.THUMBNAIL_BASE_URL
+    return f"{base.rstrip('/')}{value}" if base else request.build_absolute_uri(value)
+
+
+def with_absolute_thumbnails(venues, request, key='thumbnail'):
+    """Salinan list payload venue dengan absolute_thumbnail_url di kolom key."""
+    return [{**venue, key: absolute_thumbnail_url(venue[key], request)} for venue in venues]
+
+
+def stored_thumbnail_path(value):
+    """
+    URL absolut thumbnail milik aplikasi ini (dari absolute_thumbnail_url, mis. dikirim balik client saat
+    edit venue) dikembalikan ke path relatifnya, supaya kolom tidak terikat ke satu host.
+    """
+    if not isinstance(value, str) or '://' not in value:
+        return value
+    path = urlsplit(value).path
+    name = path.rsplit('/', 1)[-1]
+    if THUMBNAIL_NAME_PATTERN.match(name) and path == thumbnail_url(name):
+        return path
+    return value
+
+
+def store_thumbnail(value):
+    """
+    Simpan thumbnail berupa data URI ke storage dan return URL pendeknya.
+    Nama file adalah SHA-256 dari isi gambar, sehingga gambar yang sama hanya disimpan sekali.
+    Value yang bukan data URI (URL biasa, string kosong) dikembalikan apa adanya.
+    """
+    decoded = decode_data_uri(value)
+    if decoded is None:
+        return stored_thumbnail_path(value)
+
+    extension, data = decoded
+    name = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+    storage = get_thumbnail_storage()
+    if not storage.exists(name):
+        storage.save(name, ContentFile(data))
+    return thumbnail_url(name)
@@ -18,9 +18,13 @@ urlpatterns = [
     path('api/search/', views.search_venues_api, name='search_venues_api'),
     path('api/detail/<uuid:venue_id>/', get_venue_detail_api, name='get_venue_detail_api'),
     path('api/recommended', get_recommended_venues_api, name='recommended_venue'),
+    path('api/recommended/me/', views.get_personal_recommendations_api, name='personal_recommendations_api'),
+    path('api/mine/', views.my_venues_api, name='my_venues_api'),
     path('api/venues', get_venues_api, name='get_venues_api'),
     path('api/permission/create/', check_venue_creation_permission_api, name='check_create_permission_api'),
     path('api/create/', create_venue_flutter, name="create_venue_api"),
     path('api/edit/<uuid:venue_id>', edit_venue_flutter, name="edit_venue_api"),
-    path('api/delete/<uuid:venue_id>/', delete_venue_api, name="delete_venue_api")
+    path('api/delete/<uuid:venue_id>/', delete_venue_api, name="delete_venue_api"),
+    path('api/cache/stats/', views.cache_stats_api, name='cache_stats_api'),
+    path('thumbnails/<str:name>', views.serve_thumbnail, name='thumbnail'),
 ]
@@ -2,17 +2,33 @@ import json
 import csv
 import random
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpResponseRedirect, JsonResponse
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.core.files.storage import FileSystemStorage
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from modules.venue.models import Venue
+from modules.venue.models import CARD_FIELDS, Venue
 from modules.venue.forms import VenueForm
 from django.contrib.auth import get_user_model
 from django.core.paginator import Paginator
-from django.views.decorators.http import require_POST
+from django.views.decorators.http import require_GET, require_POST
+from django.utils.cache import patch_cache_control
+from modules.venue.thumbnails import (
+    CONTENT_TYPES, THUMBNAIL_NAME_PATTERN, absolute_thumbnail_url, get_thumbnail_storage, with_absolute_thumbnails,
+)
+from modules.venue.streaming import streaming_json_response
+from modules.venue.pagination import InvalidCursor, cursor_for, keyset_page
+from modules.venue.search import get_search_backend, tokenize
+from modules.venue.response_cache import cache_stats, cached_response, venue_scope
+from modules.venue.leaderboard import card_payload, top_venues
+from modules.venue.ownership import can_manage_venue, manages_venue, owned_venue_ids
+from modules.venue.recommendations import recommend_venues
+from modules.user.capabilities import is_admin, user_info
+
+SEARCH_PAGE_SIZE = 18 # 18 item per halaman
+RECOMMENDED_LIMIT = 2 # Jumlah rekomendasi default di halaman utama
 
 def search_venue(request):
     locations = Venue.objects.values('city', 'country').distinct().order_by('city')
@@ -20,7 +36,7 @@ def search_venue(request):
     context = {
         'locations_json': json.dumps(list(locations)),
         
-        'can_add_venue': request.user.is_authenticated and (request.user.is_superuser or request.user.is_staff),
+        'can_add_venue': is_admin(request.user),
     }
     return render(request, 'venue/search_venue.html', context)
 
@@ -30,19 +46,18 @@ def venue_detail(request, venue_id):
         if not venue_exists:
             return render(request, 'venue/venue_not_found.html', {'venue_id': venue_id}, status=404)
 
-        is_admin = request.user.is_authenticated and (request.user.is_superuser or request.user.is_staff)
-
         context = {
             'venue_id': venue_id,
-            'is_admin': is_admin
+            'is_admin': is_admin(request.user)
         }
         return render(request, 'venue/venue_detail.html', context)
     except (ValueError, TypeError):
         return render(request, 'venue/venue_not_found.html', {'venue_id': 'invalid'}, status=400)
 
+@cached_response('venue_detail', scopes=lambda request, venue_id: [venue_scope(venue_id)], vary_on_auth=True)
 def get_venue_detail_api(request, venue_id):
     try:
-        venue = Venue.objects.get(pk=venue_id)
+        venue = Venue.objects.detail().get(pk=venue_id)
         venue_data = {
             'id': venue.id,
             'stadium': venue.name,
@@ -50,7 +65,7 @@ def get_venue_detail_api(request, venue_id):
             'country': venue.country,
             'capacity': venue.capacity,
             'price': venue.price,
-            'thumbnail': venue.thumbnail if venue.thumbnail else '',
+            'thumbnail': absolute_thumbnail_url(venue.thumbnail, request),
             'rating': venue.rating,
             'description': venue.description or "Deskripsi tidak tersedia.",
             'facilities': venue.facilities or "",
@@ -81,9 +96,11 @@ def create_venue(request):
 
 @login_required
 def edit_venue(request, venue_id):
+    if not can_manage_venue(request.user, venue_id):
+        return JsonResponse({'success': False, 'message': 'Anda tidak punya izin.'}, status=403)
     venue = get_object_or_404(Venue, pk=venue_id)
 
-    if not (request.user.is_staff or venue.owner == request.user):
+    if not manages_venue(request.user, venue):
         return JsonResponse({'success': False, 'message': 'Anda tidak punya izin.'}, status=403)
 
     if request.method == 'POST':
@@ -111,9 +128,11 @@ def edit_venue(request, venue_id):
 @login_required
 @require_POST
 def delete_venue(request, venue_id):
-    venue = get_object_or_404(Venue, pk=venue_id)
+    if not can_manage_venue(request.user, venue_id):
+        return JsonResponse({'success': False, 'message': 'Anda tidak memiliki izin untuk menghapus venue ini.'}, status=403)
+    venue = get_object_or_404(Venue.objects.card(), pk=venue_id)
     
-    if not (request.user.is_superuser or venue.owner == request.user or request.user.is_staff):
+    if not manages_venue(request.user, venue):
             return JsonResponse({'success': False, 'message': 'Anda tidak memiliki izin untuk menghapus venue ini.'}, status=403)
 
     try:
@@ -124,7 +143,11 @@ def delete_venue(request, venue_id):
         return JsonResponse({'success': False, 'message': str(e)}, status=500)
 
 def search_venues_api(request):
-    venues_list = Venue.objects.select_related('owner').all()
+    # Kartu hanya memuat description_excerpt; description utuh dimuat jika diminta dengan ?include=description
+    full_description = 'description' in request.GET.getlist('include')
+    venues_list = (
+        Venue.objects.only(*CARD_FIELDS, 'description') if full_description else Venue.objects.card()
+    ).with_description_excerpt()
     # Filtering
     search_term = request.GET.get('search', '').strip()
     if search_term:
@@ -149,19 +172,48 @@ def search_venues_api(request):
     except (ValueError, TypeError):
         pass
 
-    # Sorting
-    sort_order = request.GET.get('sort', 'lowToHigh')
-    if sort_order == 'highToLow':
-        venues_list = venues_list.order_by('-price')
+    # Full-text search (nama, kota, klub, deskripsi) dengan ranking relevansi dan prefix matching
+    query = request.GET.get('q', '').strip()
+    has_query = bool(tokenize(query))
+    if has_query:
+        venues_list = get_search_backend().search(venues_list, query)
+
+    # Sorting (id sebagai pemecah seri supaya urutan stabil untuk cursor)
+    sort_order = request.GET.get('sort', 'relevance' if has_query else 'lowToHigh')
+    if has_query and sort_order == 'relevance':
+        ordering = ('-search_rank', 'id')
+    elif sort_order == 'highToLow':
+        ordering = ('-price', '-id')
     else:
-        venues_list = venues_list.order_by('price')
-
-    paginator = Paginator(venues_list, 18) # 18 item per halaman
-    page_number = request.GET.get('page', 1)
-    page_obj = paginator.get_page(page_number)
+        ordering = ('price', 'id')
+
+    if 'cursor' in request.GET:
+        # Keyset pagination: satu range scan per halaman, tanpa COUNT(*) dan OFFSET
+        try:
+            page_venues, next_cursor = keyset_page(venues_list, ordering, request.GET['cursor'], SEARCH_PAGE_SIZE)
+        except InvalidCursor:
+            return JsonResponse({'success': False, 'message': 'Cursor tidak valid.'}, status=400)
+        pagination = {
+            'has_next_page': next_cursor is not None,
+            'next_cursor': next_cursor,
+        }
+    else:
+        # Mode lama dengan nomor halaman, dipertahankan untuk client yang masih memakai ?page=
+        paginator = Paginator(venues_list.order_by(*ordering), SEARCH_PAGE_SIZE)
+        page_number = request.GET.get('page', 1)
+        page_obj = paginator.get_page(page_number)
+        page_venues = list(page_obj)
+        pagination = {
+            'has_next_page': page_obj.has_next(),
+            'current_page': page_obj.number,
+            'total_pages': paginator.num_pages,
+            'next_cursor': cursor_for(page_venues[-1], ordering) if page_obj.has_next() else None,
+        }
 
+    # Hak kelola cukup dari owner_id kartu venue, tanpa join ke tabel user
+    admin = is_admin(request.user)
     venues_data = []
-    for venue in page_obj:
+    for venue in page_venues:
         venues_data.append({
             'id': venue.id,
             'stadium': venue.name,
@@ -169,11 +221,11 @@ def search_venues_api(request):
             'country': venue.country,
             'capacity': venue.capacity,
             'price': venue.price,
-            'thumbnail': venue.thumbnail if venue.thumbnail else '',
-            'description': venue.description if venue.description else 'Deskripsi tidak tersedia',
+            'thumbnail': absolute_thumbnail_url(venue.thumbnail, request),
+            'description': (venue.description if full_description else venue.description_excerpt) or 'Deskripsi tidak tersedia',
+            'description_excerpt': venue.description_excerpt or 'Deskripsi tidak tersedia',
             'rating': venue.rating,
-            'can_access_management': (request.user.is_authenticated and
-                                    (request.user.is_superuser or request.user == venue.owner or request.user.is_staff)),
+            'can_access_management': admin or (request.user.is_authenticated and venue.owner_id == request.user.id),
             'url_detail': reverse('venue:venue_detail', args=[venue.id]),
             'url_edit': reverse('venue:edit_venue', args=[venue.id]),
             'url_delete': reverse('venue:delete_venue', args=[venue.id]),
@@ -182,14 +234,14 @@ def search_venues_api(request):
     return JsonResponse({
         'is_authenticated': request.user.is_authenticated,
         'venues': venues_data,
-        'has_next_page': page_obj.has_next(),
-        'current_page': page_obj.number,
-        'total_pages': paginator.num_pages,
+        **pagination,
     })
 
+@cached_response('show_json', store_body=False)
 def show_json(request):
-    venue_list = Venue.objects.all()
-    data = [
+    # Di-stream per chunk supaya memori worker tetap datar berapapun jumlah venue
+    venue_list = Venue.objects.detail().iterator(chunk_size=settings.VENUE_STREAM_CHUNK_SIZE)
+    data = (
         {
             'id': venue.id,
             'stadium': venue.name,
@@ -197,121 +249,145 @@ def show_json(request):
             'country': venue.country,
             'capacity': venue.capacity,
             'price': venue.price,
-            'thumbnail': venue.thumbnail if venue.thumbnail else '',
+            'thumbnail': absolute_thumbnail_url(venue.thumbnail, request),
             'rating': venue.rating,
             'description': venue.description or "Deskripsi tidak tersedia.",
             'facilities': venue.facilities or "",
             'rules': venue.rules or "",
         }
         for venue in venue_list
-    ]
-    return JsonResponse(data, safe=False)
+    )
+    return streaming_json_response(data)
 
+@cached_response('venues', store_body=False)
 def get_venues_api(request):
-    try:
-        venues_list = Venue.objects.all()
-        venues_data = []
-        for venue in venues_list:
-            venues_data.append({
-                'id': venue.id,
-                'stadium': venue.name,
-                'city': venue.city,
-                'country': venue.country,
-                'capacity': venue.capacity,
-                'price': venue.price,
-                'thumbnail': venue.thumbnail if venue.thumbnail else '',
-                'rating': venue.rating,
-                'facilities': venue.facilities or "",
-                'rules': venue.rules or "",
-                'url_detail': reverse('venue:venue_detail', args=[venue.id]),
-            })
-
-        return JsonResponse({
-            'success': True,
-            'venues': venues_data,
-            'message': 'Venue berhasil dimuat.'
-        })
+    # Query baru berjalan saat body di-stream, jadi error database tidak bisa lagi dijadikan response 500
+    # di sini; response terpotong (JSON tidak valid) sehingga client tetap tahu request gagal
+    venues_list = Venue.objects.detail().defer('description').iterator(chunk_size=settings.VENUE_STREAM_CHUNK_SIZE)
+    venues_data = (
+        {
+            'id': venue.id,
+            'stadium': venue.name,
+            'city': venue.city,
+            'country': venue.country,
+            'capacity': venue.capacity,
+            'price': venue.price,
+            'thumbnail': absolute_thumbnail_url(venue.thumbnail, request),
+            'rating': venue.rating,
+            'facilities': venue.facilities or "",
+            'rules': venue.rules or "",
+            'url_detail': reverse('venue:venue_detail', args=[venue.id]),
+        }
+        for venue in venues_list
+    )
 
-    except Exception as e:
-        return JsonResponse({'success': False, 'message': f'Gagal memuat venue: {str(e)}'}, status=500)
+    return streaming_json_response(venues_data, {
+        'success': True,
+        'venues': None,
+        'message': 'Venue berhasil dimuat.'
+    }, 'venues')
 
-def get_recommended_detail_api(request):
+@cached_response('recommended')
+def get_recommended_venues_api(request):
+    """
+    Venue dengan rating tertinggi dari leaderboard di cache (tanpa sort tabel venue).
+    Parameter opsional: limit (default 2), city atau country untuk top-N per kota/negara.
+    """
     try:
-
-        venues_list = Venue.objects.all().order_by('-rating', '-id')[:2]
-        venues_data = []
-        for venue in venues_list:
-            venues_data.append({
-                'id': venue.id,
-                'stadium': venue.name,
-                'city': venue.city,
-                'country': venue.country,
-                'price': venue.price,
-                'capacity': venue.capacity,
-                'thumbnail': venue.thumbnail if venue.thumbnail else '',
-                'rating': venue.rating,
-                'url_detail': reverse('venue:venue_detail', args=[venue.id]),
-            })
+        venues_data = top_venues(
+            recommendation_limit(request),
+            city=request.GET.get('city', '').strip() or None,
+            country=request.GET.get('country', '').strip() or None,
+        )
 
         return JsonResponse({
             'success': True,
-            'venues': venues_data,
+            'venues': with_absolute_thumbnails(venues_data, request),
             'message': 'Rekomendasi venue berhasil dimuat.'
         })
 
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'Gagal memuat rekomendasi: {str(e)}'}, status=500)
 
-def get_recommended_venues_api(request):
-    try:
-
-        venues_list = Venue.objects.all().order_by('-rating', '-id')[:2]
-        venues_data = []
-        for venue in venues_list:
-            venues_data.append({
-                'id': venue.id,
-                'stadium': venue.name,
-                'city': venue.city,
-                'country': venue.country,
-                'capacity': venue.capacity,
-                'price': venue.price,
-                'thumbnail': venue.thumbnail if venue.thumbnail else '',
-                'rating': venue.rating,
-                'url_detail': reverse('venue:venue_detail', args=[venue.id]),
-            })
+# Dulu view terpisah dengan isi yang sama, dipertahankan untuk kode yang masih mengimpornya
+get_recommended_detail_api = get_recommended_venues_api
 
+@require_GET
+def get_personal_recommendations_api(request):
+    """
+    Rekomendasi per user dari tetangga venue yang pernah dibooking/direview (lihat build_venue_recommendations).
+    User anonim atau tanpa riwayat mendapat leaderboard global.
+    """
+    try:
+        venues_data, source = recommend_venues(request.user, recommendation_limit(request))
         return JsonResponse({
             'success': True,
-            'venues': venues_data,
+            'venues': with_absolute_thumbnails(venues_data, request),
+            'source': source,
             'message': 'Rekomendasi venue berhasil dimuat.'
         })
 
     except Exception as e:
         return JsonResponse({'success': False, 'message': f'Gagal memuat rekomendasi: {str(e)}'}, status=500)
 
-def check_venue_creation_permission_api(request):
-
-    is_allowed = request.user.is_authenticated and (request.user.is_superuser or request.user.is_staff)
-
-    return JsonResponse({
-
-        'can_create_venue': is_allowed
-
-    })
+def recommendation_limit(request):
+    try:
+        limit = int(request.GET.get('limit', RECOMMENDED_LIMIT))
+    except (ValueError, TypeError):
+        limit = RECOMMENDED_LIMIT
+    return max(1, min(limit, settings.VENUE_LEADERBOARD_SIZE))
+
+@require_GET
+def my_venues_api(request):
+    """
+    Venue milik user yang sedang login. Id diambil dari index kepemilikan di cache, lalu kartu venue
+    dibaca lewat primary key; user tanpa venue tidak menyentuh tabel venue sama sekali.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'message': 'Harap login untuk melihat venue Anda.'}, status=403)
+    ids = owned_venue_ids(request.user.id)
+    venues = Venue.objects.card().filter(pk__in=ids).order_by('name', 'id') if ids else []
+    venues_data = [
+        {
+            **card_payload(venue),
+            'thumbnail': absolute_thumbnail_url(venue.thumbnail, request),
+            'url_edit': reverse('venue:edit_venue', args=[venue.id]),
+            'url_delete': reverse('venue:delete_venue', args=[venue.id]),
+        }
+        for venue in venues
+    ]
+    return JsonResponse({'success': True, 'count': len(venues_data), 'venues': venues_data})
+
+@require_GET
+def cache_stats_api(request):
+    """Statistik cache response katalog (hit/miss/304 dan hit ratio per view), khusus admin."""
+    if not is_admin(request.user):
+        return JsonResponse({'success': False, 'message': 'Anda tidak memiliki akses.'}, status=403)
+    return JsonResponse({'success': True, 'views': cache_stats()})
+
+@require_GET
+def serve_thumbnail(request, name):
+    """Serve file thumbnail. Nama file adalah hash isinya, jadi response boleh di-cache selamanya."""
+    if not THUMBNAIL_NAME_PATTERN.match(name):
+        raise Http404('Thumbnail tidak ditemukan.')
+
+    digest, extension = name.split('.')
+    etag = f'"{digest}"'
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponse(status=304)
+    else:
+        storage = get_thumbnail_storage()
+        if not storage.exists(name):
+            raise Http404('Thumbnail tidak ditemukan.')
+        response = FileResponse(storage.open(name, 'rb'), content_type=CONTENT_TYPES[extension])
 
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=settings.THUMBNAIL_CACHE_MAX_AGE, immutable=True)
+    return response
 
-def get_flutter_user_info(user):
-    """Helper function to get user info for Flutter"""
-    if not user.is_authenticated:
-        return None
-    return {
-        'user_id': user.id,
-        'username': user.username,
-        'is_authenticated': True,
-        'is_superuser': user.is_superuser,
-        'is_staff': user.is_staff,
-        'is_admin': user.is_superuser or user.is_staff,
-    }
+def check_venue_creation_permission_api(request):
+    # Dipertahankan untuk client lama; client baru membaca can_create_venue dari user:capabilities_api
+    return JsonResponse({'can_create_venue': is_admin(request.user)})
 
 
 @csrf_exempt
@@ -325,11 +401,9 @@ def create_venue_flutter(request):
             status=403
         )
     
-    # Check if user is admin (superuser or staff)
-    is_admin = request.user.is_superuser or request.user.is_staff
-    if not is_admin:
+    if not is_admin(request.user):
         return JsonResponse(
-            {"status": "error", "message": "Hanya admin yang dapat membuat venue.", "user": get_flutter_user_info(request.user)},
+            {"status": "error", "message": "Hanya admin yang dapat membuat venue.", "user": user_info(request.user)},
             status=403
         )
         
@@ -347,12 +421,12 @@ def create_venue_flutter(request):
         return JsonResponse({
             'status': 'success', 
             'message': 'Venue berhasil ditambahkan.',
-            'user': get_flutter_user_info(request.user),
+            'user': user_info(request.user),
             'venue_id': str(venue.id)
         }, status=201)
     else:
         error_details = json.loads(form.errors.as_json())
-        return JsonResponse({'status': 'error', 'errors': error_details, 'user': get_flutter_user_info(request.user)}, status=400)
+        return JsonResponse({'status': 'error', 'errors': error_details, 'user': user_info(request.user)}, status=400)
 
 @csrf_exempt
 def edit_venue_flutter(request, venue_id):
@@ -365,17 +439,16 @@ def edit_venue_flutter(request, venue_id):
             status=403
         )
 
+    denied = JsonResponse(
+        {"status": "error", "message": "Anda tidak memiliki izin untuk mengedit venue ini.", "user": user_info(request.user)},
+        status=403
+    )
+    # Non-owner ditolak dari index kepemilikan (atau owner_id saja) tanpa mengambil venue
+    if not can_manage_venue(request.user, venue_id):
+        return denied
     venue = get_object_or_404(Venue, pk=venue_id)
-    
-    # Check if user is admin OR owner of the venue
-    is_admin = request.user.is_superuser or request.user.is_staff
-    is_owner = venue.owner == request.user
-    
-    if not (is_admin or is_owner):
-        return JsonResponse(
-            {"status": "error", "message": "Anda tidak memiliki izin untuk mengedit venue ini.", "user": get_flutter_user_info(request.user)},
-            status=403
-        )
+    if not manages_venue(request.user, venue):
+        return denied
     
     try:
         data = json.loads(request.body)
@@ -390,17 +463,15 @@ def edit_venue_flutter(request, venue_id):
         return JsonResponse({
             'status': 'success', 
             'message': 'Venue berhasil diedit.',
-            'user': get_flutter_user_info(request.user),
+            'user': user_info(request.user),
             'venue_id': str(venue.id)
         }, status=200)
     else:
         error_details = json.loads(form.errors.as_json())
-        return JsonResponse({'status': 'error', 'errors': error_details, 'user': get_flutter_user_info(request.user)}, status=400)
+        return JsonResponse({'status': 'error', 'errors': error_details, 'user': user_info(request.user)}, status=400)
 
 @csrf_exempt
 def delete_venue_api(request, venue_id):
-    venue = get_object_or_404(Venue, pk=venue_id)
-    
     if not request.user.is_authenticated:
         return JsonResponse({
             'status': 'error', 
@@ -408,16 +479,17 @@ def delete_venue_api(request, venue_id):
             'user': None
         }, status=403)
     
-    # Check if user is admin OR owner of the venue
-    is_admin = request.user.is_superuser or request.user.is_staff
-    is_owner = venue.owner == request.user
-    
-    if not (is_admin or is_owner):
-        return JsonResponse({
-            'status': 'error', 
-            'message': 'Anda tidak memiliki izin untuk menghapus venue ini.',
-            'user': get_flutter_user_info(request.user)
-        }, status=403)
+    denied = JsonResponse({
+        'status': 'error', 
+        'message': 'Anda tidak memiliki izin untuk menghapus venue ini.',
+        'user': user_info(request.user)
+    }, status=403)
+    # Non-owner ditolak dari index kepemilikan (atau owner_id saja) tanpa mengambil venue
+    if not can_manage_venue(request.user, venue_id):
+        return denied
+    venue = get_object_or_404(Venue.objects.card(), pk=venue_id)
+    if not manages_venue(request.user, venue):
+        return denied
 
     try:
         venue_name = venue.name
@@ -426,7 +498,7 @@ def delete_venue_api(request, venue_id):
         return JsonResponse({
             'status': 'success',
             'message': f'Venue "{venue_name}" berhasil dihapus.',
-            'user': get_flutter_user_info(request.user),
+            'user': user_info(request.user),
             'deleted_venue_id': venue_id_deleted
         })
     except Exception as e: